@@ -0,0 +1,71 @@
+"""Benchmark JSON encoding/decoding of mesonet-sized payloads.
+
+Compares the previous tool output path (``json.dumps(indent=2, default=str)``)
+with the compact stdlib and orjson paths in ``hcdp_mcp_server.serialization``.
+
+    python benchmarks/bench_serialization.py --rows 50000
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from hcdp_mcp_server import serialization
+
+SAMPLE = Path(__file__).parent.parent / "sample_data" / "mesonet_measurements_recent.json"
+
+
+def build_payload(rows: int) -> list:
+    """Replicate the sample mesonet rows up to ``rows`` measurements."""
+    sample = json.loads(SAMPLE.read_text())
+    return [dict(sample[i % len(sample)], station_id=f"{i % 997:04d}") for i in range(rows)]
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000, help="Number of mesonet rows")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    payload = build_payload(args.rows)
+    orjson = serialization.orjson
+    cases = {
+        "stdlib indent=2 (previous)": lambda: json.dumps(payload, indent=2, default=str),
+        "stdlib compact": lambda: json.dumps(payload, separators=(",", ":"), default=str),
+    }
+    if orjson is not None:
+        cases["orjson compact"] = lambda: orjson.dumps(payload)
+
+    print(f"Encoding {args.rows} mesonet rows (backend in use: {serialization.backend()})")
+    baseline = None
+    for label, fn in cases.items():
+        seconds = best_of(fn, args.repeat)
+        size = len(fn())
+        baseline = baseline or seconds
+        print(f"  {label:<28} {seconds * 1000:9.1f} ms  {size / 1e6:8.2f} MB  {baseline / seconds:5.1f}x")
+
+    encoded = json.dumps(payload).encode()
+    print(f"Decoding {len(encoded) / 1e6:.2f} MB")
+    decoders = {"stdlib json.loads": lambda: json.loads(encoded)}
+    if orjson is not None:
+        decoders["orjson.loads"] = lambda: orjson.loads(encoded)
+    baseline = None
+    for label, fn in decoders.items():
+        seconds = best_of(fn, args.repeat)
+        baseline = baseline or seconds
+        print(f"  {label:<28} {seconds * 1000:9.1f} ms  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
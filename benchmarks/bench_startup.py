@@ -0,0 +1,111 @@
+"""Measure hcdp-mcp-server cold start: import cost and time until ready.
+
+Import cost comes from ``python -X importtime``; readiness is the time from
+spawning the stdio server until it answers an MCP ``initialize`` request.
+
+    python benchmarks/bench_startup.py --runs 5 --budget-ms 3000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Tuple
+
+SERVER_MODULE = "hcdp_mcp_server.server"
+DEFAULT_BUDGET_MS = 3000
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "bench_startup", "version": "0"},
+    },
+}
+
+
+def _server_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("HCDP_API_TOKEN", "startup-benchmark")
+    return env
+
+
+def import_profile(module: str = SERVER_MODULE) -> Dict[str, Tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` from ``-X importtime``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_server_env(), check=True,
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def imported_modules(module: str = SERVER_MODULE) -> set:
+    """Top-level packages present in ``sys.modules`` after importing ``module``."""
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                          env=_server_env(), check=True)
+    return {name.split(".")[0] for name in proc.stdout.split()}
+
+
+def time_to_ready(timeout: float = 30.0) -> float:
+    """Seconds from spawning the stdio server until it answers ``initialize``."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "from hcdp_mcp_server.server import cli_main; cli_main()"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, env=_server_env(),
+    )
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        proc.stdin.write(json.dumps(INITIALIZE) + "\n")
+        proc.stdin.flush()
+        line = proc.stdout.readline()
+        elapsed = time.perf_counter() - start
+        if not line or json.loads(line).get("id") != 1:
+            raise RuntimeError("server did not answer initialize")
+        return elapsed
+    finally:
+        timer.cancel()
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("HCDP_STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)),
+                        help="Fail if median import-to-ready time exceeds this")
+    args = parser.parse_args()
+
+    imports = [import_profile()[SERVER_MODULE][1] / 1000 for _ in range(args.runs)]
+    ready = [time_to_ready() * 1000 for _ in range(args.runs)]
+    profile = import_profile()
+    own = sorted(((v[0], k) for k, v in profile.items() if k.startswith("hcdp_mcp_server")), reverse=True)
+
+    print(f"import {SERVER_MODULE}: median {statistics.median(imports):.0f} ms")
+    print(f"import-to-ready (stdio initialize): median {statistics.median(ready):.0f} ms, "
+          f"max {max(ready):.0f} ms, budget {args.budget_ms:.0f} ms")
+    print("slowest hcdp_mcp_server modules (self time):")
+    for self_us, name in own[:8]:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+    if statistics.median(ready) > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
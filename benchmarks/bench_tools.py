@@ -0,0 +1,279 @@
+"""End-to-end latency and throughput of every MCP tool against the mock API.
+
+Each scenario calls ``handle_call_tool`` in-process, so timings include
+argument validation, the client, caches, HTTP to ``mock_api.py`` (run as a
+subprocess on a free port) and serialization. Background-job tools are timed
+until their job finishes. Per scenario and concurrency level the report holds
+p50/p95/p99 latency, throughput, errors, bytes serialized, upstream requests
+and peak RSS; ``--output`` writes it as JSON and ``--baseline`` compares p95
+against an earlier report.
+
+    python benchmarks/bench_tools.py --requests 50 --concurrency 1,8,32 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+PACKAGE = {"email": "bench@example.com", "datatype": "rainfall", "production": "new", "period": "month",
+           "extent": "bi", "start_date": "2024-10", "end_date": "2024-12"}
+MAPS = {k: v for k, v in PACKAGE.items() if k != "email"}
+# Arguments per scenario; ``{i}`` in a string is replaced by the call number.
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "get_climate_raster": {"datatype": "rainfall", "date": "2024-12", "extent": "bi",
+                           "production": "new", "period": "month"},
+    "get_timeseries_data": {"datatype": "rainfall", "start": "2024-01", "end": "2024-12", "extent": "bi",
+                            "lat": 19.7167, "lng": -155.0833, "production": "new", "period": "month"},
+    "get_station_data": {"q": "{}", "limit": 50},
+    "search_stations": {"lat": 20.8415, "lng": -156.2948, "radius_km": 50},
+    "get_mesonet_data": {"limit": 2000},
+    "get_mesonet_data[resample]": {"limit": 2000, "resample": "hour", "pivot": "variable"},
+    "generate_data_package_email": PACKAGE,
+    "generate_data_package_instant_link": PACKAGE,
+    "generate_data_package_instant_content": PACKAGE,
+    "generate_data_package_splitlink": PACKAGE,
+    "download_data_package_splitlink": {**PACKAGE, "zipName": "split_{i}"},
+    "build_data_package_local": {**MAPS, "zipName": "local_{i}"},
+    "list_production_files": MAPS,
+    "retrieve_production_file": {
+        "file_path": "/production/rainfall/new/month/bi/data_map/2024/rainfall_new_month_bi_data_map_2024_12.tif"
+    },
+    "retrieve_production_files": MAPS,
+    "get_mesonet_stations": {},
+    "get_mesonet_variables": {},
+    "search_mesonet_variables": {"query": "air temperature"},
+    "get_mesonet_station_monitor": {},
+    "get_station_monitor_changes": {},
+    "email_mesonet_measurements": {"email": "bench@example.com", "station_ids": "0115",
+                                   "start_date": "2024-12-01", "end_date": "2024-12-02"},
+    "get_prefetch_stats": {},
+    "get_mesonet_sync_status": {},
+    # Filled in by ToolBench.prepare() just before they run.
+    "fetch_result_page": {},
+    "get_job_status": {},
+    "get_job_result": {},
+}
+
+
+def tool_name(scenario: str) -> str:
+    return scenario.split("[", 1)[0]
+
+
+def render(arguments: Dict[str, Any], i: int) -> Dict[str, Any]:
+    return {k: v.replace("{i}", str(i)) if isinstance(v, str) and "{i}" in v else v
+            for k, v in arguments.items()}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mock(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    """Run ``mock_api.py`` on ``port`` and wait until it answers."""
+    import httpx
+
+    command = [sys.executable, str(ROOT / "benchmarks" / "mock_api.py"), "--port", str(port),
+               "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+               "--error-rate", str(args.error_rate), "--rows", str(args.rows)]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.getenv("PYTHONPATH")]))}
+    proc = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/mock/stats").raise_for_status()
+            return proc
+        except httpx.HTTPError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("mock API did not start")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class ToolBench:
+    """Runs scenarios through the MCP tool path of this process."""
+
+    def __init__(self, mock_url: str):
+        from hcdp_mcp_server import server
+
+        self.server = server
+        self.mock_url = mock_url
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """One tool call; returns its latency, output size and whether it failed."""
+        start = time.perf_counter()
+        content = await self.server.handle_call_tool(name, arguments)
+        text = content[0].text
+        size = sum(len(c.text.encode()) for c in content)
+        failed = text.startswith("Error calling HCDP API")
+        if not failed and '"job_id"' in text[:200]:
+            job = await self.server.job_manager().wait(json.loads(text)["job_id"])
+            failed = job["status"] != "succeeded"
+            size += len(self.server.dumps(job.get("result")).encode())
+        return {"seconds": time.perf_counter() - start, "bytes": size, "failed": failed}
+
+    async def prepare(self, scenario: str) -> None:
+        """Fill in arguments that come from an earlier result: a cursor or a job id."""
+        if scenario == "fetch_result_page":
+            content = await self.server.handle_call_tool("get_mesonet_data", {"limit": 5000})
+            if len(content) > 1:
+                SCENARIOS[scenario] = {"cursor": json.loads(content[1].text)["next_cursor"]}
+        elif scenario in ("get_job_status", "get_job_result"):
+            content = await self.server.handle_call_tool("generate_data_package_email", PACKAGE)
+            job_id = json.loads(content[0].text)["job_id"]
+            await self.server.job_manager().wait(job_id)
+            SCENARIOS[scenario] = {"job_id": job_id}
+
+    async def upstream_requests(self) -> int:
+        from hcdp_mcp_server.client import get_http_client
+
+        response = await get_http_client().get(f"{self.mock_url}/mock/stats")
+        return sum(response.json()["requests"].values())
+
+    async def run(self, scenario: str, requests: int, concurrency: int) -> Dict[str, Any]:
+        """``requests`` calls of ``scenario``, at most ``concurrency`` at a time."""
+        name, arguments = tool_name(scenario), SCENARIOS[scenario]
+        before = await self.upstream_requests()
+        pending = iter(range(requests))
+        results: List[Dict[str, Any]] = []
+
+        async def worker():
+            for i in pending:
+                results.append(await self.call(name, render(arguments, i)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+        latencies = [r["seconds"] * 1000 for r in results]
+        return {
+            "concurrency": concurrency,
+            "requests": requests,
+            "errors": sum(r["failed"] for r in results),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "throughput_rps": round(requests / wall, 1),
+            "bytes_serialized": sum(r["bytes"] for r in results),
+            "upstream_requests": await self.upstream_requests() - before,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+async def benchmark(args: argparse.Namespace, mock_url: str) -> Dict[str, Any]:
+    bench = ToolBench(mock_url)
+    scenarios = [s for s in SCENARIOS if not args.tools or tool_name(s) in args.tools or s in args.tools]
+    results: Dict[str, Any] = {}
+    for scenario in scenarios:
+        await bench.prepare(scenario)
+        first = await bench.call(tool_name(scenario), render(SCENARIOS[scenario], 0))
+        runs = [await bench.run(scenario, args.requests, c) for c in args.concurrency]
+        results[scenario] = {"first_call_ms": round(first["seconds"] * 1000, 3), "runs": runs}
+        for run in runs:
+            print(f"  {scenario:<40} c={run['concurrency']:<3} p50 {run['p50_ms']:8.1f}  p95 {run['p95_ms']:8.1f}  "
+                  f"p99 {run['p99_ms']:8.1f} ms  {run['throughput_rps']:8.1f}/s  "
+                  f"{run['bytes_serialized'] / 1e6:7.2f} MB  err {run['errors']}", file=sys.stderr)
+    return results
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """p95 changes against ``baseline``, as lines."""
+    lines = []
+    for scenario, result in report["results"].items():
+        before = {r["concurrency"]: r for r in baseline.get("results", {}).get(scenario, {}).get("runs", [])}
+        for run in result["runs"]:
+            old = before.get(run["concurrency"])
+            if old and old["p95_ms"]:
+                ratio = run["p95_ms"] / old["p95_ms"]
+                lines.append(f"  {scenario:<40} c={run['concurrency']:<3} p95 {old['p95_ms']:8.1f} -> "
+                             f"{run['p95_ms']:8.1f} ms  {ratio:5.2f}x")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="Calls per scenario and concurrency level")
+    parser.add_argument("--concurrency", type=lambda s: [int(c) for c in s.split(",")], default=[1, 8, 32],
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--tools", type=lambda s: set(s.split(",")), help="Only these tools or scenarios")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mock API latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Mock API latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock API failure rate")
+    parser.add_argument("--rows", type=int, default=10_000, help="Mesonet rows served by the mock API")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare p95 against")
+    args = parser.parse_args()
+
+    port = free_port()
+    mock_url = f"http://127.0.0.1:{port}"
+    os.environ.update(HCDP_BASE_URL=mock_url, HCDP_API_TOKEN=os.getenv("HCDP_API_TOKEN", "benchmark"),
+                      HCDP_DATA_DIR=tempfile.mkdtemp(prefix="hcdp-bench-"))
+    proc = start_mock(port, args)
+    try:
+        from hcdp_mcp_server import __version__, serialization
+
+        print(f"Benchmarking tools against {mock_url} (latency {args.latency_ms} ms "
+              f"+ up to {args.jitter_ms} ms, error rate {args.error_rate})", file=sys.stderr)
+        results = asyncio.run(benchmark(args, mock_url))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    report = {
+        "version": __version__,
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": serialization.backend(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "tools")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        print(f"p95 against {args.baseline}:", file=sys.stderr)
+        print("\n".join(compare(report, json.loads(args.baseline.read_text()))), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
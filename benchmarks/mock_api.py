@@ -0,0 +1,293 @@
+"""Local stand-in for the HCDP API, replaying ``sample_data/`` fixtures.
+
+Serves every endpoint the client uses with configurable latency, error rate,
+payload sizes and pagination, so throughput and tail latency can be measured
+without the live API. Point the server at it with ``HCDP_BASE_URL``.
+
+    python benchmarks/mock_api.py --port 8765 --latency-ms 40 --jitter-ms 20 --error-rate 0.01
+
+Measurement rows are synthesized from the sample by stepping timestamps back
+5 minutes per copy; ``GET /mock/stats`` reports requests and injected errors
+per path.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import zipfile
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from hcdp_mcp_server import serialization
+
+SAMPLE = Path(__file__).parent.parent / "sample_data"
+TIMESTAMP = "%Y-%m-%dT%H:%M:%S.000Z"
+STREAM_CHUNK = 1 << 16
+# The only full GeoTIFF among the fixtures; it stands in for every map.
+MAP = SAMPLE / "rainfall_2024-12_big_island_monthly.tiff"
+PACKAGE_MONTHS = ("2024_10", "2024_11", "2024_12")
+
+
+class MockConfig(NamedTuple):
+    """Behaviour of the mock API."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rows: int = 10_000
+    files: int = 120
+    part_size: int = 1 << 20
+    max_limit: Optional[int] = None
+    monitor_churn: float = 0.1
+    seed: int = 0
+
+
+def _json(obj: Any) -> Response:
+    return Response(serialization.dumps(obj, pretty=False), media_type="application/json")
+
+
+def _page(items: List[Any], params: Any, max_limit: Optional[int]) -> List[Any]:
+    """``items[offset:offset + limit]``, with ``limit`` capped at ``max_limit``."""
+    offset = int(params.get("offset") or 0)
+    limit = int(params["limit"]) if params.get("limit") else None
+    if max_limit is not None:
+        limit = max_limit if limit is None else min(limit, max_limit)
+    return items[offset:] if limit is None else items[offset:offset + limit]
+
+
+def _csv(value: Optional[str]) -> Optional[set]:
+    return {v.strip() for v in value.split(",") if v.strip()} if value else None
+
+
+class MockData:
+    """Fixtures loaded once and the payloads derived from them."""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.map = MAP.read_bytes()
+        self.timeseries = json.loads((SAMPLE / "timeseries_rainfall_2024_hilo.json").read_text())
+        self.stations = json.loads((SAMPLE / "mesonet_stations_hawaii.json").read_text())
+        self.variables = (SAMPLE / "mesonet_variables_hawaii.json").read_bytes()
+        self.measurements = self._measurements(json.loads((SAMPLE / "mesonet_measurements_recent.json").read_text()))
+        self.station_metadata = [
+            {"name": "hcdp_station_metadata", "value": {
+                "skn": s["station_id"], "name": s["name"], "lat": s.get("lat"), "lng": s.get("lng"),
+                "elevation_m": s.get("elevation")
+            }}
+            for s in self.stations
+        ]
+        self.package = self._package()
+        self.monitor_tick = 0
+
+    def _measurements(self, sample: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """``config.rows`` rows: copies of the sample, each 5 minutes earlier."""
+        newest = datetime.strptime(sample[0]["timestamp"], TIMESTAMP)
+        rows = []
+        for i in range(self.config.rows):
+            copy, j = divmod(i, len(sample))
+            rows.append({**sample[j], "timestamp": (newest - timedelta(minutes=5 * copy)).strftime(TIMESTAMP)})
+        return rows
+
+    def _package(self) -> bytes:
+        """A zip of monthly maps named like production files."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            for month in PACKAGE_MONTHS:
+                zf.writestr(f"rainfall_new_month_bi_data_map_{month}.tif", self.map)
+        return buffer.getvalue()
+
+    def production_files(self, datatype: str, period: str, extent: str) -> List[str]:
+        """``config.files`` paths, newest first, one per month or day of ``period``."""
+        step = "day" if period == "day" else "month"
+        start = datetime(2024, 12, 31 if step == "day" else 1)
+        files = []
+        for i in range(self.config.files):
+            if step == "day":
+                date = (start - timedelta(days=i)).strftime("%Y_%m_%d")
+            else:
+                year, month = divmod(start.year * 12 + start.month - 1 - i, 12)
+                date = f"{year}_{month + 1:02d}"
+            files.append(f"/production/{datatype}/new/{step}/{extent}/data_map/{date[:4]}/"
+                         f"{datatype}_new_{step}_{extent}_data_map_{date}.tif")
+        return files
+
+    def monitor(self) -> List[Dict[str, Any]]:
+        """Station status where ``monitor_churn`` of the stations report anew on each call."""
+        self.monitor_tick += 1
+        every = max(1, round(1 / self.config.monitor_churn)) if self.config.monitor_churn else 0
+        base = datetime(2024, 12, 2)
+        records = []
+        for i, station in enumerate(self.stations):
+            updates = (self.monitor_tick + i % every) // every if every else 0
+            records.append({
+                "station_id": station["station_id"],
+                "status": station.get("status"),
+                "timestamp": (base + timedelta(minutes=5 * updates)).strftime(TIMESTAMP),
+                "Tair_1_Avg": round(20 + (i + updates) % 10 * 0.5, 2),
+            })
+        return records
+
+
+def build_app(config: MockConfig = MockConfig()) -> Starlette:
+    """The mock API as an ASGI app; ``app.state.stats`` counts requests and errors."""
+    data = MockData(config)
+    rng = random.Random(config.seed)
+    stats = {"requests": Counter(), "errors": Counter()}
+
+    def route(path: str, methods: Tuple[str, ...] = ("GET",), name: Optional[str] = None):
+        def wrap(handler):
+            async def endpoint(request: Request) -> Response:
+                stats["requests"][path] += 1
+                if config.latency_ms or config.jitter_ms:
+                    await asyncio.sleep((config.latency_ms + rng.uniform(0, config.jitter_ms)) / 1000)
+                if config.error_rate and rng.random() < config.error_rate:
+                    stats["errors"][path] += 1
+                    return JSONResponse({"error": "injected failure"}, status_code=config.error_status)
+                return await handler(request)
+            return Route(path, endpoint, methods=methods, name=name)
+        return wrap
+
+    @route("/raster")
+    async def raster(request: Request) -> Response:
+        return Response(data.map, media_type="image/tiff")
+
+    @route("/raster/timeseries")
+    async def timeseries(request: Request) -> Response:
+        start, end = request.query_params.get("start", ""), request.query_params.get("end", "9999")
+        return _json({t: v for t, v in data.timeseries.items() if start <= t[:len(start)] and t[:len(end)] <= end})
+
+    @route("/stations")
+    async def stations(request: Request) -> Response:
+        return _json({"result": _page(data.station_metadata, request.query_params, config.max_limit)})
+
+    @route("/mesonet/db/measurements")
+    async def measurements(request: Request) -> Response:
+        p = request.query_params
+        stations, variables = _csv(p.get("station_ids")), _csv(p.get("var_ids"))
+        rows = data.measurements
+        if stations or variables:
+            rows = [r for r in rows if (not stations or r["station_id"] in stations)
+                    and (not variables or r["variable"] in variables)]
+        return _json(_page(rows, p, config.max_limit))
+
+    @route("/mesonet/db/stations")
+    async def mesonet_stations(request: Request) -> Response:
+        return _json(data.stations)
+
+    @route("/mesonet/db/variables")
+    async def mesonet_variables(request: Request) -> Response:
+        return Response(data.variables, media_type="application/json")
+
+    @route("/mesonet/db/stationMonitor")
+    async def station_monitor(request: Request) -> Response:
+        return _json(data.monitor())
+
+    @route("/files/production/list")
+    async def production_list(request: Request) -> Response:
+        query = json.loads(request.query_params.get("data", "{}"))
+        return _json(data.production_files(
+            query.get("datatype", "rainfall"), query.get("period", "month"), query.get("extent", "statewide")
+        ))
+
+    @route("/files/production/retrieve")
+    async def production_retrieve(request: Request) -> Response:
+        return Response(data.map, media_type="image/tiff")
+
+    @route("/genzip/email", ("POST",))
+    async def genzip_email(request: Request) -> Response:
+        await request.body()
+        return _json({"message": "Request received. You will receive an email when your package is ready."})
+
+    @route("/mesonet/db/measurements/email", ("POST",))
+    async def measurements_email(request: Request) -> Response:
+        await request.body()
+        return _json({"message": "Request received. You will receive an email when your data is ready."})
+
+    @route("/genzip/instant/link", ("POST",))
+    async def instant_link(request: Request) -> Response:
+        await request.body()
+        return _json(str(request.url_for("package")))
+
+    @route("/genzip/instant/splitlink", ("POST",))
+    async def instant_splitlink(request: Request) -> Response:
+        await request.body()
+        parts = range(0, len(data.package), config.part_size)
+        return _json([str(request.url_for("part", index=i)) for i in range(len(parts))])
+
+    @route("/genzip/instant/content", ("POST",))
+    async def instant_content(request: Request) -> Response:
+        await request.body()
+
+        async def chunks():
+            for i in range(0, len(data.package), STREAM_CHUNK):
+                yield data.package[i:i + STREAM_CHUNK]
+        return StreamingResponse(chunks(), media_type="application/zip",
+                                 headers={"content-length": str(len(data.package))})
+
+    @route("/mock/package.zip", name="package")
+    async def package(request: Request) -> Response:
+        return Response(data.package, media_type="application/zip")
+
+    @route("/mock/parts/{index:int}", name="part")
+    async def part(request: Request) -> Response:
+        index = request.path_params["index"]
+        body = data.package[index * config.part_size:(index + 1) * config.part_size]
+        if not body:
+            return Response(status_code=404)
+        requested = request.headers.get("range", "")
+        if requested.startswith("bytes=") and requested.endswith("-"):
+            offset = int(requested[len("bytes="):-1])
+            return Response(body[offset:], status_code=206, media_type="application/octet-stream",
+                            headers={"content-range": f"bytes {offset}-{len(body) - 1}/{len(body)}"})
+        return Response(body, media_type="application/octet-stream")
+
+    async def report(request: Request) -> Response:
+        return JSONResponse({name: dict(counts) for name, counts in stats.items()})
+
+    app = Starlette(routes=[
+        raster, timeseries, stations, measurements, mesonet_stations, mesonet_variables, station_monitor,
+        production_list, production_retrieve, genzip_email, measurements_email, instant_link,
+        instant_splitlink, instant_content, package, part, Route("/mock/stats", report),
+    ])
+    app.state.stats = stats
+    app.state.data = data
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="Status of injected failures")
+    parser.add_argument("--rows", type=int, default=10_000, help="Mesonet measurement rows available")
+    parser.add_argument("--files", type=int, default=120, help="Files per production listing")
+    parser.add_argument("--part-size", type=int, default=1 << 20, help="Bytes per split package part")
+    parser.add_argument("--max-limit", type=int, help="Cap on page size for paged endpoints")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and failures")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = MockConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        error_status=args.error_status, rows=args.rows, files=args.files, part_size=args.part_size,
+        max_limit=args.max_limit, seed=args.seed,
+    )
+    print(f"Mock HCDP API on http://{args.host}:{args.port} (set HCDP_BASE_URL to this)")
+    uvicorn.run(build_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Cached, indexed listings of production files."""
+
+import bisect
+import fnmatch
+import heapq
+import posixpath
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .naming import map_fields, parse_production_name
+
+
+def production_files(result: Any) -> List[str]:
+    """Extract file paths from a ``/files/production/list`` response."""
+    if isinstance(result, dict):
+        result = result.get("files", result.get("data"))
+    if isinstance(result, list) and all(isinstance(f, str) for f in result):
+        return result
+    raise ValueError("Unrecognized production file list; expected a list of file paths")
+
+
+class ProductionCatalog:
+    """Production file paths held sorted by (date, path) for range queries.
+
+    Keys are grouped by date precision (year, month or day) so each group is
+    bisected at its own width. Files without a date in their name are kept
+    separately and only returned by queries without date bounds.
+    """
+
+    def __init__(self, files: Iterable[str] = ()):
+        self._keys: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+        self._undated: List[str] = []
+        self._records: Dict[str, Dict[str, Optional[str]]] = {}
+        self.update(files)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._records
+
+    def record(self, path: str) -> Dict[str, Optional[str]]:
+        """Fields parsed from a path: name, datatype, date and, for maps, production/period/extent."""
+        return self._records[path]
+
+    def update(self, files: Iterable[str]) -> Dict[str, List[str]]:
+        """Replace the listing with ``files``, applying only the difference.
+
+        Returns the paths that were added and removed.
+        """
+        files = set(files)
+        removed = sorted(self._records.keys() - files)
+        added = sorted(files - self._records.keys())
+        if removed:
+            gone = set(removed)
+            for path in removed:
+                del self._records[path]
+            for width, keys in self._keys.items():
+                self._keys[width] = [k for k in keys if k[1] not in gone]
+            self._undated = [p for p in self._undated if p not in gone]
+        new_keys: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+        for path in added:
+            parsed = parse_production_name(path)
+            record: Dict[str, Optional[str]] = {
+                "name": posixpath.basename(path),
+                "datatype": parsed.datatype if parsed else None,
+                "date": parsed.date if parsed else None,
+            }
+            if parsed is not None:
+                record.update(map_fields(parsed) or {})
+                new_keys[len(parsed.date)].append((parsed.date, path))
+            else:
+                self._undated.append(path)
+            self._records[path] = record
+        for width, keys in new_keys.items():
+            # Timsort merges the sorted existing run with the new keys in near-linear time.
+            self._keys[width].extend(keys)
+            self._keys[width].sort()
+        self._undated.sort()
+        return {"added": added, "removed": removed}
+
+    def query(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        pattern: Optional[str] = None
+    ) -> List[str]:
+        """Paths dated within ``start_date``..``end_date`` whose name matches ``pattern``.
+
+        Bounds compare on the shared date prefix, so ``2024-03`` as an end date
+        keeps every file dated within March 2024 and a yearly file for 2024
+        matches a ``2024-06-15`` start. ``pattern`` is a shell-style wildcard
+        matched against the file name.
+        """
+        ranges = []
+        for width, keys in self._keys.items():
+            lo, hi = 0, len(keys)
+            if start_date:
+                lo = bisect.bisect_left(keys, (start_date[:width], ""))
+            if end_date:
+                # "~" sorts after digits and "-", so every date starting with end_date is kept.
+                hi = bisect.bisect_left(keys, (end_date + "~", ""), lo)
+            ranges.append(keys[lo:hi])
+        paths = [path for _, path in heapq.merge(*ranges)]
+        if not start_date and not end_date:
+            paths = self._undated + paths
+        if pattern:
+            paths = [p for p in paths if fnmatch.fnmatchcase(posixpath.basename(p), pattern)]
+        return paths
+
+
+class CatalogCache:
+    """Catalogs keyed by listing query, refreshed from the API after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[ProductionCatalog, float]] = {}
+
+    @staticmethod
+    def key(
+        datatype: str,
+        production: Optional[str] = None,
+        period: Optional[str] = None,
+        extent: Optional[str] = None
+    ) -> Tuple:
+        return (datatype, production, period, extent)
+
+    def get(self, key: Tuple) -> Optional[ProductionCatalog]:
+        """Return the catalog for ``key`` if it is fresh."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    def refresh(self, key: Tuple, files: Iterable[str]) -> Tuple[ProductionCatalog, Dict[str, List[str]]]:
+        """Update (or create) the catalog for ``key`` from a fresh listing."""
+        catalog = self._entries[key][0] if key in self._entries else ProductionCatalog()
+        diff = catalog.update(files)
+        self._entries[key] = (catalog, time.monotonic())
+        return catalog, diff
+
+    def clear(self) -> None:
+        self._entries.clear()
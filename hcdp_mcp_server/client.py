@@ -2,18 +2,136 @@
 
 import os
 import json
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-import httpx
-from dotenv import load_dotenv
+import asyncio
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 
-load_dotenv()
+from .catalog import CatalogCache, ProductionCatalog, production_files
+from .file_cache import FileCache
+from .mesonet_store import MesonetStore
+from .monitor import MonitorCache, MonitorFeed
+from .prefetch import RasterPrefetcher
+from .ratelimit import RateLimiter
+from .raster_cache import RasterCache
+from .serialization import loads
+from .search_index import IndexCache
+from .stations import METADATA_QUERY, StationIndex, parse_query, split_listing
+from .timeseries_cache import TimeseriesCache, is_series, parse_date_bound
+from .variables import VariableCatalog
+
+if TYPE_CHECKING:
+    import httpx
+
+# One rate limiter per process and one connection pool per event loop, shared by
+# every client and every MCP session so keep-alive connections and the request
+# budget are reused. Both are created on first use to keep startup cheap; each
+# pool is closed when its loop shuts down.
+_rate_limiter: Optional[RateLimiter] = None
+_http_pools: Dict[asyncio.AbstractEventLoop, Tuple["httpx.AsyncClient", "asyncio.Task"]] = {}
+_env_loaded = False
+# Set in a task whose next request was already paid for with try_acquire(),
+# so low-priority work (prefetching) only runs when a token is spare.
+_token_reserved: ContextVar[bool] = ContextVar("hcdp_token_reserved", default=False)
+
+
+def load_env() -> None:
+    """Load settings from a .env file, once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the shared upstream rate limiter (``HCDP_RATE_LIMIT`` requests/s)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        load_env()
+        _rate_limiter = RateLimiter(float(os.getenv("HCDP_RATE_LIMIT", "0")))
+    return _rate_limiter
+
+
+async def _throttle(request: "httpx.Request") -> None:
+    if _token_reserved.get():
+        _token_reserved.set(False)
+        return
+    await get_rate_limiter().acquire()
+
+
+async def _close_with_loop(client: "httpx.AsyncClient") -> None:
+    """Wait until the loop shuts down (cancelling its tasks), then close ``client``.
+
+    A pool's sockets belong to the loop that opened them and cannot be closed
+    from another one, so each pool is closed by a task on its own loop.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.create_future()
+    finally:
+        if _http_pools.get(loop, (None,))[0] is client:
+            del _http_pools[loop]
+        await client.aclose()
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared connection pool, creating it for the running event loop."""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    pool = _http_pools.get(loop)
+    if pool is None or pool[0].is_closed:
+        if pool is not None:
+            pool[1].cancel()
+        max_connections = int(os.getenv("HCDP_MAX_CONNECTIONS", "20"))
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            event_hooks={"request": [_throttle]}
+        )
+        pool = _http_pools[loop] = (client, loop.create_task(_close_with_loop(client)))
+    return pool[0]
+
+
+async def aclose_http_client() -> None:
+    """Close the running loop's shared connection pool."""
+    pool = _http_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        pool[1].cancel()
+        await pool[0].aclose()
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _split_ids(ids: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated id list; None or empty means all."""
+    if not ids:
+        return None
+    return sorted({i.strip() for i in ids.split(",") if i.strip()}) or None
 
 
 class HCDPClient:
     """Client for interacting with the HCDP API."""
     
-    def __init__(self, api_token: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeseries_cache: Optional[TimeseriesCache] = None,
+        file_cache: Optional[FileCache] = None,
+        catalog_cache: Optional[CatalogCache] = None,
+        prefetcher: Optional[RasterPrefetcher] = None,
+        mesonet_store: Optional[MesonetStore] = None,
+        monitor_cache: Optional[MonitorCache] = None,
+        index_cache: Optional[IndexCache] = None
+    ):
+        load_env()
         self.api_token = api_token or os.getenv("HCDP_API_TOKEN")
         self.base_url = base_url or os.getenv("HCDP_BASE_URL", "https://api.hcdp.ikewai.org")
         
@@ -24,6 +142,14 @@ class HCDPClient:
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json"
         }
+        self.timeseries_cache = timeseries_cache
+        self.file_cache = file_cache
+        self.raster_cache = RasterCache(file_cache) if file_cache is not None else None
+        self.catalog_cache = catalog_cache
+        self.prefetcher = prefetcher if file_cache is not None else None
+        self.mesonet_store = mesonet_store
+        self.monitor_cache = monitor_cache
+        self.index_cache = index_cache
     
     async def get_raster_data(
         self,
@@ -37,31 +163,65 @@ class HCDPClient:
         period: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get climate raster data."""
-        params = {
+        query = {
             "datatype": datatype,
             "date": date,
-            "extent": extent
+            "extent": extent,
+            "location": location,
+            "production": production,
+            "aggregation": aggregation,
+            "timescale": timescale,
+            "period": period
         }
-        if location:
-            params["location"] = location
-        if production:
-            params["production"] = production
-        if aggregation:
-            params["aggregation"] = aggregation
-        if timescale:
-            params["timescale"] = timescale
-        if period:
-            params["period"] = period
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/raster",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
+        if self.raster_cache is None:
+            return await self._fetch_raster(query)
+
+        key = self._raster_key(query)
+        cached = self.raster_cache.get(key)
+        if self.prefetcher is not None:
+            self.prefetcher.observe(
+                query, key, cached is not None, self._prefetch_raster,
+                self._raster_key, lambda k: k in self.raster_cache.files
             )
-            response.raise_for_status()
-            return response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.content}
+        if cached is not None:
+            return {"data": cached.read_bytes()}
+        return await self._fetch_raster(query, key)
+
+    def _raster_key(self, query: Dict[str, Any]) -> str:
+        return self.raster_cache.key(**{**query, "location": query["location"] or "hawaii"})
+
+    async def _prefetch_raster(self, query: Dict[str, Any]) -> None:
+        """Fetch a predicted raster into the cache.
+
+        The prefetcher took this request's rate-limiter token when scheduling it.
+        """
+        _token_reserved.set(True)
+        await self._fetch_raster(query, self._raster_key(query))
+
+    async def _fetch_raster(self, query: Dict[str, Any], key: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch a raster from the API, storing GeoTIFF responses under ``key``."""
+        params = {
+            "datatype": query["datatype"],
+            "date": query["date"],
+            "extent": query["extent"]
+        }
+        for name in ("location", "production", "aggregation", "timescale", "period"):
+            if query[name]:
+                params[name] = query[name]
+            
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/raster",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        if response.headers.get("content-type", "").startswith("application/json"):
+            return loads(response.content)
+        if key is not None:
+            self.raster_cache.put(key, response.content)
+        return {"data": response.content}
     
     async def get_timeseries_data(
         self,
@@ -96,16 +256,47 @@ class HCDPClient:
             params["timescale"] = timescale
         if period:
             params["period"] = period
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/raster/timeseries",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+
+        cache = self.timeseries_cache
+        start_day = parse_date_bound(start)
+        end_day = parse_date_bound(end, end=True)
+        if cache is None or start_day is None or end_day is None or start_day > end_day:
+            return await self._fetch_timeseries(params)
+
+        key = cache.key(
+            datatype=datatype,
+            extent=extent,
+            lat=lat,
+            lng=lng,
+            location=location,
+            production=production,
+            aggregation=aggregation,
+            timescale=timescale,
+            period=period
+        )
+        missing = cache.missing(key, start_day, end_day)
+        if missing:
+            results = await asyncio.gather(*(
+                self._fetch_timeseries({**params, "start": s.isoformat(), "end": e.isoformat()})
+                for s, e in missing
+            ))
+            if not all(is_series(result) for result in results):
+                return await self._fetch_timeseries(params)
+            for (s, e), result in zip(missing, results):
+                cache.add(key, s, e, result)
+        return cache.get(key, start_day, end_day)
+
+    async def _fetch_timeseries(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a timeseries from the API without consulting the cache."""
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/raster/timeseries",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def get_station_data(
         self,
@@ -113,7 +304,11 @@ class HCDPClient:
         limit: Optional[int] = None,
         offset: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Get station data using query parameter."""
+        """Get station data using query parameter.
+
+        With an index cache, equality and ``$in`` queries on station metadata
+        documents are answered and paged from a cached listing of every station.
+        """
         params = {
             "q": q
         }
@@ -121,16 +316,82 @@ class HCDPClient:
             params["limit"] = limit
         if offset:
             params["offset"] = offset
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/stations",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
+
+        query = parse_query(q) if self.index_cache is not None else None
+        index = await self._station_index() if query is not None else None
+        if index is None:
+            return await self._fetch_stations(params)
+        matches = index.query(query)
+        start = offset or 0
+        return index.wrap(matches[start:start + limit] if limit else matches[start:])
+
+    async def search_stations(
+        self,
+        station_id: Optional[str] = None,
+        name: Optional[str] = None,
+        island: Optional[str] = None,
+        min_elevation: Optional[float] = None,
+        max_elevation: Optional[float] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius_km: float = 10.0,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Search the station index by id, name, island, elevation band or distance."""
+        index = await self._station_index()
+        if index is None:
+            index = StationIndex(await self._station_listing())
+        found = index.search(station_id, name, island, min_elevation, max_elevation, lat, lng, radius_km)
+        stations = [{**record, **info} for record, info in found[offset:offset + limit]]
+        return {"stations": stations, "count": len(found), "total": len(index)}
+
+    async def _station_index(self) -> Optional[StationIndex]:
+        """The cached station index, built from a full listing when stale."""
+        cache = self.index_cache
+        if cache is None:
+            return None
+        index = cache.get(("stations",))
+        if index is None:
+            try:
+                index = cache.put(("stations",), StationIndex(await self._station_listing()))
+            except ValueError:
+                return None
+        return index
+
+    async def _station_listing(self) -> Any:
+        """Every station metadata document, read from ``/stations`` a page at a time.
+
+        A short page ends the listing, as does a long one (``limit`` ignored).
+        Raises ValueError if the API repeats a page instead of advancing, as
+        the listing could then be incomplete.
+        """
+        page_size = int(os.getenv("HCDP_STATIONS_PAGE_SIZE", "1000"))
+        container, records = None, []
+        offset = 0
+        while True:
+            container, page = split_listing(
+                await self._fetch_stations({"q": METADATA_QUERY, "limit": page_size, "offset": offset})
             )
-            response.raise_for_status()
-            return response.json()
+            if offset and page and page[0] == records[0]:
+                raise ValueError("Station listing ignores offset; cannot read every page")
+            records.extend(page)
+            if len(page) != page_size:
+                break
+            offset += page_size
+        return {container: records} if container else records
+
+    async def _fetch_stations(self, params: Dict[str, Any]) -> Any:
+        """Query ``/stations`` on the API without consulting the index."""
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/stations",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def get_mesonet_data(
         self,
@@ -144,7 +405,13 @@ class HCDPClient:
         offset: Optional[int] = None,
         join_metadata: bool = True
     ) -> Dict[str, Any]:
-        """Get mesonet weather station measurements."""
+        """Get mesonet weather station measurements.
+
+        With a mesonet store, date-bounded queries for given stations or
+        variables are answered from local data and only the days not stored
+        yet are fetched. The current UTC day is never recorded as stored, so
+        it is fetched again on every query.
+        """
         params = {
             "location": location,
             "join_metadata": str(join_metadata).lower()
@@ -163,16 +430,72 @@ class HCDPClient:
             params["limit"] = limit
         if offset:
             params["offset"] = offset
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/measurements",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+
+        store = self.mesonet_store
+        stations = _split_ids(station_ids)
+        variables = _split_ids(var_ids)
+        start_day = parse_date_bound(start_date) if start_date and len(start_date) <= 10 else None
+        end_day = parse_date_bound(end_date, end=True) if end_date and len(end_date) <= 10 else None
+        # Filling the store for every station and variable would fetch far more than one page.
+        unfiltered = stations is None and variables is None
+        if (store is None or unfiltered or intervals or location != "hawaii"
+                or start_day is None or end_day is None or start_day > end_day):
+            return await self._fetch_mesonet(params)
+
+        missing = await asyncio.to_thread(store.missing, stations, variables, start_day, end_day)
+        if missing:
+            base = {k: v for k, v in params.items() if k not in ("limit", "offset")}
+            base["join_metadata"] = "true"
+            pages = await asyncio.gather(*(
+                self._fetch_mesonet_window(base, s, e) for s, e in missing
+            ))
+            # Today's data is still being published; only earlier days are complete.
+            last_whole = _utc_today() - timedelta(days=1)
+            for (s, e), rows in zip(missing, pages):
+                await asyncio.to_thread(store.insert, rows)
+                if s <= last_whole:
+                    await asyncio.to_thread(store.mark, stations, variables, s, min(e, last_whole))
+        return await asyncio.to_thread(
+            store.query, stations, variables, start_day, end_day, join_metadata, limit, offset
+        )
+
+    async def _fetch_mesonet_window(
+        self,
+        params: Dict[str, Any],
+        start: date,
+        end: date
+    ) -> List[Dict[str, Any]]:
+        """Fetch every measurement for the days ``start``..``end``, following pages."""
+        page_size = int(os.getenv("HCDP_MESONET_PAGE_SIZE", "10000"))
+        window = {
+            **params,
+            "start_date": start.isoformat(),
+            # The API's end bound is an instant; ask through the next midnight so the last day is whole.
+            "end_date": (end + timedelta(days=1)).isoformat(),
+            "limit": page_size
+        }
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            page = await self._fetch_mesonet({**window, "offset": offset})
+            if not isinstance(page, list):
+                raise ValueError("Unexpected mesonet response; expected a list of measurements")
+            rows += page
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+
+    async def _fetch_mesonet(self, params: Dict[str, Any]) -> Any:
+        """Fetch mesonet measurements from the API without consulting the store."""
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/mesonet/db/measurements",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def generate_data_package_email(
         self,
@@ -210,18 +533,18 @@ class HCDPClient:
         if zipName:
             payload["zipName"] = zipName
             
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/email",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/genzip/email",
+            json=payload,
+            headers=self.headers,
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
-    async def generate_data_package_instant_link(
-        self,
+    @staticmethod
+    def _instant_payload(
         email: str,
         datatype: str,
         production: Optional[str] = None,
@@ -232,7 +555,7 @@ class HCDPClient:
         files: Optional[List[Dict]] = None,
         zipName: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate instant download link for data package."""
+        """Request body for the ``/genzip/instant/*`` endpoints."""
         if files is None:
             # Create basic file data structure
             files = [{
@@ -252,16 +575,34 @@ class HCDPClient:
         }
         if zipName:
             payload["zipName"] = zipName
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/instant/link",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return payload
+    
+    async def generate_data_package_instant_link(
+        self,
+        email: str,
+        datatype: str,
+        production: Optional[str] = None,
+        period: Optional[str] = None,
+        extent: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        files: Optional[List[Dict]] = None,
+        zipName: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Generate instant download link for data package."""
+        payload = self._instant_payload(
+            email, datatype, production, period, extent, start_date, end_date, files, zipName
+        )
+
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/genzip/instant/link",
+            json=payload,
+            headers=self.headers,
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def generate_data_package_instant_content(
         self,
@@ -276,33 +617,62 @@ class HCDPClient:
         zipName: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate instant download content for data package."""
-        if files is None:
-            files = [{
-                "datatype": datatype,
-                "production": production,
-                "period": period,
-                "extent": extent,
-                "start_date": start_date,
-                "end_date": end_date
-            }]
-            files = [{k: v for k, v in file_data.items() if v is not None} for file_data in files]
-            
-        payload = {
-            "email": email,
-            "data": files
-        }
-        if zipName:
-            payload["zipName"] = zipName
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/instant/content",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
+        payload = self._instant_payload(
+            email, datatype, production, period, extent, start_date, end_date, files, zipName
+        )
+
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/genzip/instant/content",
+            json=payload,
+            headers=self.headers,
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return {"data": response.content}
+    
+    async def download_instant_content(
+        self,
+        email: str,
+        datatype: str,
+        dest: str,
+        production: Optional[str] = None,
+        period: Optional[str] = None,
+        extent: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        files: Optional[List[Dict]] = None,
+        zipName: Optional[str] = None,
+        ingest: bool = True
+    ) -> Dict[str, Any]:
+        """Stream instant package content to disk and index its members.
+
+        With ``ingest`` the package's maps are added to the raster cache.
+        """
+        from .packages import index_package
+
+        payload = self._instant_payload(
+            email, datatype, production, period, extent, start_date, end_date, files, zipName
+        )
+        path = Path(dest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        client = get_http_client()
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/genzip/instant/content",
+            json=payload,
+            headers=self.headers,
+            timeout=120.0
+        ) as response:
             response.raise_for_status()
-            return {"data": response.content}
+            with open(tmp, "wb") as f:
+                async for chunk in response.aiter_bytes(1 << 20):
+                    f.write(chunk)
+        os.replace(tmp, path)
+        return await asyncio.to_thread(
+            index_package, path, self.raster_cache if ingest else None
+        )
     
     async def generate_data_package_splitlink(
         self,
@@ -317,42 +687,90 @@ class HCDPClient:
         zipName: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate split download links for data package."""
-        if files is None:
-            files = [{
-                "datatype": datatype,
-                "production": production,
-                "period": period,
-                "extent": extent,
-                "start_date": start_date,
-                "end_date": end_date
-            }]
-            files = [{k: v for k, v in file_data.items() if v is not None} for file_data in files]
-            
-        payload = {
-            "email": email,
-            "data": files
-        }
-        if zipName:
-            payload["zipName"] = zipName
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/instant/splitlink",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
+        payload = self._instant_payload(
+            email, datatype, production, period, extent, start_date, end_date, files, zipName
+        )
+
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/genzip/instant/splitlink",
+            json=payload,
+            headers=self.headers,
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
+    
+    async def download_split_package(
+        self,
+        urls: List[str],
+        dest: str,
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """Download split package parts concurrently and reassemble the archive."""
+        from .downloads import download_split_package
+
+        headers = None
+        if all(url.startswith(self.base_url) for url in urls):
+            headers = {"Authorization": self.headers["Authorization"]}
+        return await download_split_package(
+            get_http_client(),
+            urls,
+            Path(dest),
+            concurrency=concurrency,
+            headers=headers
+        )
     
     async def list_production_files(
         self,
         datatype: str,
         production: Optional[str] = None,
         period: Optional[str] = None,
-        extent: Optional[str] = None
+        extent: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        pattern: Optional[str] = None,
+        refresh: bool = False
     ) -> Dict[str, Any]:
-        """List available production files."""
+        """List available production files.
+
+        With a catalog cache, or any of ``start_date``/``end_date``/``pattern``,
+        the listing is indexed and queried locally and the result is
+        ``{"files": [...], "count": n, "total": n}``.
+        """
+        cache = self.catalog_cache
+        if cache is None and not (start_date or end_date or pattern):
+            return await self._fetch_production_list(datatype, production, period, extent)
+
+        key = CatalogCache.key(datatype, production, period, extent)
+        catalog = cache.get(key) if cache is not None and not refresh else None
+        diff = None
+        if catalog is None:
+            listing = await self._fetch_production_list(datatype, production, period, extent)
+            try:
+                files = production_files(listing)
+            except ValueError:
+                return listing
+            if cache is not None:
+                catalog, diff = cache.refresh(key, files)
+            else:
+                catalog = ProductionCatalog(files)
+
+        files = catalog.query(start_date, end_date, pattern)
+        result: Dict[str, Any] = {"files": files, "count": len(files), "total": len(catalog)}
+        if diff is not None:
+            result["added"] = len(diff["added"])
+            result["removed"] = len(diff["removed"])
+        return result
+
+    async def _fetch_production_list(
+        self,
+        datatype: str,
+        production: Optional[str] = None,
+        period: Optional[str] = None,
+        extent: Optional[str] = None
+    ) -> Any:
+        """Fetch a production file listing from the API without consulting the catalog."""
         data_config = {"datatype": datatype}
         if production:
             data_config["production"] = production
@@ -363,29 +781,112 @@ class HCDPClient:
             
         params = {"data": json.dumps(data_config)}
             
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/files/production/list",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/files/production/list",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def retrieve_production_file(self, file_path: str) -> Dict[str, Any]:
         """Retrieve a specific production file."""
+        if self.file_cache is not None:
+            cached = self.file_cache.get(file_path)
+            if cached is not None:
+                return {"data": cached.read_bytes()}
+        data = await self._fetch_production_file(file_path)
+        if self.file_cache is not None:
+            self.file_cache.put(file_path, data)
+        return {"data": data}
+
+    async def _fetch_production_file(self, file_path: str) -> bytes:
+        """Fetch a production file from the API without consulting the cache."""
         params = {"file_path": file_path}
             
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/files/production/retrieve",
-                params=params,
-                headers=self.headers,
-                timeout=120.0
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/files/production/retrieve",
+            params=params,
+            headers=self.headers,
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return response.content
+    
+    async def retrieve_production_files(
+        self,
+        file_paths: Optional[List[str]] = None,
+        datatype: Optional[str] = None,
+        production: Optional[str] = None,
+        period: Optional[str] = None,
+        extent: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        pattern: Optional[str] = None,
+        concurrency: int = 8
+    ) -> Dict[str, Any]:
+        """Retrieve many production files into the file cache.
+
+        Files are given as ``file_paths`` or selected with a catalog query.
+        """
+        from .downloads import retrieve_files
+        import httpx
+
+        if self.file_cache is None:
+            raise ValueError("Bulk retrieval requires a file cache")
+        if file_paths is None:
+            if datatype is None:
+                raise ValueError("Provide file_paths or a datatype to query")
+            listing = await self.list_production_files(
+                datatype, production=production, period=period, extent=extent,
+                start_date=start_date, end_date=end_date, pattern=pattern
             )
-            response.raise_for_status()
-            return {"data": response.content}
+            file_paths = production_files(listing)
+        url = f"{self.base_url}/files/production/retrieve"
+        return await retrieve_files(
+            get_http_client(),
+            file_paths,
+            self.file_cache,
+            lambda file_path: str(httpx.URL(url, params={"file_path": file_path})),
+            concurrency=concurrency,
+            headers={"Authorization": self.headers["Authorization"]}
+        )
+    
+    async def build_data_package(
+        self,
+        datatype: str,
+        dest: str,
+        production: Optional[str] = None,
+        period: Optional[str] = None,
+        extent: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        compression: str = "store",
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """Zip production files locally, fetching only those not already cached."""
+        from .packages import build_package
+
+        if self.file_cache is None:
+            raise ValueError("Building packages locally requires a file cache")
+        listing = await self.list_production_files(
+            datatype, production=production, period=period, extent=extent,
+            start_date=start_date, end_date=end_date
+        )
+        files = production_files(listing)
+        if not files:
+            raise ValueError("No production files match the request")
+        return await build_package(
+            files,
+            self.file_cache,
+            self._fetch_production_file,
+            Path(dest),
+            compression=compression,
+            concurrency=concurrency
+        )
     
     async def get_mesonet_stations(
         self,
@@ -394,49 +895,117 @@ class HCDPClient:
         """Get mesonet station information."""
         params = {"location": location}
             
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/stations",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/mesonet/db/stations",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def get_mesonet_variables(
         self,
         location: str = "hawaii"
     ) -> Dict[str, Any]:
-        """Get mesonet variable definitions."""
+        """Get mesonet variable definitions.
+
+        With an index cache, the list is fetched once per TTL and indexed for
+        ``search_mesonet_variables``.
+        """
+        cache = self.index_cache
+        if cache is None:
+            return await self._fetch_mesonet_variables(location)
+        catalog = cache.get(("variables", location))
+        if catalog is None:
+            variables = await self._fetch_mesonet_variables(location)
+            try:
+                catalog = cache.put(("variables", location), VariableCatalog(variables))
+            except ValueError:
+                return variables
+        return catalog.variables
+
+    async def search_mesonet_variables(
+        self,
+        query: str,
+        limit: int = 10,
+        location: str = "hawaii"
+    ) -> Dict[str, Any]:
+        """Find the variables best matching ``query`` by id, display name or units."""
+        cache = self.index_cache
+        catalog = cache.get(("variables", location)) if cache is not None else None
+        if catalog is None:
+            catalog = VariableCatalog(await self._fetch_mesonet_variables(location))
+            if cache is not None:
+                cache.put(("variables", location), catalog)
+        return {"query": query, "matches": catalog.search(query, limit), "total": len(catalog)}
+
+    async def _fetch_mesonet_variables(self, location: str) -> Any:
+        """Fetch mesonet variable definitions from the API without consulting the cache."""
         params = {"location": location}
             
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/variables",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/mesonet/db/variables",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def get_mesonet_station_monitor(
         self,
         location: str = "hawaii"
     ) -> Dict[str, Any]:
-        """Get mesonet station monitoring data."""
+        """Get mesonet station monitoring data.
+
+        With a monitor cache, a snapshot younger than its TTL is reused.
+        """
+        cache = self.monitor_cache
+        if cache is None:
+            return await self._fetch_station_monitor(location)
+        if not cache.is_fresh(location):
+            snapshot = await self._fetch_station_monitor(location)
+            try:
+                cache.refresh(location, snapshot)
+            except ValueError:
+                return snapshot
+        return cache.feed(location).snapshot
+
+    async def get_station_monitor_changes(
+        self,
+        since: Optional[str] = None,
+        location: str = "hawaii"
+    ) -> Dict[str, Any]:
+        """Get the stations whose monitor record changed after version ``since``.
+
+        Without ``since`` (or with a token this process no longer knows) every
+        station is returned. Pass the returned ``version`` on the next call.
+        """
+        cache = self.monitor_cache
+        if cache is None:
+            feed = MonitorFeed()
+            feed.update(await self._fetch_station_monitor(location))
+            return feed.changes(None)
+        if not cache.is_fresh(location):
+            cache.refresh(location, await self._fetch_station_monitor(location))
+        return cache.feed(location).changes(since)
+
+    async def _fetch_station_monitor(self, location: str) -> Any:
+        """Fetch the station monitor snapshot from the API without consulting the cache."""
         params = {"location": location}
             
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/stationMonitor",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/mesonet/db/stationMonitor",
+            params=params,
+            headers=self.headers,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
     
     async def email_mesonet_measurements(
         self,
@@ -464,12 +1033,12 @@ class HCDPClient:
         if intervals:
             payload["intervals"] = intervals
             
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/mesonet/db/measurements/email",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
\ No newline at end of file
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/mesonet/db/measurements/email",
+            json=payload,
+            headers=self.headers,
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return loads(response.content)
\ No newline at end of file
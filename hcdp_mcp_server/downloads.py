@@ -0,0 +1,211 @@
+"""Parallel, resumable downloads of split data packages."""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from .file_cache import FileCache
+
+CHUNK_SIZE = 1 << 20
+
+
+class DownloadError(Exception):
+    """A download finished with the wrong size or kept failing."""
+
+
+def split_urls(result: Any) -> List[str]:
+    """Extract the part URLs from a ``/genzip/instant/splitlink`` response."""
+    if isinstance(result, list) and all(isinstance(u, str) for u in result):
+        return result
+    if isinstance(result, dict):
+        for key in ("urls", "links", "files", "data"):
+            if key in result:
+                return split_urls(result[key])
+    raise ValueError("Unrecognized splitlink response; expected a list of part URLs")
+
+
+def _total_size(response: httpx.Response, offset: int) -> Optional[int]:
+    """Full size of the resource, from Content-Range or Content-Length."""
+    content_range = response.headers.get("content-range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("content-length")
+    return int(length) + offset if length is not None else None
+
+
+async def download_file(
+    http: httpx.AsyncClient,
+    url: str,
+    dest: Path,
+    headers: Optional[Dict[str, str]] = None,
+    retries: int = 3,
+    timeout: float = 120.0
+) -> int:
+    """Stream ``url`` into ``dest``, resuming any partial file with a Range request.
+
+    Returns the final size in bytes. Transport errors, 5xx responses and size
+    mismatches are retried with backoff, each retry resuming where the last
+    attempt stopped.
+    """
+    dest = Path(dest)
+    for attempt in range(retries + 1):
+        offset = dest.stat().st_size if dest.exists() else 0
+        request_headers = dict(headers or {})
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+        try:
+            async with http.stream("GET", url, headers=request_headers, timeout=timeout) as response:
+                if response.status_code == 416 and offset:
+                    total = _total_size(response, 0)
+                    if total in (None, offset):
+                        return offset
+                    dest.unlink()
+                    raise DownloadError(f"{url}: local part larger than remote ({offset} > {total})")
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    offset = 0
+                expected = _total_size(response, offset)
+                with open(dest, "ab" if offset else "wb") as f:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        f.write(chunk)
+            size = dest.stat().st_size
+            if expected is not None and size != expected:
+                raise DownloadError(f"{url}: expected {expected} bytes, got {size}")
+            return size
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code < 500 or attempt == retries:
+                raise
+        except (httpx.TransportError, DownloadError):
+            if attempt == retries:
+                raise
+        await asyncio.sleep(min(2 ** attempt, 30) * 0.5)
+    raise DownloadError(f"{url}: giving up after {retries} retries")
+
+
+async def download_split_package(
+    http: httpx.AsyncClient,
+    urls: List[str],
+    dest: Path,
+    concurrency: int = 4,
+    headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """Download all parts concurrently, then concatenate them into ``dest``.
+
+    Parts are kept in ``<dest>.parts/`` until the archive is assembled, so an
+    interrupted download resumes when called again with the same URLs.
+    """
+    dest = Path(dest)
+    parts_dir = dest.with_name(dest.name + ".parts")
+    manifest = parts_dir / "manifest.json"
+    if parts_dir.exists() and (not manifest.exists() or json.loads(manifest.read_text()) != urls):
+        shutil.rmtree(parts_dir)
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps(urls))
+
+    start = time.perf_counter()
+    slots = asyncio.Semaphore(concurrency)
+    parts = [parts_dir / f"part-{i:05d}" for i in range(len(urls))]
+
+    async def fetch(url: str, part: Path) -> int:
+        async with slots:
+            return await download_file(http, url, part, headers=headers)
+
+    sizes = await asyncio.gather(*(fetch(url, part) for url, part in zip(urls, parts)))
+
+    tmp = dest.with_name(dest.name + ".tmp")
+    with open(tmp, "wb") as out:
+        for part in parts:
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, out, CHUNK_SIZE)
+    os.replace(tmp, dest)
+    shutil.rmtree(parts_dir)
+
+    seconds = time.perf_counter() - start
+    total = sum(sizes)
+    return {
+        "path": str(dest),
+        "bytes": total,
+        "parts": len(urls),
+        "seconds": round(seconds, 3),
+        "mb_per_second": round(total / 1e6 / seconds, 2) if seconds else None,
+    }
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def retrieve_files(
+    http: httpx.AsyncClient,
+    file_paths: List[str],
+    cache: FileCache,
+    url_for: Callable[[str], str],
+    concurrency: int = 8,
+    headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """Fetch many files into ``cache``, skipping duplicates and cached files.
+
+    Missing files are streamed to disk concurrently, resumed and size-checked
+    by ``download_file``, and hashed before being moved into the cache. A
+    failed file is reported without stopping the others.
+    """
+    start = time.perf_counter()
+    unique = list(dict.fromkeys(file_paths))
+    missing = [f for f in unique if f not in cache]
+    incoming = cache.root / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def fetch(file_path: str) -> Dict[str, Any]:
+        part = incoming / (cache.path_for(file_path).name + ".tmp")
+        async with slots:
+            size = await download_file(http, url_for(file_path), part, headers=headers)
+        if size == 0:
+            part.unlink()
+            raise DownloadError(f"{file_path}: empty response")
+        sha256 = await asyncio.to_thread(_sha256, part)
+        local = cache.put_file(file_path, part)
+        return {"file_path": file_path, "local_path": str(local), "bytes": size,
+                "sha256": sha256, "cached": False}
+
+    outcomes = await asyncio.gather(*(fetch(f) for f in missing), return_exceptions=True)
+    fetched = dict(zip(missing, outcomes))
+
+    files, failed = [], []
+    for file_path in unique:
+        outcome = fetched.get(file_path)
+        if isinstance(outcome, BaseException):
+            failed.append({"file_path": file_path, "error": str(outcome)})
+        elif outcome is not None:
+            files.append(outcome)
+        elif (local := cache.get(file_path)) is not None:
+            files.append({"file_path": file_path, "local_path": str(local),
+                          "bytes": local.stat().st_size, "cached": True})
+        else:
+            failed.append({"file_path": file_path, "error": "Evicted from the cache; retry or raise HCDP_FILE_CACHE_MB"})
+
+    seconds = time.perf_counter() - start
+    new = [f for f in files if not f["cached"]]
+    downloaded = sum(f["bytes"] for f in new)
+    return {
+        "files": files,
+        "failed": failed,
+        "requested": len(file_paths),
+        "duplicates": len(file_paths) - len(unique),
+        "from_cache": len(files) - len(new),
+        "fetched": len(new),
+        "bytes_fetched": downloaded,
+        "seconds": round(seconds, 3),
+        "mb_per_second": round(downloaded / 1e6 / seconds, 2) if seconds else None,
+    }
@@ -0,0 +1,118 @@
+"""On-disk cache of retrieved production files."""
+
+import hashlib
+import os
+import posixpath
+import shutil
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class FileCache:
+    """Cache of production files keyed by their remote path.
+
+    Files are stored under ``root`` by a hash of the remote path, keeping the
+    original extension. When ``max_bytes`` is set the least recently used
+    files are evicted to stay under it, except those pinned by ``pinned``.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._index: Optional[Dict[Path, Tuple[int, float]]] = None
+        self._pins: Counter = Counter()
+
+    def path_for(self, file_path: str) -> Path:
+        """Local path a remote file is (or would be) stored at."""
+        digest = hashlib.sha1(file_path.encode()).hexdigest()
+        ext = posixpath.splitext(file_path)[1]
+        return self.root / digest[:2] / (digest + ext)
+
+    def __contains__(self, file_path: str) -> bool:
+        return self.path_for(file_path).exists()
+
+    def get(self, file_path: str) -> Optional[Path]:
+        """Return the local copy of ``file_path`` if cached, marking it recently used."""
+        path = self.path_for(file_path)
+        if not path.exists():
+            return None
+        os.utime(path)
+        if self._index is not None and path in self._index:
+            self._index[path] = (self._index[path][0], path.stat().st_mtime)
+        return path
+
+    def put(self, file_path: str, data: bytes) -> Path:
+        """Store ``data`` as the local copy of ``file_path``."""
+        path = self.path_for(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        return self._commit(tmp, path)
+
+    def put_stream(self, file_path: str, src: BinaryIO) -> Path:
+        """Store the contents of a readable file object without loading it whole."""
+        path = self.path_for(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        return self._commit(tmp, path)
+
+    def put_file(self, file_path: str, src: Path) -> Path:
+        """Move a downloaded file at ``src`` into the cache as ``file_path``."""
+        path = self.path_for(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return self._commit(Path(src), path)
+
+    def _commit(self, tmp: Path, path: Path) -> Path:
+        os.replace(tmp, path)
+        stat = path.stat()
+        self._load_index()[path] = (stat.st_size, stat.st_mtime)
+        self._evict(keep=path)
+        return path
+
+    @contextmanager
+    def pinned(self, file_paths: Iterable[str]) -> Iterator[None]:
+        """Keep ``file_paths`` from being evicted inside the block.
+
+        The cache may exceed ``max_bytes`` meanwhile; it is trimmed on exit.
+        """
+        paths = {self.path_for(f) for f in file_paths}
+        self._pins.update(paths)
+        try:
+            yield
+        finally:
+            self._pins.subtract(paths)
+            self._pins += Counter()
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        """Total bytes held."""
+        return sum(size for size, _ in self._load_index().values())
+
+    def _load_index(self) -> Dict[Path, Tuple[int, float]]:
+        if self._index is None:
+            self._index = {}
+            if self.root.exists():
+                for path in self.root.glob("*/*"):
+                    if path.is_file() and not path.name.endswith(".tmp"):
+                        stat = path.stat()
+                        self._index[path] = (stat.st_size, stat.st_mtime)
+        return self._index
+
+    def _evict(self, keep: Optional[Path] = None) -> None:
+        if self.max_bytes is None:
+            return
+        index = self._load_index()
+        total = sum(size for size, _ in index.values())
+        for path, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if path == keep or path in self._pins:
+                continue
+            path.unlink(missing_ok=True)
+            del index[path]
+            total -= size
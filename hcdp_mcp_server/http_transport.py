@@ -0,0 +1,49 @@
+"""Streamable HTTP transport serving many MCP sessions from one process.
+
+Every session shares the server module's caches, result store and tool
+concurrency limit, and the client's connection pool and rate limiter.
+"""
+
+import contextlib
+from typing import AsyncIterator
+
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.types import Receive, Scope, Send
+
+from .client import aclose_http_client
+from .server import app, save_caches
+
+
+def build_http_app(json_response: bool = False, stateless: bool = False) -> Starlette:
+    """Build an ASGI app exposing the MCP server at ``/mcp``.
+
+    Responses stream over SSE unless ``json_response`` is set.
+    """
+    session_manager = StreamableHTTPSessionManager(
+        app=app,
+        json_response=json_response,
+        stateless=stateless,
+    )
+
+    async def handle_mcp(scope: Scope, receive: Receive, send: Send) -> None:
+        await session_manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_: Starlette) -> AsyncIterator[None]:
+        async with session_manager.run():
+            try:
+                yield
+            finally:
+                save_caches()
+                await aclose_http_client()
+
+    return Starlette(routes=[Mount("/mcp", app=handle_mcp)], lifespan=lifespan)
+
+
+def run_http(host: str, port: int, json_response: bool = False) -> None:
+    """Serve the MCP server over streamable HTTP until interrupted."""
+    import uvicorn
+
+    uvicorn.run(build_http_app(json_response=json_response), host=host, port=port)
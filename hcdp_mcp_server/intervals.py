@@ -0,0 +1,36 @@
+"""Half-open interval arithmetic shared by the local caches."""
+
+from typing import Any, Iterable, List, Tuple
+
+Interval = Tuple[Any, Any]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort half-open intervals and coalesce the ones that overlap or touch."""
+    merged: List[Interval] = []
+    for start, end in sorted(i for i in intervals if i[0] < i[1]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(start: Any, end: Any, covered: Iterable[Interval]) -> List[Interval]:
+    """Return the parts of ``[start, end)`` not covered by ``covered``."""
+    missing: List[Interval] = []
+    cursor = start
+    for c_start, c_end in merge_intervals(covered):
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            missing.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
@@ -0,0 +1,178 @@
+"""Background jobs for long-running tool calls.
+
+Jobs run on a bounded pool of workers and their records are persisted to a
+JSON file, so a restarted server can still report on jobs it accepted before.
+Several server processes may share the file: each record carries the pid of
+the process running it, saves merge under a file lock, and a queued or
+running job is only reported as ``interrupted`` once its process is gone.
+"""
+
+import asyncio
+import json
+import os
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves still merge, without locking
+    fcntl = None
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+INTERRUPTED = "interrupted"
+FINISHED = (SUCCEEDED, FAILED, INTERRUPTED)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _alive(pid: Optional[int]) -> bool:
+    """Whether another process with ``pid`` is running."""
+    if not pid or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobManager:
+    """Runs submitted coroutines in the background and tracks their state."""
+
+    def __init__(self, state_path: Path, workers: int = 4, max_jobs: int = 500):
+        self.state_path = Path(state_path)
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._load()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path.with_suffix(".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self) -> None:
+        if not self.state_path.exists():
+            return
+        with self._locked():
+            self._jobs = self._read()
+            interrupted = False
+            for job in self._jobs.values():
+                if job["status"] not in FINISHED and not _alive(job.get("pid")):
+                    job.update(status=INTERRUPTED, finished_at=_now(),
+                               error="Server restarted before the job finished; submit it again")
+                    interrupted = True
+            if interrupted:
+                self._write(self._jobs)
+
+    def _merge(self) -> Dict[str, Dict[str, Any]]:
+        """Records on disk, with this process's own jobs taken from memory."""
+        jobs = self._read()
+        jobs.update({k: job for k, job in self._jobs.items() if job.get("pid") == os.getpid()})
+        return jobs
+
+    def _refresh(self) -> None:
+        """Pick up other processes' updates to their jobs."""
+        with self._locked():
+            self._jobs = self._merge()
+
+    def _save(self) -> None:
+        with self._locked():
+            jobs = self._merge()
+            finished = [k for k, job in jobs.items() if job["status"] in FINISHED]
+            for job_id in finished[:max(0, len(jobs) - self.max_jobs)]:
+                del jobs[job_id]
+            self._write(jobs)
+            self._jobs = jobs
+
+    def _write(self, jobs: Dict[str, Dict[str, Any]]) -> None:
+        tmp = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(jobs, default=str))
+        os.replace(tmp, self.state_path)
+
+    def submit(self, tool: str, arguments: Dict[str, Any],
+               run: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        """Queue ``run`` as a job for ``tool`` and return its status record."""
+        job_id = secrets.token_hex(8)
+        self._jobs[job_id] = {
+            "job_id": job_id,
+            "tool": tool,
+            "pid": os.getpid(),
+            "arguments": arguments,
+            "status": QUEUED,
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "result": None,
+        }
+        self._save()
+        self._tasks[job_id] = asyncio.get_running_loop().create_task(self._run(job_id, run))
+        return self.status(job_id)
+
+    async def _run(self, job_id: str, run: Callable[[], Awaitable[Any]]) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        job = self._jobs[job_id]
+        try:
+            async with self._slots:
+                job.update(status=RUNNING, started_at=_now())
+                self._save()
+                result = await run()
+            job.update(status=SUCCEEDED, result=result)
+        except Exception as e:
+            job.update(status=FAILED, error=str(e))
+        finally:
+            job["finished_at"] = _now()
+            self._save()
+            self._tasks.pop(job_id, None)
+
+    def _get(self, job_id: str) -> Dict[str, Any]:
+        job = self._jobs.get(job_id)
+        if job is None or (job["status"] not in FINISHED and job_id not in self._tasks):
+            self._refresh()
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise ValueError(f"Unknown job: {job_id}") from None
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        """Job record without its result."""
+        return {k: v for k, v in self._get(job_id).items() if k != "result"}
+
+    def result(self, job_id: str) -> Dict[str, Any]:
+        """Job record including its result once finished."""
+        return dict(self._get(job_id))
+
+    async def wait(self, job_id: str) -> Dict[str, Any]:
+        """Wait for a job to finish and return its full record."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.result(job_id)
+
+    @property
+    def active(self) -> Set[str]:
+        """Ids of jobs that are queued or running."""
+        return set(self._tasks)
@@ -0,0 +1,226 @@
+"""Columnar mesonet measurements.
+
+API rows are long format: one dict per station, variable and timestamp, with
+``value`` as a string. ``MesonetFrame`` holds them as NumPy columns (times,
+station and variable codes, float values, flags) so reshaping works on whole
+arrays instead of per-row dicts.
+"""
+
+import fnmatch
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .timeseries import _format_times, _parse_times, bucket_starts, reduce_segments
+
+PIVOTS = ("variable", "station")
+FREQUENCIES = {"hour": "h", "day": "D", "week": "W", "month": "M", "year": "Y"}
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def parse_values(values: Sequence[Any]) -> np.ndarray:
+    """Parse ``value`` fields in one pass; missing or unparsable values become NaN."""
+    try:
+        return np.asarray(values, dtype=str).astype(np.float64)
+    except ValueError:
+        return np.fromiter(map(_to_float, values), dtype=np.float64, count=len(values))
+
+
+def bucket_unit(freq: str) -> str:
+    """NumPy datetime unit for a resampling frequency (``hour``, ``day``, ... or e.g. ``15m``)."""
+    unit = FREQUENCIES.get(freq, freq)
+    try:
+        np.dtype(f"datetime64[{unit}]")
+    except TypeError:
+        raise ValueError(
+            f"Unknown frequency: {freq}; use {', '.join(FREQUENCIES)} or a NumPy unit such as 15m"
+        ) from None
+    return unit
+
+
+def _nullable(array: np.ndarray) -> List[Any]:
+    """Nested lists with NaN as None, for JSON output."""
+    out = array.astype(object)
+    out[np.isnan(array)] = None
+    return out.tolist()
+
+
+class MesonetFrame:
+    """Mesonet measurements as parallel arrays, one element per API row.
+
+    ``stations`` and ``variables`` are integer codes into the sorted
+    ``station_ids`` and ``variable_ids``. Missing flags are -1. Resampled
+    frames also carry ``counts``, the values aggregated into each bucket, and
+    their ``flags`` are the number of flagged measurements in the bucket.
+    """
+
+    __slots__ = ("times", "stations", "variables", "values", "flags", "station_ids", "variable_ids", "units",
+                 "counts")
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        stations: np.ndarray,
+        variables: np.ndarray,
+        values: np.ndarray,
+        flags: np.ndarray,
+        station_ids: Sequence[str],
+        variable_ids: Sequence[str],
+        units: Optional[Dict[str, str]] = None,
+        counts: Optional[np.ndarray] = None
+    ):
+        self.times = times
+        self.stations = stations
+        self.variables = variables
+        self.values = values
+        self.flags = flags
+        self.station_ids = list(station_ids)
+        self.variable_ids = list(variable_ids)
+        self.units = units or {}
+        self.counts = counts
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "MesonetFrame":
+        """Build a frame from ``/mesonet/db/measurements`` rows."""
+        station_ids, stations = np.unique(np.array([str(r["station_id"]) for r in rows], dtype=str),
+                                          return_inverse=True)
+        variable_ids, variables = np.unique(np.array([r["variable"] for r in rows], dtype=str),
+                                            return_inverse=True)
+        flags = np.fromiter((-1 if r.get("flag") is None else r["flag"] for r in rows),
+                            dtype=np.int64, count=len(rows))
+        units = {r["variable"]: r["units"] for r in rows if r.get("units") is not None}
+        return cls(
+            _parse_times([r["timestamp"] for r in rows]),
+            stations,
+            variables,
+            parse_values([r.get("value") for r in rows]),
+            flags,
+            station_ids.tolist(),
+            variable_ids.tolist(),
+            units
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def mask(
+        self,
+        flags: Optional[Sequence[int]] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        var_pattern: Optional[str] = None
+    ) -> np.ndarray:
+        """Boolean row mask for the given QC flags, value range and variable glob.
+
+        Rows without a numeric value fail any range test.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if flags is not None:
+            keep &= np.isin(self.flags, list(flags))
+        if min_value is not None:
+            keep &= self.values >= min_value
+        if max_value is not None:
+            keep &= self.values <= max_value
+        if var_pattern is not None:
+            codes = [i for i, v in enumerate(self.variable_ids) if fnmatch.fnmatchcase(v, var_pattern)]
+            keep &= np.isin(self.variables, codes)
+        return keep
+
+    def select(self, keep: np.ndarray) -> "MesonetFrame":
+        """Rows where ``keep`` is true (a mask or index array)."""
+        return MesonetFrame(
+            self.times[keep],
+            self.stations[keep],
+            self.variables[keep],
+            self.values[keep],
+            self.flags[keep],
+            self.station_ids,
+            self.variable_ids,
+            self.units,
+            None if self.counts is None else self.counts[keep]
+        )
+
+    def resample(self, freq: str, how: str = "mean", include_flagged: bool = False) -> "MesonetFrame":
+        """Aggregate each station's variables into calendar buckets (UTC, weeks from Monday).
+
+        Values with a QC flag above 0 are left out unless ``include_flagged``;
+        buckets with no usable value are NaN.
+        """
+        buckets = bucket_starts(self.times, bucket_unit(freq))
+        if not len(self):
+            return MesonetFrame(self.times, self.stations, self.variables, self.values, self.flags,
+                                self.station_ids, self.variable_ids, self.units, np.zeros(0, dtype=np.int64))
+        order = np.lexsort((self.times, buckets, self.variables, self.stations))
+        b, st, va = buckets[order], self.stations[order], self.variables[order]
+        starts = np.flatnonzero(np.r_[True, (b[1:] != b[:-1]) | (st[1:] != st[:-1]) | (va[1:] != va[:-1])])
+        flagged = self.flags[order] > 0
+        values = self.values[order] if include_flagged else np.where(flagged, np.nan, self.values[order])
+        out, counts = reduce_segments(values, starts, how)
+        return MesonetFrame(
+            b[starts],
+            st[starts],
+            va[starts],
+            out,
+            np.add.reduceat(flagged.astype(np.int64), starts),
+            self.station_ids,
+            self.variable_ids,
+            self.units,
+            counts
+        )
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Long-format rows; resampled frames report ``count`` and ``flagged``."""
+        columns = [
+            _format_times(self.times),
+            [self.station_ids[c] for c in self.stations.tolist()],
+            [self.variable_ids[c] for c in self.variables.tolist()],
+            _nullable(self.values),
+            self.flags.tolist(),
+        ]
+        if self.counts is None:
+            keys = ("timestamp", "station_id", "variable", "value", "flag")
+        else:
+            keys = ("timestamp", "station_id", "variable", "value", "flagged", "count")
+            columns.append(self.counts.tolist())
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+    def pivot(self, by: str = "variable") -> Dict[str, Any]:
+        """Reshape into wide matrices over a shared time axis.
+
+        ``by="variable"`` gives a station x time matrix per variable;
+        ``by="station"`` a time x variable matrix per station. Combinations with
+        no measurement are None; a repeated measurement keeps the last value.
+        """
+        if by not in PIVOTS:
+            raise ValueError(f"Unknown pivot: {by}; expected one of {', '.join(PIVOTS)}")
+        times, time_idx = np.unique(self.times, return_inverse=True)
+        if by == "variable":
+            group_codes, member_codes, group_ids, member_ids = (
+                self.variables, self.stations, self.variable_ids, self.station_ids
+            )
+        else:
+            group_codes, member_codes, group_ids, member_ids = (
+                self.stations, self.variables, self.station_ids, self.variable_ids
+            )
+
+        order = np.argsort(group_codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(group_codes[order])) + 1
+        groups: Dict[str, Any] = {}
+        for rows in np.split(order, bounds) if len(order) else []:
+            present, members = np.unique(member_codes[rows], return_inverse=True)
+            matrix = np.full((len(present), len(times)), np.nan)
+            matrix[members, time_idx[rows]] = self.values[rows]
+            group = group_ids[group_codes[rows[0]]]
+            if by == "variable":
+                groups[group] = {"stations": [member_ids[c] for c in present], "values": _nullable(matrix)}
+                if group in self.units:
+                    groups[group]["units"] = self.units[group]
+            else:
+                groups[group] = {"variables": [member_ids[c] for c in present], "values": _nullable(matrix.T)}
+        return {"pivot": by, "timestamps": _format_times(times), "data": groups}
@@ -0,0 +1,204 @@
+"""Local SQLite store of mesonet measurements.
+
+Measurements are keyed by (station, variable, timestamp) in a WITHOUT ROWID
+table, so a query for some stations and variables over a time range is an
+index range scan. The store also records which days have been fetched for
+each (station, variable) pair, with ``*`` standing for "all", so only the
+missing days need to be requested from the API.
+"""
+
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .intervals import merge_intervals, subtract_intervals
+
+ONE_DAY = timedelta(days=1)
+ALL = "*"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    station_id TEXT NOT NULL,
+    variable TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    value TEXT,
+    flag INTEGER,
+    PRIMARY KEY (station_id, variable, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stations (
+    station_id TEXT PRIMARY KEY,
+    station_name TEXT,
+    lat NUMERIC,
+    lng NUMERIC,
+    elevation NUMERIC
+);
+CREATE TABLE IF NOT EXISTS variables (
+    variable TEXT PRIMARY KEY,
+    units TEXT,
+    units_plain TEXT,
+    units_expanded TEXT,
+    variable_display_name TEXT
+);
+CREATE TABLE IF NOT EXISTS series (
+    station_id TEXT NOT NULL,
+    variable TEXT NOT NULL,
+    interval_seconds INTEGER,
+    PRIMARY KEY (station_id, variable)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    station_id TEXT NOT NULL,
+    variable TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    PRIMARY KEY (station_id, variable, start)
+) WITHOUT ROWID;
+"""
+
+_STATION_FIELDS = ("station_name", "lat", "lng", "elevation")
+_VARIABLE_FIELDS = ("units", "units_plain", "units_expanded", "variable_display_name")
+
+
+class MesonetStore:
+    """SQLite-backed measurement store with per-day coverage tracking.
+
+    Safe to share between tasks and threads; calls are serialized on one
+    connection.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def insert(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Upsert API measurement rows (with or without joined metadata)."""
+        measurements, stations, variables, series = [], {}, {}, {}
+        for row in rows:
+            station, variable = str(row["station_id"]), row["variable"]
+            measurements.append((station, variable, row["timestamp"], row.get("value"), row.get("flag")))
+            if "station_name" in row:
+                stations[station] = (station, *(row.get(f) for f in _STATION_FIELDS))
+            if "units" in row:
+                variables[variable] = (variable, *(row.get(f) for f in _VARIABLE_FIELDS))
+            if "interval_seconds" in row:
+                series[(station, variable)] = (station, variable, row["interval_seconds"])
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO measurements VALUES (?, ?, ?, ?, ?)", measurements)
+            self._db.executemany("INSERT OR REPLACE INTO stations VALUES (?, ?, ?, ?, ?)", stations.values())
+            self._db.executemany("INSERT OR REPLACE INTO variables VALUES (?, ?, ?, ?, ?)", variables.values())
+            self._db.executemany("INSERT OR REPLACE INTO series VALUES (?, ?, ?)", series.values())
+        return len(measurements)
+
+    def _covered(self, station: str, variable: str) -> List[Tuple[date, date]]:
+        rows = self._db.execute(
+            "SELECT start, end FROM coverage WHERE station_id IN (?, ?) AND variable IN (?, ?)",
+            (station, ALL, variable, ALL)
+        ).fetchall()
+        return [(date.fromisoformat(s), date.fromisoformat(e)) for s, e in rows]
+
+    def missing(
+        self,
+        stations: Optional[Sequence[str]],
+        variables: Optional[Sequence[str]],
+        start: date,
+        end: date
+    ) -> List[Tuple[date, date]]:
+        """Inclusive day ranges within ``[start, end]`` not stored for every requested pair.
+
+        ``None`` for ``stations`` or ``variables`` means all of them.
+        """
+        gaps: List[Tuple[date, date]] = []
+        with self._lock:
+            for station in stations or [ALL]:
+                for variable in variables or [ALL]:
+                    gaps += subtract_intervals(start, end + ONE_DAY, self._covered(station, variable))
+        return [(s, e - ONE_DAY) for s, e in merge_intervals(gaps)]
+
+    def mark(
+        self,
+        stations: Optional[Sequence[str]],
+        variables: Optional[Sequence[str]],
+        start: date,
+        end: date
+    ) -> None:
+        """Record that ``[start, end]`` has been fetched for every requested pair."""
+        with self._lock, self._db:
+            for station in stations or [ALL]:
+                for variable in variables or [ALL]:
+                    existing = self._db.execute(
+                        "SELECT start, end FROM coverage WHERE station_id = ? AND variable = ?",
+                        (station, variable)
+                    ).fetchall()
+                    intervals = [(date.fromisoformat(s), date.fromisoformat(e)) for s, e in existing]
+                    merged = merge_intervals(intervals + [(start, end + ONE_DAY)])
+                    self._db.execute(
+                        "DELETE FROM coverage WHERE station_id = ? AND variable = ?", (station, variable)
+                    )
+                    self._db.executemany(
+                        "INSERT INTO coverage VALUES (?, ?, ?, ?)",
+                        [(station, variable, s.isoformat(), e.isoformat()) for s, e in merged]
+                    )
+
+    def query(
+        self,
+        stations: Optional[Sequence[str]],
+        variables: Optional[Sequence[str]],
+        start: date,
+        end: date,
+        join_metadata: bool = True,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Stored measurements in ``[start, end]``, shaped like API rows."""
+        where = ["m.timestamp >= ?", "m.timestamp < ?"]
+        params: List[Any] = [start.isoformat(), (end + ONE_DAY).isoformat()]
+        if stations:
+            where.append(f"m.station_id IN ({','.join('?' * len(stations))})")
+            params += list(stations)
+        if variables:
+            where.append(f"m.variable IN ({','.join('?' * len(variables))})")
+            params += list(variables)
+        columns = "m.timestamp, m.station_id, m.variable, m.value, m.flag"
+        joins = ""
+        if join_metadata:
+            columns += (", v.units, v.units_plain, v.units_expanded, v.variable_display_name,"
+                        " s.interval_seconds, st.station_name, st.lat, st.lng, st.elevation")
+            joins = (" LEFT JOIN variables v ON v.variable = m.variable"
+                     " LEFT JOIN series s ON s.station_id = m.station_id AND s.variable = m.variable"
+                     " LEFT JOIN stations st ON st.station_id = m.station_id")
+        sql = (f"SELECT {columns} FROM measurements m{joins} WHERE {' AND '.join(where)}"
+               " ORDER BY m.timestamp, m.variable, m.station_id")
+        if limit:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset or 0]
+        elif offset:
+            sql += " LIMIT -1 OFFSET ?"
+            params.append(offset)
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def latest(self, stations: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """Newest stored timestamp per station."""
+        sql = "SELECT station_id, MAX(timestamp) FROM measurements"
+        params: List[Any] = []
+        if stations:
+            sql += f" WHERE station_id IN ({','.join('?' * len(stations))})"
+            params = list(stations)
+        with self._lock:
+            return dict(self._db.execute(sql + " GROUP BY station_id", params).fetchall())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM measurements").fetchone()[0]
@@ -0,0 +1,163 @@
+"""Incremental sync of recent mesonet measurements into the local store.
+
+Each cycle reads the newest stored timestamp per station and requests only
+measurements after it. Stations are sorted by that cursor and batched, so one
+request covers stations that are about equally far behind. Whole days a cycle
+fetched are marked as covered, so date-bounded ``get_mesonet_data`` queries
+over synced days are answered from the store.
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .mesonet_store import MesonetStore
+
+ONE_DAY = timedelta(days=1)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def lag_report(latest: Dict[str, Optional[str]], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Seconds since the newest stored measurement, per station and overall.
+
+    Stations mapped to ``None`` have nothing stored yet.
+    """
+    now = now or datetime.now(timezone.utc)
+    stations: Dict[str, Dict[str, Any]] = {}
+    lags = []
+    for station, timestamp in sorted(latest.items()):
+        if timestamp is None:
+            stations[station] = {"latest": None, "lag_seconds": None}
+            continue
+        lag = round((now - _parse_timestamp(timestamp)).total_seconds())
+        lags.append(lag)
+        stations[station] = {"latest": timestamp, "lag_seconds": lag}
+    return {
+        "stations": stations,
+        "synced": len(lags),
+        "never_synced": len(stations) - len(lags),
+        "max_lag_seconds": max(lags) if lags else None,
+        "median_lag_seconds": round(statistics.median(lags)) if lags else None,
+    }
+
+
+class MesonetSync:
+    """Keeps a mesonet store up to date with the API.
+
+    ``stations`` defaults to every active station. Stations with nothing
+    stored start ``lookback_days`` before today.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: MesonetStore,
+        stations: Optional[Sequence[str]] = None,
+        batch_size: int = 20,
+        interval: float = 300.0,
+        lookback_days: int = 1,
+        page_size: int = 10000
+    ):
+        self.client = client
+        self.store = store
+        self.stations = list(stations) if stations else None
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lookback_days = lookback_days
+        self.page_size = page_size
+
+    async def station_ids(self) -> List[str]:
+        """Stations to sync: the configured list, or every active station."""
+        if self.stations:
+            return self.stations
+        stations = await self.client.get_mesonet_stations()
+        return sorted(str(s["station_id"]) for s in stations if s.get("status", "active") == "active")
+
+    async def sync_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Fetch everything newer than each station's cursor and store it."""
+        started = time.perf_counter()
+        now = now or datetime.now(timezone.utc)
+        today = now.date()
+        stations = await self.station_ids()
+        cursors = await asyncio.to_thread(self.store.latest, stations)
+        fresh_start = (today - timedelta(days=self.lookback_days)).isoformat()
+        starts = {s: cursors.get(s) or fresh_start for s in stations}
+
+        ordered = sorted(stations, key=lambda s: starts[s])
+        batches = [ordered[i:i + self.batch_size] for i in range(0, len(ordered), self.batch_size)]
+        results = await asyncio.gather(
+            *(self._sync_batch(batch, starts, today) for batch in batches), return_exceptions=True
+        )
+        errors = [
+            {"stations": batch, "error": str(result)}
+            for batch, result in zip(batches, results) if isinstance(result, BaseException)
+        ]
+        rows = sum(r for r in results if isinstance(r, int))
+
+        latest = await asyncio.to_thread(self.store.latest, stations)
+        lag = lag_report({s: latest.get(s) for s in stations}, now)
+        return {
+            "at": now.isoformat(),
+            "stations": len(stations),
+            "batches": len(batches),
+            "rows": rows,
+            "errors": errors,
+            "seconds": round(time.perf_counter() - started, 3),
+            "max_lag_seconds": lag["max_lag_seconds"],
+            "median_lag_seconds": lag["median_lag_seconds"],
+            "lag": lag["stations"],
+        }
+
+    async def _sync_batch(self, batch: List[str], starts: Dict[str, str], today: date) -> int:
+        since = min(starts[s] for s in batch)
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            page = await self.client.get_mesonet_data(
+                station_ids=",".join(batch),
+                start_date=since,
+                limit=self.page_size,
+                offset=offset
+            )
+            if not isinstance(page, list):
+                raise ValueError("Unexpected mesonet response; expected a list of measurements")
+            rows += page
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+        await asyncio.to_thread(self.store.insert, rows)
+
+        # Every measurement from a station's cursor onwards is now stored, so the
+        # days after the cursor's own day, up to yesterday, are complete.
+        for station in batch:
+            start = starts[station]
+            first_whole = date.fromisoformat(start[:10]) + (ONE_DAY if len(start) > 10 else timedelta())
+            if first_whole < today:
+                await asyncio.to_thread(self.store.mark, [station], None, first_whole, today - ONE_DAY)
+        return len(rows)
+
+    async def run(
+        self,
+        cycles: Optional[int] = None,
+        on_cycle: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> None:
+        """Sync every ``interval`` seconds, ``cycles`` times or until cancelled."""
+        count = 0
+        while cycles is None or count < cycles:
+            started = time.monotonic()
+            try:
+                report = await self.sync_once()
+            except Exception as e:
+                report = {"error": str(e)}
+            if on_cycle is not None:
+                on_cycle(report)
+            count += 1
+            if cycles is not None and count >= cycles:
+                break
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
@@ -0,0 +1,110 @@
+"""Cached station monitor snapshots and a change feed over them.
+
+Each refresh is diffed against the previous snapshot and the stations that
+changed are logged under a new version. Callers pass back the version token
+they last saw and get only the stations changed since, so work and payload
+scale with the number of changes rather than the number of stations.
+"""
+
+import secrets
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+
+def station_records(snapshot: Any) -> Dict[str, Dict[str, Any]]:
+    """Index a ``/mesonet/db/stationMonitor`` response by station id."""
+    if isinstance(snapshot, dict):
+        for field in ("data", "stations"):
+            if isinstance(snapshot.get(field), (list, dict)):
+                return station_records(snapshot[field])
+        if snapshot and all(isinstance(r, dict) for r in snapshot.values()):
+            return {str(k): v for k, v in snapshot.items()}
+    if isinstance(snapshot, list) and all(isinstance(r, dict) and "station_id" in r for r in snapshot):
+        return {str(r["station_id"]): r for r in snapshot}
+    raise ValueError("Unrecognized station monitor response; expected records per station")
+
+
+class MonitorFeed:
+    """Latest monitor snapshot plus a log of which stations changed per version.
+
+    Tokens embed a per-process epoch, so a token from before a restart (or
+    older than the ``history`` retained versions) gets a full snapshot.
+    """
+
+    def __init__(self, history: int = 1000):
+        self.epoch = secrets.token_hex(4)
+        self.version = 0
+        self.snapshot: Any = None
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._log: Deque[Tuple[int, List[str]]] = deque(maxlen=history)
+        self._floor = 0
+
+    @property
+    def token(self) -> str:
+        return f"{self.epoch}-{self.version}"
+
+    def _base(self, since: Optional[str]) -> Optional[int]:
+        epoch, _, version = (since or "").rpartition("-")
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        base = int(version)
+        return base if self._floor <= base <= self.version else None
+
+    def update(self, snapshot: Any) -> List[str]:
+        """Replace the snapshot and return the stations that changed."""
+        records = station_records(snapshot)
+        changed = [s for s, r in records.items() if self.records.get(s) != r]
+        changed += [s for s in self.records if s not in records]
+        if changed:
+            self.version += 1
+            if len(self._log) == self._log.maxlen:
+                self._floor = self._log[0][0]
+            self._log.append((self.version, changed))
+        self.snapshot = snapshot
+        self.records = records
+        return changed
+
+    def changes(self, since: Optional[str] = None) -> Dict[str, Any]:
+        """Stations changed or removed after the version ``since``."""
+        base = self._base(since)
+        if base is None:
+            return {"version": self.token, "full": True, "changed": self.records, "removed": [],
+                    "unchanged": 0}
+        ids: Set[str] = set()
+        for version, stations in reversed(self._log):
+            if version <= base:
+                break
+            ids.update(stations)
+        changed = {s: self.records[s] for s in sorted(ids) if s in self.records}
+        return {
+            "version": self.token,
+            "full": False,
+            "changed": changed,
+            "removed": sorted(ids - self.records.keys()),
+            "unchanged": len(self.records) - len(changed),
+        }
+
+
+class MonitorCache:
+    """Monitor feeds per location, refreshed from the API after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._feeds: Dict[str, MonitorFeed] = {}
+        self._fetched: Dict[str, float] = {}
+
+    def feed(self, location: str) -> MonitorFeed:
+        if location not in self._feeds:
+            self._feeds[location] = MonitorFeed()
+        return self._feeds[location]
+
+    def is_fresh(self, location: str) -> bool:
+        fetched = self._fetched.get(location)
+        return fetched is not None and time.monotonic() - fetched <= self.ttl
+
+    def refresh(self, location: str, snapshot: Any) -> List[str]:
+        """Diff a fresh snapshot into the feed for ``location``."""
+        changed = self.feed(location).update(snapshot)
+        self._fetched[location] = time.monotonic()
+        return changed
@@ -0,0 +1,73 @@
+"""Parsing of HCDP production file names.
+
+Production files are named ``{datatype}_{production}_{period}_{extent}_{kind}_{YYYY}[_{MM}[_{DD}]].tif``,
+for example ``rainfall_new_month_bi_data_map_2024_10.tif``.
+"""
+
+import posixpath
+import re
+from typing import Dict, NamedTuple, Optional
+
+# Multi-word datatypes must be listed so the first ``_`` is not taken as a separator.
+DATATYPES = (
+    "temp_mean",
+    "temp_min",
+    "temp_max",
+    "relative_humidity",
+    "ndvi_modis",
+    "ignition_probability",
+)
+
+_NAME = re.compile(
+    r"^(?P<stem>.+?)_(?P<year>\d{4})(?:_(?P<month>\d{2}))?(?:_(?P<day>\d{2}))?\.(?P<ext>[A-Za-z0-9]+)$"
+)
+
+
+class ProductionName(NamedTuple):
+    """Fields parsed from a production file name."""
+    name: str
+    datatype: str
+    stem: str
+    date: str
+    ext: str
+
+
+def parse_production_name(path: str) -> Optional[ProductionName]:
+    """Parse a production file path; returns None if it has no trailing date.
+
+    ``date`` is ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD`` depending on how much of
+    it the name carries.
+    """
+    name = posixpath.basename(path)
+    match = _NAME.match(name)
+    if not match:
+        return None
+    stem = match["stem"]
+    datatype = next((d for d in DATATYPES if stem == d or stem.startswith(d + "_")), stem.split("_", 1)[0])
+    date = "-".join(p for p in (match["year"], match["month"], match["day"]) if p)
+    return ProductionName(name, datatype, stem, date, match["ext"].lower())
+
+
+def map_fields(parsed: ProductionName) -> Optional[Dict[str, Optional[str]]]:
+    """Raster query fields of a ``data_map`` file, or None for other products.
+
+    The part of the stem between the datatype and ``data_map`` holds
+    ``[production_]period_extent``.
+    """
+    rest = parsed.stem[len(parsed.datatype) + 1:]
+    if not rest.endswith("_data_map"):
+        return None
+    tokens = rest[:-len("_data_map")].split("_")
+    if len(tokens) == 3:
+        production, period, extent = tokens
+    elif len(tokens) == 2:
+        production, (period, extent) = None, tokens
+    else:
+        return None
+    return {
+        "datatype": parsed.datatype,
+        "production": production,
+        "period": period,
+        "extent": extent,
+        "date": parsed.date,
+    }
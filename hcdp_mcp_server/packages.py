@@ -0,0 +1,111 @@
+"""Local assembly of data packages from cached production files."""
+
+import asyncio
+import os
+import posixpath
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .file_cache import FileCache
+from .naming import parse_production_name
+from .raster_cache import RasterCache
+
+COMPRESSION = {"store": zipfile.ZIP_STORED, "deflate": zipfile.ZIP_DEFLATED}
+
+
+def _arcnames(files: List[str]) -> List[str]:
+    names = [posixpath.basename(f) for f in files]
+    seen: Dict[str, int] = {}
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+    return [name if seen[name] == 1 else f.lstrip("/") for f, name in zip(files, names)]
+
+
+def write_zip(members: List[Tuple[Path, str]], dest: Path, compression: str = "store") -> int:
+    """Write ``(local path, archive name)`` members into ``dest``; returns its size.
+
+    Members are streamed from disk, and the archive only appears at ``dest``
+    once complete.
+    """
+    tmp = dest.with_name(dest.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", compression=COMPRESSION[compression], allowZip64=True) as zf:
+        for path, arcname in members:
+            zf.write(path, arcname)
+    os.replace(tmp, dest)
+    return dest.stat().st_size
+
+
+async def build_package(
+    files: List[str],
+    cache: FileCache,
+    fetch: Callable[[str], Awaitable[bytes]],
+    dest: Path,
+    compression: str = "store",
+    concurrency: int = 4
+) -> Dict[str, Any]:
+    """Zip ``files`` into ``dest``, fetching only those missing from ``cache``.
+
+    The package's files are pinned in the cache until the zip is written, so
+    a package larger than the cache does not evict its own members.
+    """
+    start = time.perf_counter()
+    files = list(dict.fromkeys(files))
+    missing = [f for f in files if f not in cache]
+    slots = asyncio.Semaphore(concurrency)
+
+    async def pull(file_path: str) -> None:
+        async with slots:
+            cache.put(file_path, await fetch(file_path))
+
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with cache.pinned(files):
+        await asyncio.gather(*(pull(f) for f in missing))
+        members = []
+        for f, name in zip(files, _arcnames(files)):
+            path = cache.get(f)
+            if path is None:
+                raise FileNotFoundError(f"{f} is missing from the file cache")
+            members.append((path, name))
+        size = await asyncio.to_thread(write_zip, members, dest, compression)
+    return {
+        "path": str(dest),
+        "bytes": size,
+        "files": len(files),
+        "from_cache": len(files) - len(missing),
+        "fetched": len(missing),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def index_package(path: Path, raster_cache: Optional[RasterCache] = None) -> Dict[str, Any]:
+    """List the members of a package zip, ingesting its maps into ``raster_cache``.
+
+    Members are read one at a time straight from the archive on disk.
+    """
+    members = []
+    ingested = 0
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            parsed = parse_production_name(info.filename)
+            member = {
+                "name": info.filename,
+                "size": info.file_size,
+                "datatype": parsed.datatype if parsed else None,
+                "date": parsed.date if parsed else None,
+            }
+            if raster_cache is not None:
+                with zf.open(info) as src:
+                    member["cached"] = raster_cache.ingest(info.filename, src) is not None
+                ingested += member["cached"]
+            members.append(member)
+    return {
+        "path": str(path),
+        "bytes": Path(path).stat().st_size,
+        "members": members,
+        "ingested": ingested,
+    }
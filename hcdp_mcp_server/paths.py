@@ -0,0 +1,15 @@
+"""Locations of local state (job records, caches, stores)."""
+
+import os
+from pathlib import Path
+
+
+def data_dir(*parts: str) -> Path:
+    """Return (and create) a directory under ``HCDP_DATA_DIR``.
+
+    Defaults to ``~/.cache/hcdp-mcp``.
+    """
+    root = Path(os.getenv("HCDP_DATA_DIR") or Path.home() / ".cache" / "hcdp-mcp")
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,149 @@
+"""Predictive prefetching of raster maps.
+
+Agents tend to walk through maps one step at a time (December, then November,
+then October of the same extent). The prefetcher watches raster queries,
+predicts the next few and fetches them into the raster cache in the
+background, only when the rate limiter has a token to spare.
+"""
+
+import asyncio
+from collections import Counter, OrderedDict, deque
+from datetime import date as Date, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Set
+
+RasterQuery = Dict[str, Any]
+Fetch = Callable[[RasterQuery], Awaitable[Any]]
+
+
+def step_date(value: str, period: Optional[str], steps: int) -> Optional[str]:
+    """Move a ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD`` date by ``steps`` periods.
+
+    The period is taken from ``period`` when it is ``day``, ``month`` or
+    ``year``, otherwise from the precision of ``value``.
+    """
+    width = {"year": 4, "month": 7, "day": 10}.get(period or "", len(value))
+    try:
+        parts = [int(p) for p in value[:width].split("-")]
+        if len(parts) == 1:
+            return f"{parts[0] + steps:04d}"
+        if len(parts) == 2:
+            months = parts[0] * 12 + parts[1] - 1 + steps
+            return f"{months // 12:04d}-{months % 12 + 1:02d}"
+        if len(parts) == 3:
+            return (Date(*parts) + timedelta(days=steps)).isoformat()
+    except ValueError:
+        pass
+    return None
+
+
+def _series(query: RasterQuery) -> tuple:
+    return tuple(sorted((k, v) for k, v in query.items() if k != "date"))
+
+
+class RasterPrefetcher:
+    """Predicts upcoming raster queries and warms the cache for them.
+
+    ``depth`` maps ahead are fetched in the direction the agent is walking (one
+    each way when the direction is not yet known), plus the same date for each
+    of the ``siblings`` extents. At most ``max_pending`` prefetches run at once.
+    """
+
+    def __init__(
+        self,
+        depth: int = 2,
+        siblings: Sequence[str] = (),
+        max_pending: int = 4,
+        history: int = 64,
+        reserve: Optional[Callable[[], bool]] = None
+    ):
+        self.depth = depth
+        self.siblings = list(siblings)
+        self.max_pending = max_pending
+        self.reserve = reserve or (lambda: True)
+        self.stats: Counter = Counter()
+        self._history: Deque[RasterQuery] = deque(maxlen=history)
+        self._pending: Set[str] = set()
+        self._prefetched: "OrderedDict[str, None]" = OrderedDict()
+        self._max_prefetched = history * 8
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def predict(self, query: RasterQuery) -> List[RasterQuery]:
+        """Queries likely to follow ``query``, most likely first."""
+        series = _series(query)
+        previous = next((q for q in reversed(self._history) if _series(q) == series and q["date"] != query["date"]), None)
+        if previous is None:
+            steps = [-1, 1]
+        else:
+            direction = -1 if previous["date"] > query["date"] else 1
+            steps = [direction * i for i in range(1, self.depth + 1)]
+
+        predicted = []
+        for step in steps:
+            moved = step_date(query["date"], query.get("period"), step)
+            if moved is not None:
+                predicted.append({**query, "date": moved})
+        for extent in self.siblings:
+            if extent != query.get("extent"):
+                predicted.append({**query, "extent": extent})
+        return predicted
+
+    def observe(
+        self,
+        query: RasterQuery,
+        key: str,
+        hit: bool,
+        fetch: Fetch,
+        key_of: Callable[[RasterQuery], str],
+        is_cached: Callable[[str], bool]
+    ) -> None:
+        """Record a raster request and schedule prefetches of what comes next."""
+        self.stats["requests"] += 1
+        self.stats["hits" if hit else "misses"] += 1
+        if hit and key in self._prefetched:
+            del self._prefetched[key]
+            self.stats["prefetch_hits"] += 1
+
+        for candidate in self.predict(query):
+            candidate_key = key_of(candidate)
+            if candidate_key in self._pending or is_cached(candidate_key):
+                continue
+            if len(self._pending) >= self.max_pending:
+                self.stats["skipped_busy"] += 1
+                break
+            if not self.reserve():
+                self.stats["skipped_rate_limited"] += 1
+                break
+            self._pending.add(candidate_key)
+            task = asyncio.get_running_loop().create_task(self._run(candidate, candidate_key, fetch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        self._history.append(query)
+
+    async def _run(self, query: RasterQuery, key: str, fetch: Fetch) -> None:
+        try:
+            await fetch(query)
+            self.stats["prefetched"] += 1
+            self._prefetched[key] = None
+            while len(self._prefetched) > self._max_prefetched:
+                self._prefetched.popitem(last=False)
+        except Exception:
+            self.stats["errors"] += 1
+        finally:
+            self._pending.discard(key)
+
+    async def drain(self) -> None:
+        """Wait for scheduled prefetches to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters plus derived hit rate and prefetch accuracy."""
+        stats = dict(self.stats)
+        requests = stats.get("requests", 0)
+        prefetched = stats.get("prefetched", 0)
+        stats["hit_rate"] = round(stats.get("hits", 0) / requests, 3) if requests else None
+        stats["prefetch_accuracy"] = round(stats.get("prefetch_hits", 0) / prefetched, 3) if prefetched else None
+        stats["pending"] = len(self._pending)
+        stats["depth"] = self.depth
+        stats["siblings"] = self.siblings
+        return stats
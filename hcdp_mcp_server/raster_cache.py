@@ -0,0 +1,63 @@
+"""Cache of raster (GeoTIFF) responses keyed by query."""
+
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from .file_cache import FileCache
+from .naming import map_fields, parse_production_name
+
+# Length of the date string that identifies a map of each period.
+PERIOD_DATE_LENGTH = {"year": 4, "month": 7, "day": 10}
+
+
+class RasterCache:
+    """Raster maps stored in a ``FileCache`` under a key derived from the query.
+
+    Maps fetched through ``get_raster_data`` and maps found in downloaded
+    packages land under the same key, so either warms the other.
+    """
+
+    def __init__(self, files: FileCache):
+        self.files = files
+
+    @staticmethod
+    def key(
+        datatype: str,
+        date: str,
+        extent: str,
+        location: str = "hawaii",
+        production: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        timescale: Optional[str] = None,
+        period: Optional[str] = None
+    ) -> str:
+        """Cache key for a raster query; the date is truncated to the period.
+
+        A query without ``period`` gets the API's default-period map, so it
+        keeps its own key rather than sharing one with any explicit period.
+        """
+        date = date[:PERIOD_DATE_LENGTH.get(period or "", len(date))]
+        parts = [location, datatype, production, period, extent, aggregation, timescale]
+        return "raster/" + "/".join(p or "-" for p in parts) + f"/{date}.tif"
+
+    def get(self, key: str) -> Optional[Path]:
+        return self.files.get(key)
+
+    def put(self, key: str, data: bytes) -> Path:
+        return self.files.put(key, data)
+
+    def ingest(self, name: str, src: BinaryIO, location: str = "hawaii") -> Optional[str]:
+        """Store a production ``data_map`` GeoTIFF read from ``src``.
+
+        Returns the cache key, or None if ``name`` is not a map this cache can
+        answer queries for.
+        """
+        parsed = parse_production_name(name)
+        if parsed is None or parsed.ext not in ("tif", "tiff"):
+            return None
+        fields = map_fields(parsed)
+        if fields is None:
+            return None
+        key = self.key(location=location, **fields)
+        self.files.put_stream(key, src)
+        return key
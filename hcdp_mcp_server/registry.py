@@ -0,0 +1,109 @@
+"""Declarative registry of MCP tools.
+
+Each tool is a ``ToolSpec`` naming its arguments model and either an
+``HCDPClient`` coroutine or a custom handler. The registry dispatches calls by
+name, computes the tool schemas once, and runs every call through a chain of
+hooks (concurrency limits, caching, metrics, ...).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Type
+
+from mcp.types import Tool
+from pydantic import BaseModel
+
+Handler = Callable[[BaseModel], Awaitable[Any]]
+PostProcess = Callable[[BaseModel, Any], Any]
+CallNext = Callable[[], Awaitable[Any]]
+Hook = Callable[["ToolSpec", BaseModel, CallNext], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Definition of one tool.
+
+    ``method`` names the client coroutine called with the validated arguments
+    (minus ``exclude``); ``handler`` replaces the client call entirely.
+    ``postprocess`` maps ``(args, result)`` to the value returned to the caller.
+    """
+
+    name: str
+    description: str
+    args_model: Type[BaseModel]
+    method: Optional[str] = None
+    handler: Optional[Handler] = None
+    postprocess: Optional[PostProcess] = None
+    exclude: FrozenSet[str] = field(default_factory=frozenset)
+
+
+class ToolRegistry:
+    """Name -> ToolSpec table with cached schemas and a hook chain."""
+
+    def __init__(self, specs: Iterable[ToolSpec], client_factory: Callable[[], Any]):
+        self.client_factory = client_factory
+        self._specs: Dict[str, ToolSpec] = {}
+        self._hooks: List[Hook] = []
+        self._tools: Optional[List[Tool]] = None
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: ToolSpec) -> None:
+        """Add a tool, replacing any tool with the same name."""
+        if (spec.method is None) == (spec.handler is None):
+            raise ValueError(f"Tool {spec.name} needs exactly one of method or handler")
+        self._specs[spec.name] = spec
+        self._tools = None
+
+    def add_hook(self, hook: Hook) -> None:
+        """Wrap every call in ``hook``; hooks added first run outermost."""
+        self._hooks.append(hook)
+
+    def get(self, name: str) -> ToolSpec:
+        """Look up a tool by name."""
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool: {name}") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def tools(self) -> List[Tool]:
+        """MCP tool listing, built on first use and reused afterwards."""
+        if self._tools is None:
+            schemas: Dict[Type[BaseModel], Dict[str, Any]] = {}
+            self._tools = [
+                Tool(
+                    name=spec.name,
+                    description=spec.description,
+                    inputSchema=schemas.setdefault(spec.args_model, spec.args_model.model_json_schema()),
+                )
+                for spec in self._specs.values()
+            ]
+        return self._tools
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Validate ``arguments`` and run the tool through the hook chain."""
+        spec = self.get(name)
+        args = spec.args_model.model_validate(arguments or {})
+
+        async def invoke() -> Any:
+            if spec.handler is not None:
+                result = await spec.handler(args)
+            else:
+                method = getattr(self.client_factory(), spec.method)
+                result = await method(**args.model_dump(exclude=set(spec.exclude)))
+            if spec.postprocess is not None:
+                result = spec.postprocess(args, result)
+            return result
+
+        call_next: CallNext = invoke
+        for hook in reversed(self._hooks):
+            call_next = self._bind(hook, spec, args, call_next)
+        return await call_next()
+
+    @staticmethod
+    def _bind(hook: Hook, spec: ToolSpec, args: BaseModel, call_next: CallNext) -> CallNext:
+        async def wrapped() -> Any:
+            return await hook(spec, args, call_next)
+        return wrapped
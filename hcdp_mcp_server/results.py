@@ -0,0 +1,189 @@
+"""Server-side storage and paging of oversized tool results."""
+
+import base64
+import bisect
+import itertools
+import os
+import secrets
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .serialization import dumps
+
+DEFAULT_OUTPUT_BUDGET = 100_000
+DEFAULT_STORE_LIMIT = 64_000_000
+
+
+def output_budget(tool_name: str) -> int:
+    """Maximum characters returned by one call of ``tool_name``.
+
+    ``HCDP_OUTPUT_BUDGET_<TOOL_NAME>`` overrides ``HCDP_OUTPUT_BUDGET`` for a
+    single tool.
+    """
+    value = os.getenv(f"HCDP_OUTPUT_BUDGET_{tool_name.upper()}") or os.getenv("HCDP_OUTPUT_BUDGET")
+    return int(value) if value else DEFAULT_OUTPUT_BUDGET
+
+
+def encode_cursor(result_id: str, offset: int) -> str:
+    """Build an opaque cursor pointing at record ``offset`` within a stored result."""
+    return base64.urlsafe_b64encode(f"{result_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        result_id, offset = raw.rsplit(":", 1)
+        return result_id, int(offset)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class Page(NamedTuple):
+    """One chunk of a serialized result and how to fetch the next one."""
+
+    chunk: str
+    continuation: Optional[Dict]
+
+
+def _serialized(node: Any, piece: int) -> Tuple[List[str], str, str, str]:
+    """Records of ``node`` as JSON text, with the brackets and separator that join them.
+
+    Lists split into items, mappings into ``"key":value`` entries and strings
+    into runs of at most ``piece`` characters.
+    """
+    if isinstance(node, dict):
+        return [dumps({key: value})[1:-1].strip() for key, value in node.items()], "{", "}", ","
+    if isinstance(node, list):
+        return [dumps(item) for item in node], "[", "]", ","
+    return [dumps(node[i:i + piece])[1:-1] for i in range(0, len(node), piece)], '"', '"', ""
+
+
+class _Records(NamedTuple):
+    """A result split into serialized records at ``path``.
+
+    Records are the items, entries or string runs of the value at ``path``;
+    each page wraps a run of them in the enclosing mappings, so every page is
+    valid JSON. The first page also carries the other entries of those
+    mappings (``head``); later pages only the keys (``prefix``).
+    """
+
+    items: List[str]
+    sep: str
+    # ends[i] is the length of items[:i + 1], each followed by a separator.
+    ends: List[int]
+    head: str
+    prefix: str
+    suffix: str
+    path: List[str]
+
+    @classmethod
+    def split(cls, result: Any, budget: int) -> "_Records":
+        """Split at the outermost value whose records fit ``budget``.
+
+        While the value is a mapping with a single entry, or with an entry too
+        large for one page, paging descends into its largest list, mapping or
+        string entry.
+        """
+        piece = max(1, min(budget // 4, 1 << 16))
+        node, path, head, prefix, suffix = result, [], "", "", ""
+        items, opening, closing, sep = _serialized(node, piece)
+        while isinstance(node, dict) and items:
+            sizes = [len(item) for item in items]
+            largest = max(range(len(items)), key=sizes.__getitem__)
+            key = list(node)[largest]
+            if not (len(items) == 1 or sizes[largest] > budget) \
+                    or not isinstance(node[key], (dict, list, str)) or not node[key]:
+                break
+            label = dumps({key: None})[1:-1].strip()[:-len("null")]
+            others = "".join(item + "," for i, item in enumerate(items) if i != largest)
+            head, prefix, suffix = head + "{" + others + label, prefix + "{" + label, "}" + suffix
+            node, path = node[key], path + [key]
+            items, opening, closing, sep = _serialized(node, piece)
+        ends = list(itertools.accumulate(len(item) + len(sep) for item in items))
+        return cls(items, sep, ends, head + opening, prefix + opening, closing + suffix, path)
+
+    def chars(self) -> int:
+        return len(self.head) + (self.ends[-1] if self.ends else 0) + len(self.suffix)
+
+    def chunk(self, start: int, end: int) -> str:
+        body = self.sep.join(self.items[start:end])
+        return (self.prefix if start else self.head) + body + self.suffix
+
+    def end(self, start: int, budget: int) -> int:
+        """End of the longest run from ``start`` that fits ``budget``; at least one record."""
+        before = self.ends[start - 1] if start else 0
+        room = budget - len(self.prefix if start else self.head) - len(self.suffix) + len(self.sep)
+        return max(start + 1, bisect.bisect_right(self.ends, before + room))
+
+
+class ResultStore:
+    """LRU of split results, bounded by their total size in characters."""
+
+    def __init__(self, max_chars: int = DEFAULT_STORE_LIMIT):
+        self.max_chars = max_chars
+        self._results: "OrderedDict[str, _Records]" = OrderedDict()
+        self._size = 0
+
+    def put(self, records: _Records) -> str:
+        """Store ``records`` and return their id, evicting the oldest results if needed."""
+        result_id = secrets.token_urlsafe(12)
+        self._results[result_id] = records
+        self._size += records.chars()
+        while self._size > self.max_chars and len(self._results) > 1:
+            _, evicted = self._results.popitem(last=False)
+            self._size -= evicted.chars()
+        return result_id
+
+    def get(self, result_id: str) -> Optional[_Records]:
+        """Return a stored result and mark it as recently used."""
+        records = self._results.get(result_id)
+        if records is not None:
+            self._results.move_to_end(result_id)
+        return records
+
+    def first_page(self, result: Any, budget: int) -> Page:
+        """Serialize ``result``, splitting off the records that fit ``budget``.
+
+        Lists are split between items, mappings between entries and strings
+        into runs, descending through mappings that wrap the bulk of the
+        result in one entry; every page is valid JSON and the rest is stored.
+        Other results are returned whole. Returns the chunk and continuation
+        info (None when nothing remains).
+        """
+        if not isinstance(result, (list, dict, str)) or not result:
+            return Page(dumps(result), None)
+        records = _Records.split(result, budget)
+        if records.chars() - len(records.sep) <= budget:
+            return Page(records.chunk(0, len(records.items)), None)
+        result_id = self.put(records)
+        end = records.end(0, budget)
+        return Page(records.chunk(0, end), self._continuation(result_id, records, end))
+
+    def page(self, cursor: str, budget: int) -> Page:
+        """Return the records at ``cursor`` and the continuation for the next ones."""
+        result_id, offset = decode_cursor(cursor)
+        records = self.get(result_id)
+        if records is None:
+            raise LookupError("Result expired or unknown; re-run the original tool call")
+        if not 0 < offset < len(records.items):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        end = records.end(offset, budget)
+        return Page(records.chunk(offset, end), self._continuation(result_id, records, end))
+
+    @staticmethod
+    def _continuation(result_id: str, records: _Records, offset: int) -> Optional[Dict]:
+        if offset >= len(records.items):
+            return None
+        continuation = {
+            "next_cursor": encode_cursor(result_id, offset),
+            "returned_through": offset,
+            "total_records": len(records.items),
+            "note": "Result truncated; call fetch_result_page with next_cursor for the remaining records",
+        }
+        if records.path:
+            continuation["path"] = records.path
+        return continuation
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -0,0 +1,97 @@
+"""Small in-memory text search over API catalogs.
+
+``TrigramIndex`` ranks documents by the character trigrams they share with a
+query, so partial words and typos still match ("temprature" finds "Air
+temperature"). Postings are built once; a search touches only the documents
+sharing a trigram with the query.
+"""
+
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of ``text``, also splitting CamelCase and snake_case."""
+    return [t for t in _NON_WORD.split(_CAMEL.sub(" ", text).lower()) if t]
+
+
+def trigrams(tokens: Iterable[str]) -> Set[str]:
+    """Trigrams of each token padded with spaces, so short tokens still match."""
+    grams: Set[str] = set()
+    for token in tokens:
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Ranks documents against free-text queries.
+
+    Score is the Dice coefficient of query and document trigrams, plus 2 for an
+    exact key match and 0.5 when every query word appears in the document.
+    """
+
+    def __init__(self, documents: Dict[Hashable, str]):
+        self._tokens: Dict[Hashable, Set[str]] = {}
+        self._sizes: Dict[Hashable, int] = {}
+        self._postings: Dict[str, List[Hashable]] = defaultdict(list)
+        self._keys = {str(key).lower(): key for key in documents}
+        for key, text in documents.items():
+            tokens = tokenize(text)
+            grams = trigrams(tokens)
+            self._tokens[key] = set(tokens)
+            self._sizes[key] = len(grams)
+            for gram in grams:
+                self._postings[gram].append(key)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Best ``limit`` ``(key, score)`` pairs for ``query`` scoring above ``min_score``, highest first."""
+        words = tokenize(query)
+        grams = trigrams(words)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        exact = self._keys.get(query.strip().lower())
+        if exact is not None:
+            shared[exact] += 0
+
+        def score(key: Hashable) -> float:
+            value = 2 * shared[key] / (len(grams) + self._sizes[key]) if grams else 0.0
+            if key == exact:
+                value += 2.0
+            if words and self._tokens[key].issuperset(words):
+                value += 0.5
+            return round(value, 4)
+
+        ranked = sorted(((score(k), k) for k in shared), key=lambda s: (-s[0], str(s[1])))
+        return [(key, value) for value, key in ranked if value > min_score][:limit]
+
+
+class IndexCache:
+    """Built indexes keyed by source query, rebuilt from the API after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 86400.0):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the index for ``key`` if it is fresh."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    def put(self, key: Hashable, index: Any) -> Any:
+        self._entries[key] = (index, time.monotonic())
+        return index
+
+    def clear(self) -> None:
+        self._entries.clear()
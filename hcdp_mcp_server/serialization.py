@@ -0,0 +1,48 @@
+"""JSON encoding and decoding for API responses and tool results.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Output is compact unless pretty printing is requested, either per
+call or with ``HCDP_JSON_PRETTY=true``.
+"""
+
+import json
+import os
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode NumPy values natively and everything else via ``str``."""
+    if hasattr(obj, "tolist") and type(obj).__module__ == "numpy":
+        return obj.tolist()
+    return str(obj)
+
+
+def backend() -> str:
+    """Name of the JSON implementation in use."""
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps(obj: Any, pretty: Optional[bool] = None) -> str:
+    """Serialize ``obj`` to a JSON string."""
+    if pretty is None:
+        pretty = os.getenv("HCDP_JSON_PRETTY", "").lower() in ("1", "true", "yes")
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option).decode()
+    if pretty:
+        return json.dumps(obj, indent=2, default=_default, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), default=_default, ensure_ascii=False)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
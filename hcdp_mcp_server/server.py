@@ -1,8 +1,11 @@
 """HCDP MCP Server - Main server implementation."""
 
+import argparse
 import asyncio
-import json
-from typing import Any, Sequence
+import os
+import re
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Literal, Sequence
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.lowlevel.server import NotificationOptions
@@ -15,7 +18,19 @@ from mcp.types import (
     EmbeddedResource,
 )
 from pydantic import BaseModel, Field
-from .client import HCDPClient
+from .catalog import CatalogCache
+from .client import HCDPClient, aclose_http_client, get_rate_limiter, load_env
+from .file_cache import FileCache
+from .jobs import JobManager
+from .mesonet_store import MesonetStore
+from .monitor import MonitorCache
+from .paths import data_dir
+from .prefetch import RasterPrefetcher
+from .registry import CallNext, Handler, ToolRegistry, ToolSpec
+from .results import Page, ResultStore, output_budget
+from .search_index import IndexCache
+from .serialization import dumps
+from .timeseries_cache import TimeseriesCache, is_series
 
 
 class GetClimateRasterArgs(BaseModel):
@@ -43,6 +58,7 @@ class GetTimeseriesArgs(BaseModel):
     aggregation: str | None = Field(default=None, description="Temporal aggregation (optional)")
     timescale: str | None = Field(default=None, description="Timescale (optional)")
     period: str | None = Field(default=None, description="Period specification (optional)")
+    compact: bool = Field(default=False, description="Return regular series as start + step + values instead of a timestamp mapping")
 
 
 class GetStationDataArgs(BaseModel):
@@ -52,6 +68,20 @@ class GetStationDataArgs(BaseModel):
     offset: int | None = Field(default=None, description="Offset for pagination (optional)")
 
 
+class SearchStationsArgs(BaseModel):
+    """Arguments for searching the local station index."""
+    station_id: str | None = Field(default=None, description="Exact station id (optional)")
+    name: str | None = Field(default=None, description="Words in the station name; partial words match (optional)")
+    island: str | None = Field(default=None, description="Island code or name as stored in station metadata (optional)")
+    min_elevation: float | None = Field(default=None, description="Lowest elevation in meters (optional)")
+    max_elevation: float | None = Field(default=None, description="Highest elevation in meters (optional)")
+    lat: float | None = Field(default=None, description="Latitude to search around, with lng (optional)")
+    lng: float | None = Field(default=None, description="Longitude to search around, with lat (optional)")
+    radius_km: float = Field(default=10.0, gt=0, le=500, description="Search radius around lat/lng in kilometers")
+    limit: int = Field(default=20, ge=1, le=500, description="Stations per page")
+    offset: int = Field(default=0, ge=0, description="Stations to skip")
+
+
 class GetMesonetDataArgs(BaseModel):
     """Arguments for getting mesonet data."""
     station_ids: str | None = Field(default=None, description="Comma-separated station IDs (optional)")
@@ -63,6 +93,25 @@ class GetMesonetDataArgs(BaseModel):
     limit: int | None = Field(default=None, description="Limit number of results (optional)")
     offset: int | None = Field(default=None, description="Offset for pagination (optional)")
     join_metadata: bool = Field(default=True, description="Include metadata in results")
+    pivot: Literal["variable", "station"] | None = Field(
+        default=None,
+        description="Return wide matrices instead of rows: 'variable' for a station x time matrix per variable, "
+                    "'station' for a time x variable matrix per station"
+    )
+    resample: str | None = Field(
+        default=None,
+        description="Aggregate into UTC buckets before returning: hour, day, week (from Monday), month or a NumPy unit such as 15m"
+    )
+    aggregate: Literal["mean", "min", "max", "sum", "last", "count"] = Field(
+        default="mean", description="How resample combines the values in a bucket"
+    )
+    include_flagged: bool = Field(
+        default=False, description="Let resample aggregate values with a nonzero QC flag (excluded by default)"
+    )
+    flags: str | None = Field(default=None, description="Comma-separated QC flag values to keep, e.g. 0 for unflagged rows only")
+    min_value: float | None = Field(default=None, description="Drop rows whose value is below this (or not numeric)")
+    max_value: float | None = Field(default=None, description="Drop rows whose value is above this (or not numeric)")
+    var_pattern: str | None = Field(default=None, description="Keep variables matching this glob, e.g. Tair_*")
 
 
 class GenerateDataPackageEmailArgs(BaseModel):
@@ -90,12 +139,43 @@ class GenerateDataPackageInstantArgs(BaseModel):
     zipName: str | None = Field(default=None, description="Custom zip file name (optional)")
 
 
+class GenerateInstantContentArgs(GenerateDataPackageInstantArgs):
+    """Arguments for generating instant package content."""
+    to_disk: bool = Field(default=False, description="Stream the zip to disk and return an index of its files instead of the raw content")
+    dest_dir: str | None = Field(default=None, description="Subdirectory of the server's package directory to save the archive in when to_disk is set (optional)")
+    ingest: bool = Field(default=True, description="With to_disk, add the package's GeoTIFF maps to the raster cache used by get_climate_raster")
+
+
+class DownloadDataPackageArgs(GenerateDataPackageInstantArgs):
+    """Arguments for downloading a split data package to local disk."""
+    dest_dir: str | None = Field(default=None, description="Subdirectory of the server's package directory to save the archive in (optional)")
+    concurrency: int = Field(default=4, ge=1, le=32, description="Parts downloaded in parallel")
+
+
+class BuildDataPackageArgs(BaseModel):
+    """Arguments for assembling a data package locally from production files."""
+    datatype: str = Field(description="Climate data type")
+    production: str | None = Field(default=None, description="Production level (optional)")
+    period: str | None = Field(default=None, description="Period specification (optional)")
+    extent: str | None = Field(default=None, description="Spatial extent (optional)")
+    start_date: str | None = Field(default=None, description="Start date (optional)")
+    end_date: str | None = Field(default=None, description="End date (optional)")
+    zipName: str | None = Field(default=None, description="Custom zip file name (optional)")
+    dest_dir: str | None = Field(default=None, description="Subdirectory of the server's package directory to save the archive in (optional)")
+    compression: Literal["store", "deflate"] = Field(default="store", description="'store' (fast, GeoTIFFs are already compressed) or 'deflate'")
+    concurrency: int = Field(default=4, ge=1, le=32, description="Files fetched in parallel")
+
+
 class ListProductionFilesArgs(BaseModel):
     """Arguments for listing production files."""
     datatype: str = Field(description="Climate data type")
     production: str | None = Field(default=None, description="Production level (optional)")
     period: str | None = Field(default=None, description="Period specification (optional)")
     extent: str | None = Field(default=None, description="Spatial extent (optional)")
+    start_date: str | None = Field(default=None, description="Only files dated on or after this date, by file name (optional)")
+    end_date: str | None = Field(default=None, description="Only files dated on or before this date; partial dates cover the whole month/year (optional)")
+    pattern: str | None = Field(default=None, description="Shell-style wildcard on the file name, e.g. '*_data_map_2024_*' (optional)")
+    refresh: bool = Field(default=False, description="Re-fetch the listing even if the cached catalog is fresh")
 
 
 class RetrieveProductionFileArgs(BaseModel):
@@ -103,6 +183,19 @@ class RetrieveProductionFileArgs(BaseModel):
     file_path: str = Field(description="Path to the file to retrieve")
 
 
+class RetrieveProductionFilesArgs(BaseModel):
+    """Arguments for retrieving many production files into the local cache."""
+    file_paths: list[str] | None = Field(default=None, description="Paths to retrieve (optional if a datatype query is given)")
+    datatype: str | None = Field(default=None, description="Climate data type to query the catalog for (optional)")
+    production: str | None = Field(default=None, description="Production level (optional)")
+    period: str | None = Field(default=None, description="Period specification (optional)")
+    extent: str | None = Field(default=None, description="Spatial extent (optional)")
+    start_date: str | None = Field(default=None, description="Start date (optional)")
+    end_date: str | None = Field(default=None, description="End date (optional)")
+    pattern: str | None = Field(default=None, description="Shell-style wildcard on the file name (optional)")
+    concurrency: int = Field(default=8, ge=1, le=32, description="Files downloaded in parallel")
+
+
 class GetMesonetStationsArgs(BaseModel):
     """Arguments for getting mesonet station info."""
     location: str = Field(default="hawaii", description="Location")
@@ -113,11 +206,24 @@ class GetMesonetVariablesArgs(BaseModel):
     location: str = Field(default="hawaii", description="Location")
 
 
+class SearchMesonetVariablesArgs(BaseModel):
+    """Arguments for searching mesonet variable definitions."""
+    query: str = Field(description="Words to look for in variable ids, names and units, e.g. 'air temperature'")
+    limit: int = Field(default=10, ge=1, le=100, description="Number of matches to return")
+    location: str = Field(default="hawaii", description="Location")
+
+
 class GetMesonetStationMonitorArgs(BaseModel):
     """Arguments for getting mesonet station monitoring data."""
     location: str = Field(default="hawaii", description="Location")
 
 
+class GetStationMonitorChangesArgs(BaseModel):
+    """Arguments for polling station monitor changes."""
+    since: str | None = Field(default=None, description="Version token from the previous call (omit for a full snapshot)")
+    location: str = Field(default="hawaii", description="Location")
+
+
 class EmailMesonetMeasurementsArgs(BaseModel):
     """Arguments for emailing mesonet measurements."""
     email: str = Field(description="Email address for CSV delivery")
@@ -129,249 +235,520 @@ class EmailMesonetMeasurementsArgs(BaseModel):
     intervals: str | None = Field(default=None, description="Time intervals (optional)")
 
 
+class FetchResultPageArgs(BaseModel):
+    """Arguments for fetching the next page of a truncated result."""
+    cursor: str = Field(description="The next_cursor value returned with a truncated result")
+
+
+class GetJobArgs(BaseModel):
+    """Arguments for looking up a background job."""
+    job_id: str = Field(description="Job id returned when the job was submitted")
+
+
+class GetPrefetchStatsArgs(BaseModel):
+    """Arguments for reading raster prefetch metrics (none)."""
+
+
+class GetMesonetSyncStatusArgs(BaseModel):
+    """Arguments for reading mesonet sync lag."""
+    station_ids: str | None = Field(default=None, description="Comma-separated station IDs (default: every stored station)")
+
+
 app = Server("hcdp-mcp-server")
 
+# Shared across tool calls so overlapping timeseries queries reuse fetched ranges.
+# Persisted to the data directory on shutdown and by the warm command.
+timeseries_cache = TimeseriesCache()
+_caches_loaded = False
+
+# Results larger than a tool's output budget are kept here and paged out by cursor.
+result_store = ResultStore()
+
+# Bounds concurrent tool executions across all sessions served by this process.
+# Defaults to HCDP_MAX_CONCURRENCY; cli_main overrides it from --max-concurrency.
+max_concurrency: int | None = None
+_tool_slots: asyncio.Semaphore | None = None
+
+
+def tool_slots() -> asyncio.Semaphore:
+    """Return the semaphore limiting concurrent tool calls."""
+    global _tool_slots
+    if _tool_slots is None:
+        _tool_slots = asyncio.Semaphore(max_concurrency or int(os.getenv("HCDP_MAX_CONCURRENCY", "32")))
+    return _tool_slots
+
+# Long-running package/email requests run as background jobs recorded on disk.
+_job_manager: JobManager | None = None
+
+
+def job_manager() -> JobManager:
+    """Return the background job manager, loading persisted jobs on first use."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            data_dir() / "jobs.json",
+            workers=int(os.getenv("HCDP_JOB_WORKERS", "4"))
+        )
+    return _job_manager
+
+
+# Retrieved production files, reused by retrieve_production_file and local packages.
+_file_cache: FileCache | None = None
+
+
+def file_cache() -> FileCache:
+    """Return the production file cache (``HCDP_FILE_CACHE_MB``, default 2048)."""
+    global _file_cache
+    if _file_cache is None:
+        _file_cache = FileCache(
+            data_dir("files"),
+            max_bytes=int(float(os.getenv("HCDP_FILE_CACHE_MB", "2048")) * 2**20)
+        )
+    return _file_cache
+
+
+# Production file listings, indexed for date/pattern queries and refreshed by diff.
+_catalog_cache: CatalogCache | None = None
+
+
+def catalog_cache() -> CatalogCache:
+    """Return the production catalog cache (``HCDP_CATALOG_TTL`` seconds, default 3600)."""
+    global _catalog_cache
+    if _catalog_cache is None:
+        _catalog_cache = CatalogCache(ttl=float(os.getenv("HCDP_CATALOG_TTL", "3600")))
+    return _catalog_cache
+
+
+# Optional raster prefetcher. Enabled by HCDP_PREFETCH or --prefetch.
+prefetch_enabled: bool | None = None
+_prefetcher: RasterPrefetcher | None = None
+
+
+def prefetcher() -> RasterPrefetcher | None:
+    """Return the raster prefetcher, or None when prefetching is off.
+
+    ``HCDP_PREFETCH_DEPTH`` sets how many maps ahead to fetch (default 2) and
+    ``HCDP_PREFETCH_SIBLINGS`` a comma-separated list of extents to also fetch
+    for the same date.
+    """
+    global _prefetcher
+    enabled = prefetch_enabled
+    if enabled is None:
+        enabled = os.getenv("HCDP_PREFETCH", "").lower() in ("1", "true", "yes")
+    if not enabled:
+        return None
+    if _prefetcher is None:
+        siblings = os.getenv("HCDP_PREFETCH_SIBLINGS", "")
+        _prefetcher = RasterPrefetcher(
+            depth=int(os.getenv("HCDP_PREFETCH_DEPTH", "2")),
+            siblings=[s.strip() for s in siblings.split(",") if s.strip()],
+            reserve=lambda: get_rate_limiter().try_acquire()
+        )
+    return _prefetcher
+
+
+# Local mesonet measurements, answering date-bounded queries without the API.
+_mesonet_store: MesonetStore | None = None
+
+
+def mesonet_store() -> MesonetStore | None:
+    """Return the mesonet store, or None when ``HCDP_MESONET_STORE`` is off."""
+    global _mesonet_store
+    if os.getenv("HCDP_MESONET_STORE", "true").lower() in ("0", "false", "no"):
+        return None
+    if _mesonet_store is None:
+        _mesonet_store = MesonetStore(data_dir() / "mesonet.sqlite3")
+    return _mesonet_store
+
+
+# Station monitor snapshots, diffed on refresh to serve change feeds.
+_monitor_cache: MonitorCache | None = None
+
+
+def monitor_cache() -> MonitorCache:
+    """Return the station monitor cache (``HCDP_MONITOR_TTL`` seconds, default 60)."""
+    global _monitor_cache
+    if _monitor_cache is None:
+        _monitor_cache = MonitorCache(ttl=float(os.getenv("HCDP_MONITOR_TTL", "60")))
+    return _monitor_cache
+
+
+# Indexed API catalogs (mesonet variables, stations), rebuilt after HCDP_INDEX_TTL seconds.
+_index_cache: IndexCache | None = None
+
+
+def index_cache() -> IndexCache:
+    """Return the search index cache (``HCDP_INDEX_TTL`` seconds, default 86400)."""
+    global _index_cache
+    if _index_cache is None:
+        _index_cache = IndexCache(ttl=float(os.getenv("HCDP_INDEX_TTL", "86400")))
+    return _index_cache
+
+
+def load_caches() -> None:
+    """Load persisted in-memory caches, once per process."""
+    global _caches_loaded
+    if not _caches_loaded:
+        _caches_loaded = True
+        timeseries_cache.load(data_dir() / "timeseries.json")
+
+
+def save_caches() -> None:
+    """Persist in-memory caches so the next process starts warm."""
+    if _caches_loaded:
+        timeseries_cache.save(data_dir() / "timeseries.json")
+
+
+def make_client() -> HCDPClient:
+    """Create an API client wired to the shared caches."""
+    load_caches()
+    return HCDPClient(
+        timeseries_cache=timeseries_cache,
+        file_cache=file_cache(),
+        catalog_cache=catalog_cache(),
+        prefetcher=prefetcher(),
+        mesonet_store=mesonet_store(),
+        monitor_cache=monitor_cache(),
+        index_cache=index_cache()
+    )
+
+
+def compact_timeseries(args: GetTimeseriesArgs, result: Any) -> Any:
+    """Return regular timeseries as start + step + values when requested."""
+    if args.compact and is_series(result):
+        from .timeseries import TimeSeries
+        return TimeSeries.from_mapping(result).to_compact()
+    return result
+
+
+def shape_mesonet(args: GetMesonetDataArgs, result: Any) -> Any:
+    """Filter, resample and/or pivot mesonet rows when requested."""
+    filters = {
+        "flags": [int(f) for f in args.flags.split(",") if f.strip()] if args.flags else None,
+        "min_value": args.min_value,
+        "max_value": args.max_value,
+        "var_pattern": args.var_pattern,
+    }
+    filtering = any(v is not None for v in filters.values())
+    if not (filtering or args.pivot or args.resample) or not isinstance(result, list):
+        return result
+    from .mesonet_frame import MesonetFrame
+    frame = MesonetFrame.from_rows(result)
+    if filtering:
+        keep = frame.mask(**filters).nonzero()[0]
+        if args.pivot is None and args.resample is None:
+            return [result[i] for i in keep.tolist()]
+        frame = frame.select(keep)
+    if args.resample is not None:
+        frame = frame.resample(args.resample, args.aggregate, args.include_flagged)
+    if args.pivot is not None:
+        return frame.pivot(args.pivot)
+    return frame.to_rows()
+
+
+async def fetch_result_page(args: FetchResultPageArgs) -> Page:
+    """Return the page of a stored result that a cursor points at."""
+    return result_store.page(args.cursor, output_budget("fetch_result_page"))
+
+
+def background_job(tool: str, run: str | Callable[[HCDPClient, Any], Awaitable[Any]]) -> Handler:
+    """Handler submitting work as a job and returning its id.
+
+    ``run`` is either a client coroutine name, called with the arguments, or a
+    coroutine function taking ``(client, args)``.
+    """
+    async def handler(args: BaseModel) -> dict:
+        client = make_client()
+        arguments = args.model_dump()
+        if isinstance(run, str):
+            job = job_manager().submit(tool, arguments, lambda: getattr(client, run)(**arguments))
+        else:
+            job = job_manager().submit(tool, arguments, lambda: run(client, args))
+        return {**job, "note": "Running in the background; poll get_job_status and fetch get_job_result"}
+    return handler
+
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def package_root() -> Path:
+    """Directory package archives are written under: ``HCDP_PACKAGE_DIR`` or the data directory."""
+    root = os.getenv("HCDP_PACKAGE_DIR")
+    if not root:
+        return data_dir("packages")
+    Path(root).mkdir(parents=True, exist_ok=True)
+    return Path(root)
+
+
+def package_path(args: GenerateInstantContentArgs | DownloadDataPackageArgs | BuildDataPackageArgs) -> Path:
+    """Local path for a package archive, in ``dest_dir`` under the package root.
+
+    ``zipName`` is reduced to a plain file name and ``dest_dir`` must stay
+    inside the root, so tool arguments cannot write elsewhere.
+    """
+    name = _UNSAFE_NAME.sub("_", (args.zipName or "").replace("\\", "/").rsplit("/", 1)[-1]).lstrip(".")
+    if not name:
+        name = _UNSAFE_NAME.sub("_", f"{args.datatype}_package")
+    if not name.endswith(".zip"):
+        name += ".zip"
+    root = package_root().resolve()
+    dest_dir = (root / args.dest_dir).resolve() if args.dest_dir else root
+    if not dest_dir.is_relative_to(root):
+        raise ValueError("dest_dir must be a directory inside the package directory")
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    return dest_dir / name
+
+
+async def instant_content(args: GenerateInstantContentArgs) -> dict:
+    """Return instant package content, or save and index it with ``to_disk``."""
+    client = make_client()
+    if not args.to_disk:
+        return await client.generate_data_package_instant_content(
+            **args.model_dump(exclude={"to_disk", "dest_dir", "ingest"})
+        )
+    return await client.download_instant_content(
+        dest=str(package_path(args)),
+        **args.model_dump(exclude={"to_disk", "dest_dir"})
+    )
+
+
+async def download_data_package(client: HCDPClient, args: DownloadDataPackageArgs) -> dict:
+    """Generate split links for a package and download the parts to disk."""
+    from .downloads import split_urls
+
+    links = await client.generate_data_package_splitlink(
+        **args.model_dump(exclude={"dest_dir", "concurrency"})
+    )
+    return await client.download_split_package(
+        split_urls(links), str(package_path(args)), concurrency=args.concurrency
+    )
+
+
+async def build_data_package(client: HCDPClient, args: BuildDataPackageArgs) -> dict:
+    """Zip the requested production files locally from the file cache."""
+    return await client.build_data_package(
+        dest=str(package_path(args)),
+        **args.model_dump(exclude={"zipName", "dest_dir"})
+    )
+
+
+async def get_job_status(args: GetJobArgs) -> dict:
+    """Return a background job's state."""
+    return job_manager().status(args.job_id)
+
+
+async def get_job_result(args: GetJobArgs) -> dict:
+    """Return a background job's state and, once finished, its result."""
+    return job_manager().result(args.job_id)
+
+
+async def get_prefetch_stats(args: GetPrefetchStatsArgs) -> dict:
+    """Return raster cache hit rate and prefetch accuracy."""
+    active = prefetcher()
+    if active is None:
+        return {"enabled": False, "note": "Set HCDP_PREFETCH=1 or pass --prefetch to enable"}
+    return {"enabled": True, **active.metrics()}
+
+
+async def get_mesonet_sync_status(args: GetMesonetSyncStatusArgs) -> dict:
+    """Return how far behind the local mesonet store is, per station."""
+    from .mesonet_sync import lag_report
+
+    store = mesonet_store()
+    if store is None:
+        return {"enabled": False, "note": "The mesonet store is off; unset HCDP_MESONET_STORE to enable it"}
+    stations = [s.strip() for s in (args.station_ids or "").split(",") if s.strip()]
+    latest = await asyncio.to_thread(store.latest, stations)
+    if stations:
+        latest = {s: latest.get(s) for s in stations}
+    return {"enabled": True, **lag_report(latest)}
+
+
+async def limit_concurrency(spec: ToolSpec, args: Any, call_next: CallNext) -> Any:
+    """Hook bounding concurrent tool executions across sessions."""
+    async with tool_slots():
+        return await call_next()
+
+
+TOOLS = [
+    ToolSpec(
+        name="get_climate_raster",
+        description="Retrieve climate data maps (GeoTIFF files) for specified variables, dates, and locations from HCDP",
+        args_model=GetClimateRasterArgs,
+        method="get_raster_data",
+    ),
+    ToolSpec(
+        name="get_timeseries_data",
+        description="Get time series climate data for a specific latitude/longitude coordinate",
+        args_model=GetTimeseriesArgs,
+        method="get_timeseries_data",
+        exclude=frozenset({"compact"}),
+        postprocess=compact_timeseries,
+    ),
+    ToolSpec(
+        name="get_station_data",
+        description="Retrieve station-specific climate measurements and metadata",
+        args_model=GetStationDataArgs,
+        method="get_station_data",
+    ),
+    ToolSpec(
+        name="search_stations",
+        description="Find climate stations by id, name, island, elevation band or distance from a point using a locally cached index",
+        args_model=SearchStationsArgs,
+        method="search_stations",
+    ),
+    ToolSpec(
+        name="get_mesonet_data",
+        description="Access real-time weather station (mesonet) measurements",
+        args_model=GetMesonetDataArgs,
+        method="get_mesonet_data",
+        exclude=frozenset({"pivot", "resample", "aggregate", "include_flagged",
+                           "flags", "min_value", "max_value", "var_pattern"}),
+        postprocess=shape_mesonet,
+    ),
+    ToolSpec(
+        name="generate_data_package_email",
+        description="Generate downloadable zip packages of climate data and email them (runs as a background job)",
+        args_model=GenerateDataPackageEmailArgs,
+        handler=background_job("generate_data_package_email", "generate_data_package_email"),
+    ),
+    ToolSpec(
+        name="generate_data_package_instant_link",
+        description="Generate instant download links for climate data packages",
+        args_model=GenerateDataPackageInstantArgs,
+        method="generate_data_package_instant_link",
+    ),
+    ToolSpec(
+        name="generate_data_package_instant_content",
+        description="Generate instant download content for climate data packages; with to_disk, save the zip, index its files and cache its maps for get_climate_raster",
+        args_model=GenerateInstantContentArgs,
+        handler=instant_content,
+    ),
+    ToolSpec(
+        name="generate_data_package_splitlink",
+        description="Generate split download links for large climate data packages (runs as a background job)",
+        args_model=GenerateDataPackageInstantArgs,
+        handler=background_job("generate_data_package_splitlink", "generate_data_package_splitlink"),
+    ),
+    ToolSpec(
+        name="download_data_package_splitlink",
+        description="Download a large climate data package to local disk via parallel, resumable split links (runs as a background job)",
+        args_model=DownloadDataPackageArgs,
+        handler=background_job("download_data_package_splitlink", download_data_package),
+    ),
+    ToolSpec(
+        name="build_data_package_local",
+        description="Assemble a climate data package locally from production files, fetching only files not already cached (runs as a background job)",
+        args_model=BuildDataPackageArgs,
+        handler=background_job("build_data_package_local", build_data_package),
+    ),
+    ToolSpec(
+        name="list_production_files",
+        description="List available production climate data files, optionally filtered by date range or file name pattern",
+        args_model=ListProductionFilesArgs,
+        method="list_production_files",
+    ),
+    ToolSpec(
+        name="retrieve_production_file",
+        description="Retrieve a specific production climate data file",
+        args_model=RetrieveProductionFileArgs,
+        method="retrieve_production_file",
+    ),
+    ToolSpec(
+        name="retrieve_production_files",
+        description="Retrieve many production files (by path or catalog query) into the local cache, downloading only missing files in parallel (runs as a background job)",
+        args_model=RetrieveProductionFilesArgs,
+        handler=background_job("retrieve_production_files", "retrieve_production_files"),
+    ),
+    ToolSpec(
+        name="get_mesonet_stations",
+        description="Get mesonet weather station information and metadata",
+        args_model=GetMesonetStationsArgs,
+        method="get_mesonet_stations",
+    ),
+    ToolSpec(
+        name="get_mesonet_variables",
+        description="Get mesonet variable definitions and metadata",
+        args_model=GetMesonetVariablesArgs,
+        method="get_mesonet_variables",
+    ),
+    ToolSpec(
+        name="search_mesonet_variables",
+        description="Find mesonet variable ids by keyword (e.g. 'rainfall', 'soil temperature') without listing every variable definition",
+        args_model=SearchMesonetVariablesArgs,
+        method="search_mesonet_variables",
+    ),
+    ToolSpec(
+        name="get_mesonet_station_monitor",
+        description="Get mesonet station monitoring and status data",
+        args_model=GetMesonetStationMonitorArgs,
+        method="get_mesonet_station_monitor",
+    ),
+    ToolSpec(
+        name="get_station_monitor_changes",
+        description="Get only the mesonet stations whose monitor status changed since a version token; pass the returned version on the next poll",
+        args_model=GetStationMonitorChangesArgs,
+        method="get_station_monitor_changes",
+    ),
+    ToolSpec(
+        name="email_mesonet_measurements",
+        description="Email mesonet measurement data as CSV files (runs as a background job)",
+        args_model=EmailMesonetMeasurementsArgs,
+        handler=background_job("email_mesonet_measurements", "email_mesonet_measurements"),
+    ),
+    ToolSpec(
+        name="get_prefetch_stats",
+        description="Report raster cache hit rate and prefetch accuracy",
+        args_model=GetPrefetchStatsArgs,
+        handler=get_prefetch_stats,
+    ),
+    ToolSpec(
+        name="get_mesonet_sync_status",
+        description="Report per-station lag of the local mesonet store kept current by the sync command",
+        args_model=GetMesonetSyncStatusArgs,
+        handler=get_mesonet_sync_status,
+    ),
+    ToolSpec(
+        name="fetch_result_page",
+        description="Fetch the next page of a tool result that was truncated to fit the output budget",
+        args_model=FetchResultPageArgs,
+        handler=fetch_result_page,
+    ),
+    ToolSpec(
+        name="get_job_status",
+        description="Check the status of a background job",
+        args_model=GetJobArgs,
+        handler=get_job_status,
+    ),
+    ToolSpec(
+        name="get_job_result",
+        description="Get the result of a finished background job",
+        args_model=GetJobArgs,
+        handler=get_job_result,
+    ),
+]
+
+registry = ToolRegistry(TOOLS, client_factory=make_client)
+registry.add_hook(limit_concurrency)
+
 
 @app.list_tools()
 async def handle_list_tools() -> list[Tool]:
     """List available tools."""
-    return [
-        Tool(
-            name="get_climate_raster",
-            description="Retrieve climate data maps (GeoTIFF files) for specified variables, dates, and locations from HCDP",
-            inputSchema=GetClimateRasterArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_timeseries_data", 
-            description="Get time series climate data for a specific latitude/longitude coordinate",
-            inputSchema=GetTimeseriesArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_station_data",
-            description="Retrieve station-specific climate measurements and metadata",
-            inputSchema=GetStationDataArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_mesonet_data",
-            description="Access real-time weather station (mesonet) measurements",
-            inputSchema=GetMesonetDataArgs.model_json_schema(),
-        ),
-        Tool(
-            name="generate_data_package_email",
-            description="Generate downloadable zip packages of climate data and email them",
-            inputSchema=GenerateDataPackageEmailArgs.model_json_schema(),
-        ),
-        Tool(
-            name="generate_data_package_instant_link",
-            description="Generate instant download links for climate data packages",
-            inputSchema=GenerateDataPackageInstantArgs.model_json_schema(),
-        ),
-        Tool(
-            name="generate_data_package_instant_content",
-            description="Generate instant download content for climate data packages",
-            inputSchema=GenerateDataPackageInstantArgs.model_json_schema(),
-        ),
-        Tool(
-            name="generate_data_package_splitlink",
-            description="Generate split download links for large climate data packages",
-            inputSchema=GenerateDataPackageInstantArgs.model_json_schema(),
-        ),
-        Tool(
-            name="list_production_files",
-            description="List available production climate data files",
-            inputSchema=ListProductionFilesArgs.model_json_schema(),
-        ),
-        Tool(
-            name="retrieve_production_file",
-            description="Retrieve a specific production climate data file",
-            inputSchema=RetrieveProductionFileArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_mesonet_stations",
-            description="Get mesonet weather station information and metadata",
-            inputSchema=GetMesonetStationsArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_mesonet_variables",
-            description="Get mesonet variable definitions and metadata",
-            inputSchema=GetMesonetVariablesArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_mesonet_station_monitor",
-            description="Get mesonet station monitoring and status data",
-            inputSchema=GetMesonetStationMonitorArgs.model_json_schema(),
-        ),
-        Tool(
-            name="email_mesonet_measurements",
-            description="Email mesonet measurement data as CSV files",
-            inputSchema=EmailMesonetMeasurementsArgs.model_json_schema(),
-        ),
-    ]
+    return registry.tools()
 
 
 @app.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
     """Handle tool calls."""
-    client = HCDPClient()
-    
     try:
-        if name == "get_climate_raster":
-            args = GetClimateRasterArgs(**arguments)
-            result = await client.get_raster_data(
-                datatype=args.datatype,
-                date=args.date,
-                extent=args.extent,
-                location=args.location,
-                production=args.production,
-                aggregation=args.aggregation,
-                timescale=args.timescale,
-                period=args.period
-            )
-            
-        elif name == "get_timeseries_data":
-            args = GetTimeseriesArgs(**arguments)
-            result = await client.get_timeseries_data(
-                datatype=args.datatype,
-                start=args.start,
-                end=args.end,
-                extent=args.extent,
-                lat=args.lat,
-                lng=args.lng,
-                location=args.location,
-                production=args.production,
-                aggregation=args.aggregation,
-                timescale=args.timescale,
-                period=args.period
-            )
-            
-        elif name == "get_station_data":
-            args = GetStationDataArgs(**arguments)
-            result = await client.get_station_data(
-                q=args.q,
-                limit=args.limit,
-                offset=args.offset
-            )
-            
-        elif name == "get_mesonet_data":
-            args = GetMesonetDataArgs(**arguments)
-            result = await client.get_mesonet_data(
-                station_ids=args.station_ids,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                var_ids=args.var_ids,
-                location=args.location,
-                intervals=args.intervals,
-                limit=args.limit,
-                offset=args.offset,
-                join_metadata=args.join_metadata
-            )
-            
-        elif name == "generate_data_package_email":
-            args = GenerateDataPackageEmailArgs(**arguments)
-            result = await client.generate_data_package_email(
-                email=args.email,
-                datatype=args.datatype,
-                production=args.production,
-                period=args.period,
-                extent=args.extent,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                files=args.files,
-                zipName=args.zipName
-            )
-            
-        elif name == "generate_data_package_instant_link":
-            args = GenerateDataPackageInstantArgs(**arguments)
-            result = await client.generate_data_package_instant_link(
-                email=args.email,
-                datatype=args.datatype,
-                production=args.production,
-                period=args.period,
-                extent=args.extent,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                zipName=args.zipName
-            )
-            
-        elif name == "generate_data_package_instant_content":
-            args = GenerateDataPackageInstantArgs(**arguments)
-            result = await client.generate_data_package_instant_content(
-                email=args.email,
-                datatype=args.datatype,
-                production=args.production,
-                period=args.period,
-                extent=args.extent,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                zipName=args.zipName
-            )
-            
-        elif name == "generate_data_package_splitlink":
-            args = GenerateDataPackageInstantArgs(**arguments)
-            result = await client.generate_data_package_splitlink(
-                email=args.email,
-                datatype=args.datatype,
-                production=args.production,
-                period=args.period,
-                extent=args.extent,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                zipName=args.zipName
-            )
-            
-        elif name == "list_production_files":
-            args = ListProductionFilesArgs(**arguments)
-            result = await client.list_production_files(
-                datatype=args.datatype,
-                production=args.production,
-                period=args.period,
-                extent=args.extent
-            )
-            
-        elif name == "retrieve_production_file":
-            args = RetrieveProductionFileArgs(**arguments)
-            result = await client.retrieve_production_file(
-                file_path=args.file_path
-            )
-            
-        elif name == "get_mesonet_stations":
-            args = GetMesonetStationsArgs(**arguments)
-            result = await client.get_mesonet_stations(
-                location=args.location
-            )
-            
-        elif name == "get_mesonet_variables":
-            args = GetMesonetVariablesArgs(**arguments)
-            result = await client.get_mesonet_variables(
-                location=args.location
-            )
-            
-        elif name == "get_mesonet_station_monitor":
-            args = GetMesonetStationMonitorArgs(**arguments)
-            result = await client.get_mesonet_station_monitor(
-                location=args.location
-            )
-            
-        elif name == "email_mesonet_measurements":
-            args = EmailMesonetMeasurementsArgs(**arguments)
-            result = await client.email_mesonet_measurements(
-                email=args.email,
-                location=args.location,
-                station_ids=args.station_ids,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                var_ids=args.var_ids,
-                intervals=args.intervals
-            )
-            
+        result = await registry.call(name, arguments)
+        if isinstance(result, Page):
+            page = result
         else:
-            raise ValueError(f"Unknown tool: {name}")
-            
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2, default=str)
-        )]
-        
+            page = result_store.first_page(result, output_budget(name))
+        return paged_content(page)
+
     except Exception as e:
         return [TextContent(
             type="text", 
@@ -379,26 +756,167 @@ async def handle_call_tool(name: str, arguments: dict) -> Sequence[TextContent |
         )]
 
 
+def paged_content(page: Page) -> list[TextContent]:
+    """Build tool output from a result chunk and its continuation info."""
+    content = [TextContent(type="text", text=page.chunk)]
+    if page.continuation is not None:
+        content.append(TextContent(type="text", text=dumps(page.continuation)))
+    return content
+
+
 async def main():
     """Main entry point for the server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="hcdp-mcp-server",
-                server_version="0.1.0",
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={}
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="hcdp-mcp-server",
+                    server_version="0.1.0",
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={}
+                    ),
                 ),
-            ),
+            )
+    finally:
+        save_caches()
+        await aclose_http_client()
+
+
+async def warm(spec_path: str, concurrency: int | None = None, restart: bool = False) -> dict:
+    """Fill the local caches for every dataset in a warm spec."""
+    import sys
+    from .warm import enumerate_tasks, load_spec, run_warm, state_path_for
+
+    spec = load_spec(Path(spec_path))
+    tasks = enumerate_tasks(spec)
+    state_path = state_path_for(spec, data_dir("warm"))
+    if restart:
+        state_path.unlink(missing_ok=True)
+
+    def progress(counts: dict) -> None:
+        print(f"\rwarm: {counts['skipped'] + counts['done']}/{counts['total']} cached, "
+              f"{counts['failed']} failed, {counts['elapsed']}s", end="", file=sys.stderr, flush=True)
+
+    try:
+        summary = await run_warm(
+            tasks,
+            make_client(),
+            state_path,
+            concurrency=concurrency or int(spec.get("concurrency", 8)),
+            checkpoint=save_caches,
+            progress=progress
         )
+    finally:
+        print(file=sys.stderr)
+        await aclose_http_client()
+    return summary
+
+
+async def sync(
+    interval: float,
+    stations: str | None = None,
+    batch_size: int = 20,
+    lookback_days: int = 1,
+    once: bool = False
+) -> dict | None:
+    """Keep the mesonet store current, once or every ``interval`` seconds."""
+    import sys
+    from .mesonet_sync import MesonetSync
+
+    store = mesonet_store()
+    if store is None:
+        raise SystemExit("sync needs the mesonet store; unset HCDP_MESONET_STORE")
+    syncer = MesonetSync(
+        make_client(),
+        store,
+        stations=[s.strip() for s in (stations or "").split(",") if s.strip()],
+        batch_size=batch_size,
+        interval=interval,
+        lookback_days=lookback_days,
+        page_size=int(os.getenv("HCDP_MESONET_PAGE_SIZE", "10000"))
+    )
+    reports: list[dict] = []
+
+    def progress(report: dict) -> None:
+        reports.append(report)
+        if "error" in report:
+            print(f"sync: failed: {report['error']}", file=sys.stderr, flush=True)
+        else:
+            print(f"sync: {report['rows']} rows for {report['stations']} stations in {report['batches']} requests, "
+                  f"{len(report['errors'])} failed, max lag {report['max_lag_seconds']}s, {report['seconds']}s",
+                  file=sys.stderr, flush=True)
+
+    try:
+        await syncer.run(cycles=1 if once else None, on_cycle=progress)
+    finally:
+        await aclose_http_client()
+    return reports[-1] if reports else None
 
 
 def cli_main():
     """Entry point for the CLI script."""
-    asyncio.run(main())
+    global max_concurrency, prefetch_enabled
+    load_env()
+    parser = argparse.ArgumentParser(
+        prog="hcdp-mcp-server",
+        description="Model Context Protocol server for the Hawaii Climate Data Portal"
+    )
+    parser.add_argument("--transport", choices=["stdio", "http"],
+                        default=os.getenv("HCDP_TRANSPORT", "stdio"),
+                        help="stdio for one client per process, http to serve many sessions")
+    parser.add_argument("--host", default=os.getenv("HCDP_HOST", "127.0.0.1"),
+                        help="Bind address for the http transport")
+    parser.add_argument("--port", type=int, default=int(os.getenv("HCDP_PORT", "8000")),
+                        help="Port for the http transport")
+    parser.add_argument("--max-concurrency", type=int,
+                        default=int(os.getenv("HCDP_MAX_CONCURRENCY", "32")),
+                        help="Maximum tool calls executing at once across all sessions")
+    parser.add_argument("--json-response", action="store_true",
+                        help="Answer http requests with JSON bodies instead of SSE streams")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Prefetch rasters adjacent to recent requests when the rate limit allows")
+    commands = parser.add_subparsers(dest="command")
+    warm_parser = commands.add_parser("warm", help="Fill the local caches from a YAML/JSON spec, then exit")
+    warm_parser.add_argument("spec", help="Path to the warm spec (.yaml, .yml or .json)")
+    warm_parser.add_argument("--concurrency", type=int, default=None,
+                             help="Requests in flight at once (default: the spec's concurrency, or 8)")
+    warm_parser.add_argument("--restart", action="store_true",
+                             help="Ignore progress recorded by an earlier run of the same spec")
+    sync_parser = commands.add_parser("sync", help="Keep the local mesonet store current with new measurements")
+    sync_parser.add_argument("--interval", type=float, default=float(os.getenv("HCDP_MESONET_SYNC_INTERVAL", "300")),
+                             help="Seconds between sync cycles (default: 300)")
+    sync_parser.add_argument("--stations", default=None,
+                             help="Comma-separated station IDs (default: every active station)")
+    sync_parser.add_argument("--batch-size", type=int, default=20,
+                             help="Stations per API request (default: 20)")
+    sync_parser.add_argument("--lookback-days", type=int, default=1,
+                             help="Days of history to fetch for stations with nothing stored (default: 1)")
+    sync_parser.add_argument("--once", action="store_true",
+                             help="Run a single cycle, print its report and exit")
+    args = parser.parse_args()
+
+    max_concurrency = args.max_concurrency
+    if args.prefetch:
+        prefetch_enabled = True
+    if args.command == "warm":
+        summary = asyncio.run(warm(args.spec, args.concurrency, args.restart))
+        print(dumps(summary, pretty=True))
+        if summary["failed"]:
+            raise SystemExit(1)
+    elif args.command == "sync":
+        report = asyncio.run(sync(args.interval, args.stations, args.batch_size, args.lookback_days, args.once))
+        if args.once and report is not None:
+            print(dumps(report, pretty=True))
+            if "error" in report or report["errors"]:
+                raise SystemExit(1)
+    elif args.transport == "http":
+        from .http_transport import run_http
+        run_http(args.host, args.port, json_response=args.json_response)
+    else:
+        asyncio.run(main())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,235 @@
+"""Local index of station metadata from ``/stations``.
+
+Every ``hcdp_station_metadata`` document is fetched once, page by page, and
+indexed by id, island, elevation and a lat/lng grid, with trigram search over
+names. Simple ``get_station_data`` queries for that document type (equality
+and ``$in`` on the indexed fields) are then answered and paged locally;
+anything else still goes to the API.
+"""
+
+import bisect
+import json
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .search_index import TrigramIndex
+
+# The top-level ``name`` of a /stations document is its type, not a station name.
+STATION_METADATA = "hcdp_station_metadata"
+METADATA_QUERY = json.dumps({"name": STATION_METADATA})
+GRID_DEGREES = 0.1
+# Name matches scoring lower share only stray trigrams with the query.
+NAME_MIN_SCORE = 0.3
+_EARTH_KM = 6371.0088
+_CONTAINERS = ("result", "stations", "data")
+_FIELDS = {
+    "id": ("skn", "station_id", "id"),
+    "name": ("name", "station_name"),
+    "island": ("island",),
+    "elevation": ("elevation_m", "elevation"),
+    "lat": ("lat", "latitude"),
+    "lng": ("lng", "lon", "longitude"),
+}
+# Query paths over the indexed fields of a metadata document.
+_PATHS = {"value." + key for keys in _FIELDS.values() for key in keys}
+_SCALARS = (str, int, float, bool)
+
+
+def _lookup(record: Dict[str, Any], path: str) -> Any:
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _field(record: Dict[str, Any], name: str) -> Any:
+    """A station attribute, from the record's ``value`` document if it has one."""
+    source = record["value"] if isinstance(record.get("value"), dict) else record
+    for key in _FIELDS[name]:
+        if source.get(key) is not None:
+            return source[key]
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def parse_query(q: str) -> Optional[Dict[str, Any]]:
+    """Conditions of a ``q`` the index can evaluate, or None to defer to the API.
+
+    Supported: queries pinned to ``{"name": "hcdp_station_metadata"}`` whose
+    other conditions are on the indexed fields under ``value.``, matched
+    against scalars by equality or ``{"$in": [...]}``.
+    """
+    try:
+        query = json.loads(q)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(query, dict) or query.get("name") != STATION_METADATA:
+        return None
+    for key, condition in query.items():
+        if key == "name":
+            continue
+        if key not in _PATHS:
+            return None
+        if isinstance(condition, dict):
+            if list(condition) != ["$in"] or not isinstance(condition["$in"], list):
+                return None
+            values = condition["$in"]
+        else:
+            values = [condition]
+        if not all(isinstance(v, _SCALARS) for v in values):
+            return None
+    return query
+
+
+def _matches(record: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Mongo semantics: an array field matches when any element does."""
+    for key, condition in query.items():
+        value = _lookup(record, key)
+        candidates = value if isinstance(value, list) else [value]
+        wanted = condition["$in"] if isinstance(condition, dict) else [condition]
+        if not any(c == w for c in candidates for w in wanted):
+            return False
+    return True
+
+
+def split_listing(listing: Any) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """The container key (None for a bare list) and records of a listing."""
+    container = None
+    records = listing
+    if isinstance(listing, dict):
+        container = next((k for k in _CONTAINERS if isinstance(listing.get(k), list)), None)
+        records = listing.get(container) if container else None
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise ValueError("Unrecognized station listing; expected a list of station records")
+    return container, records
+
+
+def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * _EARTH_KM * math.asin(math.sqrt(a))
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return math.floor(lat / GRID_DEGREES), math.floor(lng / GRID_DEGREES)
+
+
+class StationIndex:
+    """A ``/stations`` listing indexed for local queries."""
+
+    def __init__(self, listing: Any):
+        self.container, records = split_listing(listing)
+        self.records: List[Dict[str, Any]] = records
+
+        self._by_id: Dict[str, int] = {}
+        self._by_island: Dict[str, List[int]] = defaultdict(list)
+        self._grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._coords: Dict[int, Tuple[float, float]] = {}
+        elevations: List[Tuple[float, int]] = []
+        names: Dict[int, str] = {}
+        for i, record in enumerate(records):
+            station_id = _field(record, "id")
+            if station_id is not None:
+                self._by_id.setdefault(str(station_id).lower(), i)
+            island = _field(record, "island")
+            if island is not None:
+                self._by_island[str(island).lower()].append(i)
+            elevation = _number(_field(record, "elevation"))
+            if elevation is not None:
+                elevations.append((elevation, i))
+            lat, lng = _number(_field(record, "lat")), _number(_field(record, "lng"))
+            if lat is not None and lng is not None:
+                self._coords[i] = (lat, lng)
+                self._grid[_cell(lat, lng)].append(i)
+            name = _field(record, "name")
+            if name is not None:
+                names[i] = f"{name} {station_id or ''}"
+        elevations.sort()
+        self._elevations = [e for e, _ in elevations]
+        self._by_elevation = [i for _, i in elevations]
+        self._names = TrigramIndex(names)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def query(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Records matching parsed ``get_station_data`` conditions, in listing order."""
+        return [r for r in self.records if _matches(r, query)]
+
+    def wrap(self, records: List[Dict[str, Any]]) -> Any:
+        """Records in the same container shape as the original listing."""
+        return {self.container: records} if self.container else records
+
+    def _near(self, lat: float, lng: float, radius_km: float) -> List[Tuple[float, int]]:
+        lat_cells = math.ceil(radius_km / 111.0 / GRID_DEGREES)
+        lng_cells = math.ceil(radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.01)) / GRID_DEGREES)
+        row, col = _cell(lat, lng)
+        found = []
+        for r in range(row - lat_cells, row + lat_cells + 1):
+            for c in range(col - lng_cells, col + lng_cells + 1):
+                for i in self._grid.get((r, c), ()):
+                    distance = _haversine_km(lat, lng, *self._coords[i])
+                    if distance <= radius_km:
+                        found.append((distance, i))
+        return sorted(found)
+
+    def search(
+        self,
+        station_id: Optional[str] = None,
+        name: Optional[str] = None,
+        island: Optional[str] = None,
+        min_elevation: Optional[float] = None,
+        max_elevation: Optional[float] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius_km: float = 10.0
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """``(record, match info)`` pairs meeting every given criterion.
+
+        Results are ordered by distance when ``lat``/``lng`` are given, else by
+        name score when ``name`` is given, else in listing order.
+        """
+        candidates: Optional[Dict[int, Dict[str, Any]]] = None
+
+        def narrow(found: Dict[int, Dict[str, Any]]) -> None:
+            nonlocal candidates
+            if candidates is None:
+                candidates = found
+            else:
+                candidates = {i: {**candidates[i], **info} for i, info in found.items() if i in candidates}
+
+        if station_id is not None:
+            i = self._by_id.get(station_id.strip().lower())
+            narrow({} if i is None else {i: {}})
+        if island is not None:
+            narrow({i: {} for i in self._by_island.get(island.strip().lower(), [])})
+        if min_elevation is not None or max_elevation is not None:
+            lo = 0 if min_elevation is None else bisect.bisect_left(self._elevations, min_elevation)
+            hi = len(self._elevations) if max_elevation is None else bisect.bisect_right(self._elevations, max_elevation)
+            narrow({i: {} for i in self._by_elevation[lo:hi]})
+        if lat is not None and lng is not None:
+            narrow({i: {"distance_km": round(d, 3)} for d, i in self._near(lat, lng, radius_km)})
+        if name is not None:
+            narrow({i: {"score": s} for i, s in self._names.search(name, len(self._names), NAME_MIN_SCORE)})
+
+        if candidates is None:
+            order = list(range(len(self.records)))
+            candidates = {}
+        elif lat is not None and lng is not None:
+            order = sorted(candidates, key=lambda i: candidates[i]["distance_km"])
+        elif name is not None:
+            order = sorted(candidates, key=lambda i: -candidates[i]["score"])
+        else:
+            order = sorted(candidates)
+        return [(self.records[i], candidates.get(i, {})) for i in order]
@@ -0,0 +1,224 @@
+"""Compact array-backed timeseries values."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_MS_PER_SECOND = 1000
+_MS_PER_DAY = 86_400_000
+_REDUCERS = ("mean", "sum", "min", "max", "last", "count")
+# NumPy weeks count from 1970-01-01, a Thursday; shifting by 3 days starts them on Monday.
+_MONDAY = np.timedelta64(3, "D")
+
+
+def _parse_times(stamps: List[str]) -> np.ndarray:
+    """Parse ISO 8601 UTC timestamps into a ``datetime64[ms]`` array."""
+    return np.array([s[:-1] if s.endswith("Z") else s for s in stamps], dtype="datetime64[ms]")
+
+
+def _format_times(times: np.ndarray) -> List[str]:
+    """Format a ``datetime64`` array as ISO 8601 UTC timestamps."""
+    return [f"{s}Z" for s in np.datetime_as_string(times, unit="ms")]
+
+
+def _parse_step(step: str) -> Tuple[int, str]:
+    """Parse the ISO 8601 durations produced by ``TimeSeries.to_compact``."""
+    if step.startswith("PT") and step.endswith("S"):
+        seconds, _, fraction = step[2:-1].partition(".")
+        return int(seconds) * _MS_PER_SECOND + int((fraction + "000")[:3]), "ms"
+    if step.startswith("P") and step.endswith("D"):
+        return int(step[1:-1]) * _MS_PER_DAY, "ms"
+    if step.startswith("P") and step.endswith("M"):
+        return int(step[1:-1]), "M"
+    raise ValueError(f"Unsupported step: {step}")
+
+
+def _format_step(size: int, unit: str) -> str:
+    """Format a grid step as an ISO 8601 duration."""
+    if unit == "M":
+        return f"P{size}M"
+    if size % _MS_PER_DAY == 0:
+        return f"P{size // _MS_PER_DAY}D"
+    seconds, ms = divmod(size, _MS_PER_SECOND)
+    if ms:
+        return f"PT{seconds}.{ms:03d}".rstrip("0") + "S"
+    return f"PT{seconds}S"
+
+
+def bucket_starts(times: np.ndarray, unit: str) -> np.ndarray:
+    """Start of the ``unit`` bucket holding each time, as ``datetime64[ms]``; weeks start on Monday."""
+    if unit == "W":
+        return (times + _MONDAY).astype("datetime64[W]").astype("datetime64[ms]") - _MONDAY
+    return times.astype(f"datetime64[{unit}]").astype("datetime64[ms]")
+
+
+def reduce_segments(values: np.ndarray, starts: np.ndarray, how: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Aggregate consecutive segments of ``values`` beginning at ``starts``.
+
+    NaN values are ignored; segments with no valid value come back as NaN.
+    Returns the aggregates and the number of valid values per segment.
+    """
+    if how not in _REDUCERS:
+        raise ValueError(f"Unknown aggregation: {how}")
+    valid = ~np.isnan(values)
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    if how == "count":
+        out = counts.astype(np.float64)
+    elif how == "last":
+        idx = np.maximum.reduceat(np.where(valid, np.arange(len(values)), -1), starts)
+        out = np.where(idx >= 0, values[np.maximum(idx, 0)], np.nan)
+    elif how in ("min", "max"):
+        reducer = np.fmin if how == "min" else np.fmax
+        out = reducer.reduceat(values, starts)
+    else:
+        out = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        if how == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out = out / counts
+        out = np.where(counts > 0, out, np.nan)
+    return out, counts
+
+
+class TimeSeries:
+    """A sorted timeseries held as a ``datetime64[ms]`` array and a float array.
+
+    Missing values are NaN. Slicing, resampling and gap detection operate on
+    the arrays directly instead of on per-timestamp strings.
+    """
+
+    __slots__ = ("times", "values")
+
+    def __init__(self, times: np.ndarray, values: np.ndarray):
+        self.times = np.asarray(times, dtype="datetime64[ms]")
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.times.shape != self.values.shape:
+            raise ValueError("times and values must have the same length")
+
+    @classmethod
+    def from_mapping(cls, data: Dict[str, Any]) -> "TimeSeries":
+        """Build a series from an API ``{timestamp: value}`` mapping."""
+        times = _parse_times(list(data))
+        values = np.array([np.nan if v is None else v for v in data.values()], dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        return cls(times[order], values[order])
+
+    @classmethod
+    def from_compact(cls, data: Dict[str, Any]) -> "TimeSeries":
+        """Rebuild a series from the output of ``to_compact``."""
+        values = np.array([np.nan if v is None else v for v in data["values"]], dtype=np.float64)
+        if "times" in data:
+            return cls(_parse_times(data["times"]), values)
+        start = _parse_times([data["start"]])[0]
+        size, unit = _parse_step(data["step"])
+        offsets = np.arange(len(values)) * size
+        if unit == "ms":
+            return cls(start + offsets.astype("timedelta64[ms]"), values)
+        month = start.astype("datetime64[M]")
+        within = start - month.astype("datetime64[ms]")
+        months = month + offsets.astype("timedelta64[M]")
+        return cls(months.astype("datetime64[ms]") + within, values)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, index: slice) -> "TimeSeries":
+        if not isinstance(index, slice):
+            raise TypeError("TimeSeries only supports slice indexing")
+        return TimeSeries(self.times[index], self.values[index])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return np.array_equal(self.times, other.times) and np.array_equal(
+            self.values, other.values, equal_nan=True
+        )
+
+    def __repr__(self) -> str:
+        return f"TimeSeries(len={len(self)})"
+
+    def between(self, start: str, end: str) -> "TimeSeries":
+        """Return the points with ``start <= time <= end`` (ISO strings or dates)."""
+        lo, hi = np.datetime64(start, "ms"), np.datetime64(end, "ms")
+        if len(end) <= 10:
+            hi = hi + np.timedelta64(_MS_PER_DAY - 1, "ms")
+        i = np.searchsorted(self.times, lo, side="left")
+        j = np.searchsorted(self.times, hi, side="right")
+        return self[i:j]
+
+    def _grid(self) -> Tuple[np.ndarray, str]:
+        """Return integer time positions and their unit ("M" or "ms").
+
+        Month-aligned series (every point at the same offset into its month)
+        use month positions so that calendar months count as a regular step.
+        """
+        positions = self.times.astype(np.int64)
+        if len(self) > 1:
+            diffs = np.diff(positions)
+            if not (diffs == diffs[0]).all():
+                months = self.times.astype("datetime64[M]")
+                within = self.times - months.astype("datetime64[ms]")
+                if (within == within[0]).all():
+                    return months.astype(np.int64), "M"
+        return positions, "ms"
+
+    def step(self) -> Optional[Tuple[int, str]]:
+        """Return ``(size, unit)`` if the series is evenly spaced, else None."""
+        if len(self) < 2:
+            return None
+        positions, unit = self._grid()
+        diffs = np.diff(positions)
+        if diffs[0] > 0 and (diffs == diffs[0]).all():
+            return int(diffs[0]), unit
+        return None
+
+    def gaps(self) -> List[Dict[str, Any]]:
+        """Find holes in the series relative to its smallest spacing."""
+        if len(self) < 2:
+            return []
+        positions, _ = self._grid()
+        diffs = np.diff(positions)
+        positive = diffs[diffs > 0]
+        if not len(positive):
+            return []
+        base = positive.min()
+        idx = np.flatnonzero(diffs > base)
+        starts, ends = _format_times(self.times[idx]), _format_times(self.times[idx + 1])
+        missing = (diffs[idx] // base - 1).tolist()
+        return [
+            {"after": a, "before": b, "missing": int(n)}
+            for a, b, n in zip(starts, ends, missing)
+        ]
+
+    def resample(self, freq: str, how: str = "mean") -> "TimeSeries":
+        """Aggregate into calendar buckets (``freq`` is a numpy unit: Y, M, W, D, h, m).
+
+        Weeks start on Monday, as in ``MesonetFrame.resample``.
+
+        NaN values are ignored; buckets with no valid value come back as NaN.
+        """
+        if how not in _REDUCERS:
+            raise ValueError(f"Unknown aggregation: {how}")
+        if not len(self):
+            return self
+        buckets = bucket_starts(self.times, freq)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        out, _ = reduce_segments(self.values, starts, how)
+        return TimeSeries(buckets[starts], out)
+
+    def to_mapping(self) -> Dict[str, Optional[float]]:
+        """Convert back to the API ``{timestamp: value}`` shape."""
+        return dict(zip(_format_times(self.times), self._value_list()))
+
+    def to_compact(self) -> Dict[str, Any]:
+        """Serialize as ``start + step + values`` when regular, else times + values."""
+        step = self.step()
+        if step is None:
+            return {"times": _format_times(self.times), "values": self._value_list()}
+        return {
+            "start": _format_times(self.times[:1])[0],
+            "step": _format_step(*step),
+            "values": self._value_list(),
+        }
+
+    def _value_list(self) -> List[Optional[float]]:
+        return [None if v != v else v for v in self.values.tolist()]
@@ -0,0 +1,154 @@
+"""Interval cache for raster timeseries responses."""
+
+import calendar
+import json
+import os
+from collections import OrderedDict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .intervals import merge_intervals, subtract_intervals
+
+ONE_DAY = timedelta(days=1)
+
+
+def parse_date_bound(value: str, end: bool = False) -> Optional[date]:
+    """Parse a ``YYYY``, ``YYYY-MM`` or ``YYYY-MM-DD`` bound into a date.
+
+    Partial dates expand to the first day of the period, or to the last day
+    when ``end`` is true. Returns None for anything else.
+    """
+    try:
+        parts = [int(p) for p in value[:10].split("-")]
+        if len(parts) == 3:
+            return date(*parts)
+        if len(parts) == 2:
+            day = calendar.monthrange(*parts)[1] if end else 1
+            return date(parts[0], parts[1], day)
+        if len(parts) == 1:
+            return date(parts[0], 12, 31) if end else date(parts[0], 1, 1)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def is_series(result: Any) -> bool:
+    """Whether an API response is a flat timestamp -> value mapping."""
+    return isinstance(result, dict) and all(
+        isinstance(k, str) and (v is None or isinstance(v, (int, float)))
+        for k, v in result.items()
+    )
+
+
+def period_end(day: date, period: Optional[str]) -> date:
+    """Last day of the ``period`` holding ``day``; unset periods are taken as months."""
+    if period == "day":
+        return day
+    if period == "year":
+        return date(day.year, 12, 31)
+    return date(day.year, day.month, calendar.monthrange(day.year, day.month)[1])
+
+
+class TimeseriesCache:
+    """Cache of timeseries values keyed by query, tracking covered date ranges.
+
+    Each key holds the merged set of date ranges already fetched and the
+    values seen for them. A new request only needs the sub-ranges returned by
+    ``missing``; the answer is then assembled from the cache with ``get``.
+    Coverage stops at the period of the last value a fetch returned, since
+    later periods may simply not be published yet.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def key(
+        datatype: str,
+        extent: str,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        location: str = "hawaii",
+        production: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        timescale: Optional[str] = None,
+        period: Optional[str] = None
+    ) -> Tuple:
+        """Build the cache key for a timeseries query."""
+        return (datatype, production, period, extent, lat, lng, location, aggregation, timescale)
+
+    def missing(self, key: Tuple, start: date, end: date) -> List[Tuple[date, date]]:
+        """Return the inclusive date ranges of ``[start, end]`` not yet cached."""
+        entry = self._entries.get(key)
+        covered = entry["covered"] if entry else []
+        return [(s, e - ONE_DAY) for s, e in subtract_intervals(start, end + ONE_DAY, covered)]
+
+    def add(self, key: Tuple, start: date, end: date, values: Dict[str, Any]) -> None:
+        """Record that ``[start, end]`` has been fetched and merge its values.
+
+        Only the part of the range up to the end of the last value's period
+        counts as covered; a fetch returning nothing covers nothing.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {"covered": [], "values": {}}
+        lo, hi = start.isoformat(), end.isoformat()
+        last = max((ts[:10] for ts in values if lo <= ts[:10] <= hi), default=None)
+        if last is not None:
+            covered_end = min(end, period_end(date.fromisoformat(last), key[2]))
+            entry["covered"] = merge_intervals(entry["covered"] + [(start, covered_end + ONE_DAY)])
+        entry["values"].update(values)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: Tuple, start: date, end: date) -> Dict[str, Any]:
+        """Return the cached values whose timestamps fall within ``[start, end]``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        self._entries.move_to_end(key)
+        lo, hi = start.isoformat(), end.isoformat()
+        return {ts: v for ts, v in sorted(entry["values"].items()) if lo <= ts[:10] <= hi}
+
+    def save(self, path: Path) -> None:
+        """Write all entries to ``path`` as JSON, atomically."""
+        entries = [
+            {
+                "key": list(key),
+                "covered": [[s.isoformat(), e.isoformat()] for s, e in entry["covered"]],
+                "values": entry["values"],
+            }
+            for key, entry in self._entries.items()
+        ]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entries))
+        os.replace(tmp, path)
+
+    def load(self, path: Path) -> int:
+        """Merge entries saved with ``save``; returns how many were read.
+
+        A missing or unreadable file is treated as empty.
+        """
+        try:
+            entries = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return 0
+        for item in entries:
+            if not item["covered"]:
+                continue
+            # Re-adding clamps coverage saved before it stopped at the last value.
+            for s, e in item["covered"]:
+                self.add(tuple(item["key"]), date.fromisoformat(s), date.fromisoformat(e) - ONE_DAY, item["values"])
+        return len(entries)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,37 @@
+"""Searchable catalog of mesonet variable definitions."""
+
+from typing import Any, Dict, List
+
+from .search_index import TrigramIndex
+
+_TEXT_FIELDS = ("standard_name", "display_name", "units", "units_plain", "units_expanded")
+
+
+class VariableCatalog:
+    """``/mesonet/db/variables`` records indexed by id, display name and units."""
+
+    def __init__(self, variables: Any):
+        if not isinstance(variables, list) or not all(isinstance(v, dict) and "standard_name" in v for v in variables):
+            raise ValueError("Unrecognized mesonet variable list; expected records with standard_name")
+        self.variables = variables
+        self.records: Dict[str, Dict[str, Any]] = {v["standard_name"]: v for v in variables}
+        self.index = TrigramIndex({
+            name: " ".join(str(record[f]) for f in _TEXT_FIELDS if record.get(f))
+            for name, record in self.records.items()
+        })
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Best matching variables, each with its ``var_id`` and match ``score``."""
+        return [
+            {
+                "var_id": name,
+                "display_name": self.records[name].get("display_name"),
+                "units": self.records[name].get("units"),
+                "units_expanded": self.records[name].get("units_expanded"),
+                "score": score,
+            }
+            for name, score in self.index.search(query, limit)
+        ]
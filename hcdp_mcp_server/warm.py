@@ -0,0 +1,153 @@
+"""Cache warming from a spec of datasets.
+
+A spec (YAML or JSON) lists raster and timeseries datasets to pre-fetch::
+
+    concurrency: 8
+    rasters:
+      - datatype: rainfall
+        production: new
+        period: month
+        extents: [statewide, bi]
+        start: 2023-01
+        end: 2024-12
+    timeseries:
+      - datatype: rainfall
+        production: new
+        period: month
+        extent: statewide
+        start: 2000-01
+        end: 2024-12
+        points: [[21.31, -157.86], [19.73, -155.09]]
+
+Finished tasks are recorded in a state file, so an interrupted run picks up
+where it stopped.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from .prefetch import step_date
+
+
+class WarmTask(NamedTuple):
+    """One cache fill: a client method and its arguments."""
+    id: str
+    method: str
+    args: Dict[str, Any]
+
+
+def load_spec(path: Path) -> Dict[str, Any]:
+    """Read a warm spec from a ``.json`` file, or YAML for any other suffix."""
+    text = Path(path).read_text()
+    if Path(path).suffix == ".json":
+        return json.loads(text)
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("YAML specs need PyYAML (pip install pyyaml), or use a .json spec") from None
+    return yaml.safe_load(text) or {}
+
+
+def _dates(start: str, end: str, period: Optional[str]) -> List[str]:
+    dates = []
+    current: Optional[str] = start
+    while current is not None and current[:len(end)] <= end:
+        dates.append(current)
+        current = step_date(current, period, 1)
+    return dates
+
+
+def _common(entry: Dict[str, Any]) -> Dict[str, Any]:
+    fields = ("datatype", "location", "production", "aggregation", "timescale", "period")
+    return {k: entry[k] for k in fields if entry.get(k) is not None}
+
+
+def enumerate_tasks(spec: Dict[str, Any]) -> List[WarmTask]:
+    """Expand a spec into individual cache fills."""
+    tasks = []
+    for entry in spec.get("rasters", []):
+        extents = entry.get("extents") or [entry["extent"]]
+        for extent in extents:
+            for date in _dates(str(entry["start"]), str(entry["end"]), entry.get("period")):
+                args = {**_common(entry), "extent": extent, "date": date}
+                tasks.append(WarmTask(_task_id("raster", args), "get_raster_data", args))
+    for entry in spec.get("timeseries", []):
+        extents = entry.get("extents") or [entry["extent"]]
+        for extent in extents:
+            for lat, lng in entry.get("points") or [(None, None)]:
+                args = {**_common(entry), "extent": extent, "start": str(entry["start"]),
+                        "end": str(entry["end"]), "lat": lat, "lng": lng}
+                tasks.append(WarmTask(_task_id("timeseries", args), "get_timeseries_data", args))
+    return list({t.id: t for t in tasks}.values())
+
+
+def _task_id(kind: str, args: Dict[str, Any]) -> str:
+    return kind + ":" + hashlib.sha1(json.dumps(args, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _save_state(path: Path, done: set) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(sorted(done)))
+    os.replace(tmp, path)
+
+
+async def run_warm(
+    tasks: List[WarmTask],
+    client: Any,
+    state_path: Path,
+    concurrency: int = 8,
+    checkpoint: Optional[Callable[[], None]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    checkpoint_every: int = 25
+) -> Dict[str, Any]:
+    """Run ``tasks`` against ``client``, skipping those finished in an earlier run.
+
+    Every ``checkpoint_every`` completions, ``checkpoint`` is called (to persist
+    in-memory caches) and the finished task ids are written to ``state_path``.
+    """
+    state_path = Path(state_path)
+    try:
+        done = set(json.loads(state_path.read_text()))
+    except (OSError, ValueError):
+        done = set()
+    pending = [t for t in tasks if t.id not in done]
+    counts = {"total": len(tasks), "skipped": len(tasks) - len(pending), "done": 0, "failed": 0}
+    errors: List[Dict[str, Any]] = []
+    slots = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    def save() -> None:
+        if checkpoint is not None:
+            checkpoint()
+        _save_state(state_path, done)
+
+    async def run(task: WarmTask) -> None:
+        async with slots:
+            try:
+                await getattr(client, task.method)(**task.args)
+                done.add(task.id)
+                counts["done"] += 1
+            except Exception as e:
+                counts["failed"] += 1
+                errors.append({"task": task.method, "args": task.args, "error": str(e)})
+        finished = counts["done"] + counts["failed"]
+        if finished % checkpoint_every == 0:
+            save()
+        if progress is not None:
+            progress({**counts, "elapsed": round(time.perf_counter() - start, 1)})
+
+    await asyncio.gather(*(run(t) for t in pending))
+    save()
+    return {**counts, "seconds": round(time.perf_counter() - start, 3), "errors": errors}
+
+
+def state_path_for(spec: Dict[str, Any], root: Path) -> Path:
+    """State file for a spec, so editing the spec starts a fresh run."""
+    digest = hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return Path(root) / f"warm-{digest}.json"
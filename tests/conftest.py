@@ -5,6 +5,13 @@ import os
 from unittest.mock import patch
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_data_dir(tmp_path_factory):
+    """Keep job records and caches written during tests out of the user's data directory."""
+    with patch.dict(os.environ, {"HCDP_DATA_DIR": str(tmp_path_factory.mktemp("hcdp-data"))}):
+        yield
+
+
 @pytest.fixture
 def mock_env_vars():
     """Mock environment variables for testing."""
@@ -0,0 +1,24 @@
+"""Tests for the end-to-end tool benchmark helpers."""
+
+from benchmarks.bench_tools import SCENARIOS, compare, percentile, render, tool_name
+from hcdp_mcp_server.server import TOOLS
+
+
+class TestBenchTools:
+    """Test scenario coverage and report arithmetic."""
+
+    def test_every_tool_has_a_scenario(self):
+        assert {spec.name for spec in TOOLS} == {tool_name(s) for s in SCENARIOS}
+
+    def test_percentile_and_render(self):
+        values = list(range(1, 101))
+        assert [percentile(values, q) for q in (50, 95, 99)] == [50, 95, 99]
+        assert percentile([7.0], 99) == 7.0
+        assert render({"zipName": "split_{i}", "limit": 5}, 3) == {"zipName": "split_3", "limit": 5}
+
+    def test_compare_against_baseline(self):
+        report = {"results": {"get_mesonet_data": {"runs": [{"concurrency": 1, "p95_ms": 30.0},
+                                                             {"concurrency": 8, "p95_ms": 50.0}]}}}
+        baseline = {"results": {"get_mesonet_data": {"runs": [{"concurrency": 1, "p95_ms": 20.0}]}}}
+        lines = compare(report, baseline)
+        assert len(lines) == 1 and lines[0].endswith("1.50x")
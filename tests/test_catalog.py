@@ -0,0 +1,100 @@
+"""Tests for the production file catalog."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server.catalog import CatalogCache, ProductionCatalog, production_files
+from hcdp_mcp_server.client import HCDPClient
+
+PREFIX = "/production/rainfall/new/month/bi/data_map"
+FILES = [f"{PREFIX}/{y}/rainfall_new_month_bi_data_map_{y}_{m:02d}.tif"
+         for y in (2023, 2024) for m in range(1, 13)]
+
+
+class TestProductionCatalog:
+    """Test indexing and queries."""
+
+    def test_listing_shapes(self):
+        assert production_files({"files": FILES}) == FILES
+        assert production_files(FILES) == FILES
+        with pytest.raises(ValueError):
+            production_files({"message": "nope"})
+
+    def test_records(self):
+        catalog = ProductionCatalog(FILES)
+        assert catalog.record(FILES[0]) == {
+            "name": "rainfall_new_month_bi_data_map_2023_01.tif",
+            "datatype": "rainfall",
+            "date": "2023-01",
+            "production": "new",
+            "period": "month",
+            "extent": "bi",
+        }
+
+    def test_date_range_compares_on_prefix(self):
+        catalog = ProductionCatalog(reversed(FILES))
+        assert catalog.query("2023-11-15", "2024-02") == FILES[10:14]
+        assert catalog.query(end_date="2023") == FILES[:12]
+        assert catalog.query("2025") == []
+        assert catalog.query() == FILES
+
+    def test_mixed_precisions_compare_at_their_own_width(self):
+        year = "/production/rainfall/new/year/bi/data_map/rainfall_new_year_bi_data_map_2023.tif"
+        day = "/production/rainfall/new/day/bi/data_map/2023/rainfall_new_day_bi_data_map_2023_12_05.tif"
+        catalog = ProductionCatalog(FILES + [year, day])
+        assert catalog.query("2023-12-01", "2023-12-31") == [year, FILES[11], day]
+        assert catalog.query("2023-12-06") == [year, FILES[11]] + FILES[12:]
+        assert catalog.query("2024-01-15", "2024-01") == [FILES[12]]
+
+    def test_pattern(self):
+        catalog = ProductionCatalog(FILES)
+        assert catalog.query(pattern="*_0[12].tif") == [FILES[0], FILES[1], FILES[12], FILES[13]]
+        assert catalog.query("2024", pattern="*_12.tif") == [FILES[23]]
+
+    def test_undated_files_only_without_bounds(self):
+        catalog = ProductionCatalog(FILES[:2] + ["/production/readme.txt"])
+        assert catalog.query()[0] == "/production/readme.txt"
+        assert catalog.query("2023") == FILES[:2]
+
+    def test_update_applies_diff(self):
+        catalog = ProductionCatalog(FILES[:12])
+        diff = catalog.update(FILES[1:13])
+        assert diff == {"added": [FILES[12]], "removed": [FILES[0]]}
+        assert catalog.query() == FILES[1:13]
+        assert FILES[0] not in catalog and len(catalog) == 12
+
+
+class TestCatalogCache:
+    """Test catalog reuse and refresh."""
+
+    def test_expiry(self):
+        cache = CatalogCache(ttl=60)
+        key = cache.key("rainfall", "new", "month", "bi")
+        catalog, _ = cache.refresh(key, FILES)
+        assert cache.get(key) is catalog
+        with patch("hcdp_mcp_server.catalog.time.monotonic", return_value=1e12):
+            assert cache.get(key) is None
+
+    @pytest.mark.asyncio
+    async def test_client_lists_once_then_queries_locally(self, mock_env_vars):
+        client = HCDPClient(catalog_cache=CatalogCache())
+        fetch = AsyncMock(return_value={"files": FILES})
+        with patch.object(client, "_fetch_production_list", fetch):
+            first = await client.list_production_files("rainfall", "new", "month", "bi")
+            second = await client.list_production_files(
+                "rainfall", "new", "month", "bi", start_date="2024-06", pattern="*_0*"
+            )
+            fetch.return_value = {"files": FILES + [FILES[-1].replace("2024_12", "2025_01")]}
+            third = await client.list_production_files("rainfall", "new", "month", "bi", refresh=True)
+        assert fetch.await_count == 2
+        assert first["count"] == 24 and first["added"] == 24
+        assert second["files"] == FILES[17:21]
+        assert third["added"] == 1 and third["removed"] == 0 and third["total"] == 25
+
+    @pytest.mark.asyncio
+    async def test_raw_listing_without_catalog(self, mock_env_vars):
+        client = HCDPClient()
+        with patch.object(client, "_fetch_production_list", AsyncMock(return_value={"files": FILES})):
+            assert await client.list_production_files("rainfall") == {"files": FILES}
+            filtered = await client.list_production_files("rainfall", end_date="2023-01")
+        assert filtered["files"] == FILES[:1]
@@ -0,0 +1,241 @@
+"""Tests for parallel, resumable split package downloads."""
+
+import hashlib
+import json
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server import server
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.downloads import download_file, download_split_package, retrieve_files, split_urls
+from hcdp_mcp_server.file_cache import FileCache
+from hcdp_mcp_server.jobs import SUCCEEDED, JobManager
+
+PARTS = {f"https://files.example.com/pkg/part{i}": bytes([65 + i]) * (1000 + i) for i in range(4)}
+
+
+def range_server(parts, fail_once=()):
+    """Mock transport honouring Range requests; URLs in ``fail_once`` fail once."""
+    requests = []
+    failed = set()
+
+    async def handler(request):
+        url = str(request.url)
+        body = parts[url]
+        requests.append((url, request.headers.get("range")))
+        start = 0
+        if request.headers.get("range"):
+            start = int(request.headers["range"].split("=")[1].rstrip("-"))
+            if start >= len(body):
+                return httpx.Response(416, headers={"content-range": f"bytes */{len(body)}"})
+        data = body[start:]
+        headers = {"content-length": str(len(data))}
+        status = 200
+        if start:
+            status = 206
+            headers["content-range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+
+        if url in fail_once and url not in failed:
+            failed.add(url)
+
+            async def broken():
+                yield data[:100]
+                raise httpx.ReadError("connection reset")
+            return httpx.Response(status, headers=headers, content=broken())
+        return httpx.Response(status, headers=headers, content=data)
+
+    return httpx.MockTransport(handler), requests
+
+
+class TestSplitUrls:
+    """Test parsing of splitlink responses."""
+
+    def test_list_and_wrapped(self):
+        assert split_urls(["a", "b"]) == ["a", "b"]
+        assert split_urls({"urls": ["a"]}) == ["a"]
+        with pytest.raises(ValueError):
+            split_urls({"message": "nope"})
+
+
+class TestDownloads:
+    """Test downloading and reassembly."""
+
+    @pytest.mark.asyncio
+    async def test_parts_reassembled_in_order(self, tmp_path):
+        transport, _ = range_server(PARTS)
+        async with httpx.AsyncClient(transport=transport) as http:
+            summary = await download_split_package(http, list(PARTS), tmp_path / "pkg.zip", concurrency=3)
+        assert (tmp_path / "pkg.zip").read_bytes() == b"".join(PARTS.values())
+        assert summary["parts"] == 4 and summary["bytes"] == sum(map(len, PARTS.values()))
+        assert not (tmp_path / "pkg.zip.parts").exists()
+
+    @pytest.mark.asyncio
+    async def test_interrupted_package_resumes_with_range(self, tmp_path):
+        urls = list(PARTS)
+        parts_dir = tmp_path / "pkg.zip.parts"
+        parts_dir.mkdir()
+        (parts_dir / "manifest.json").write_text(json.dumps(urls))
+        (parts_dir / "part-00001").write_bytes(PARTS[urls[1]][:100])
+        transport, requests = range_server(PARTS)
+        async with httpx.AsyncClient(transport=transport) as http:
+            await download_split_package(http, urls, tmp_path / "pkg.zip")
+        assert (tmp_path / "pkg.zip").read_bytes() == b"".join(PARTS.values())
+        assert (urls[1], "bytes=100-") in requests
+
+    @pytest.mark.asyncio
+    async def test_transport_errors_are_retried(self, tmp_path):
+        flaky = list(PARTS)[2]
+        transport, requests = range_server(PARTS, fail_once={flaky})
+        with patch("hcdp_mcp_server.downloads.asyncio.sleep", AsyncMock()):
+            async with httpx.AsyncClient(transport=transport) as http:
+                await download_split_package(http, list(PARTS), tmp_path / "pkg.zip")
+        assert (tmp_path / "pkg.zip").read_bytes() == b"".join(PARTS.values())
+        assert [url for url, _ in requests].count(flaky) == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_parts_are_discarded(self, tmp_path):
+        parts_dir = tmp_path / "pkg.zip.parts"
+        parts_dir.mkdir()
+        (parts_dir / "manifest.json").write_text(json.dumps(["https://old/part"]))
+        (parts_dir / "part-00000").write_bytes(b"stale")
+        transport, _ = range_server(PARTS)
+        async with httpx.AsyncClient(transport=transport) as http:
+            await download_split_package(http, list(PARTS), tmp_path / "pkg.zip")
+        assert (tmp_path / "pkg.zip").read_bytes() == b"".join(PARTS.values())
+
+    @pytest.mark.asyncio
+    async def test_complete_part_is_not_refetched(self, tmp_path):
+        url = list(PARTS)[0]
+        dest = tmp_path / "part"
+        dest.write_bytes(PARTS[url])
+        transport, requests = range_server(PARTS)
+        async with httpx.AsyncClient(transport=transport) as http:
+            assert await download_file(http, url, dest) == len(PARTS[url])
+        assert requests == [(url, f"bytes={len(PARTS[url])}-")]
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, tmp_path):
+        transport = httpx.MockTransport(lambda request: httpx.Response(404))
+        async with httpx.AsyncClient(transport=transport) as http:
+            with pytest.raises(httpx.HTTPStatusError):
+                await download_file(http, "https://files.example.com/missing", tmp_path / "x")
+
+
+class TestDownloadTool:
+    """Test the download_data_package_splitlink job."""
+
+    @pytest.mark.asyncio
+    async def test_tool_downloads_package(self, tmp_path):
+        manager = JobManager(tmp_path / "jobs.json")
+        transport, _ = range_server(PARTS)
+        http = httpx.AsyncClient(transport=transport)
+        with patch.object(server, "_job_manager", manager), \
+                patch("hcdp_mcp_server.client.get_http_client", return_value=http), \
+                patch("hcdp_mcp_server.client.HCDPClient.generate_data_package_splitlink",
+                      AsyncMock(return_value=list(PARTS))), \
+                patch.dict("os.environ", {"HCDP_API_TOKEN": "test_token", "HCDP_PACKAGE_DIR": str(tmp_path)}):
+            content = await server.handle_call_tool("download_data_package_splitlink", {
+                "email": "user@example.com", "datatype": "rainfall",
+                "zipName": "rain", "dest_dir": "out",
+            })
+            job = await manager.wait(json.loads(content[0].text)["job_id"])
+        await http.aclose()
+        assert job["status"] == SUCCEEDED
+        assert job["result"]["path"] == str(tmp_path.resolve() / "out" / "rain.zip")
+        assert (tmp_path / "out" / "rain.zip").read_bytes() == b"".join(PARTS.values())
+
+    def test_package_path_stays_in_package_dir(self, tmp_path):
+        root = tmp_path.resolve() / "packages"
+        with patch.dict("os.environ", {"HCDP_PACKAGE_DIR": str(root)}):
+            path = lambda **kw: server.package_path(server.BuildDataPackageArgs(datatype="rainfall", **kw))
+            assert path(zipName="../../x") == root / "x.zip"
+            assert path(zipName="..\\evil zip.zip") == root / "evil_zip.zip"
+            assert path(zipName="..") == root / "rainfall_package.zip"
+            assert path(dest_dir="a/b", zipName="/etc/p") == root / "a" / "b" / "p.zip"
+            for dest_dir in ("../", "/tmp", "a/../../x"):
+                with pytest.raises(ValueError):
+                    path(dest_dir=dest_dir)
+
+
+class TestRetrieveFiles:
+    """Test bulk retrieval of production files into the file cache."""
+
+    FILES = {f"/production/rainfall_new_month_bi_data_map_2024_{m:02d}.tif": bytes([m]) * (100 * m)
+             for m in range(1, 5)}
+
+    def production_server(self, fail=()):
+        seen = []
+
+        def handler(request):
+            file_path = request.url.params["file_path"]
+            seen.append(file_path)
+            if file_path in fail:
+                return httpx.Response(404)
+            return httpx.Response(200, content=self.FILES[file_path])
+
+        return httpx.MockTransport(handler), seen
+
+    @pytest.mark.asyncio
+    async def test_dedups_and_skips_cached(self, tmp_path):
+        paths = list(self.FILES)
+        cache = FileCache(tmp_path)
+        cache.put(paths[0], self.FILES[paths[0]])
+        transport, seen = self.production_server()
+        async with httpx.AsyncClient(transport=transport) as http:
+            report = await retrieve_files(
+                http, paths + paths[1:3], cache,
+                lambda p: "https://api.test/files/production/retrieve?file_path=" + p
+            )
+        assert sorted(seen) == paths[1:]
+        assert report["requested"] == 6 and report["duplicates"] == 2
+        assert report["from_cache"] == 1 and report["fetched"] == 3
+        assert report["bytes_fetched"] == 900
+        fetched = {f["file_path"]: f for f in report["files"]}
+        assert fetched[paths[3]]["sha256"] == hashlib.sha256(self.FILES[paths[3]]).hexdigest()
+        assert cache.get(paths[3]).read_bytes() == self.FILES[paths[3]]
+        assert [f["file_path"] for f in report["files"]] == paths
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_file(self, tmp_path):
+        paths = list(self.FILES)
+        transport, _ = self.production_server(fail={paths[1]})
+        async with httpx.AsyncClient(transport=transport) as http:
+            report = await retrieve_files(
+                http, paths, FileCache(tmp_path),
+                lambda p: "https://api.test/files/production/retrieve?file_path=" + p
+            )
+        assert [f["file_path"] for f in report["failed"]] == [paths[1]]
+        assert report["fetched"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_file_evicted_during_call(self, tmp_path):
+        paths = list(self.FILES)
+        cache = FileCache(tmp_path, max_bytes=550)
+        cache.put(paths[0], self.FILES[paths[0]])
+        transport, _ = self.production_server()
+        async with httpx.AsyncClient(transport=transport) as http:
+            report = await retrieve_files(
+                http, paths[:3], cache,
+                lambda p: "https://api.test/files/production/retrieve?file_path=" + p
+            )
+        assert [f["file_path"] for f in report["failed"]] == [paths[0]]
+        assert report["fetched"] == 2 and report["from_cache"] == 0
+
+    @pytest.mark.asyncio
+    async def test_client_retrieves_catalog_query(self, tmp_path, mock_env_vars):
+        transport, seen = self.production_server()
+        http = httpx.AsyncClient(transport=transport)
+        client = HCDPClient(file_cache=FileCache(tmp_path))
+        with patch("hcdp_mcp_server.client.get_http_client", return_value=http), \
+                patch.object(client, "_fetch_production_list", AsyncMock(return_value=list(self.FILES))):
+            report = await client.retrieve_production_files(datatype="rainfall", start_date="2024-03")
+        await http.aclose()
+        assert sorted(seen) == list(self.FILES)[2:]
+        assert report["fetched"] == 2
+
+    @pytest.mark.asyncio
+    async def test_client_requires_paths_or_query(self, tmp_path, mock_env_vars):
+        client = HCDPClient(file_cache=FileCache(tmp_path))
+        with pytest.raises(ValueError, match="file_paths"):
+            await client.retrieve_production_files()
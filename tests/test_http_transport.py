@@ -0,0 +1,110 @@
+"""Tests for the streamable HTTP transport and shared process resources."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from starlette.testclient import TestClient
+
+from hcdp_mcp_server import client as client_module
+from hcdp_mcp_server import server
+from hcdp_mcp_server.http_transport import build_http_app
+from hcdp_mcp_server.ratelimit import RateLimiter
+
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+
+def rpc(method, params=None, id=1):
+    """Build a JSON-RPC request body."""
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": params or {}}
+
+
+def open_session(http):
+    """Initialize an MCP session and return its id."""
+    response = http.post("/mcp/", headers=HEADERS, json=rpc("initialize", {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "0"},
+    }))
+    assert response.status_code == 200
+    session_id = response.headers["mcp-session-id"]
+    http.post("/mcp/", headers={**HEADERS, "mcp-session-id": session_id},
+              json={"jsonrpc": "2.0", "method": "notifications/initialized"})
+    return session_id
+
+
+class TestHttpTransport:
+    """Test serving several MCP sessions from one app."""
+
+    def test_concurrent_sessions_share_server_state(self):
+        with TestClient(build_http_app(json_response=True)) as http:
+            first, second = open_session(http), open_session(http)
+            assert first != second
+
+            for session_id in (first, second):
+                response = http.post("/mcp/", headers={**HEADERS, "mcp-session-id": session_id},
+                                     json=rpc("tools/list", id=2))
+                names = [tool["name"] for tool in response.json()["result"]["tools"]]
+                assert "get_mesonet_data" in names
+
+            with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+                mock_client = Mock()
+                mock_client.get_mesonet_stations = AsyncMock(return_value=[{"station_id": "0115"}])
+                mock_client_class.return_value = mock_client
+                response = http.post("/mcp/", headers={**HEADERS, "mcp-session-id": second},
+                                     json=rpc("tools/call", {"name": "get_mesonet_stations",
+                                                             "arguments": {}}, id=3))
+            content = response.json()["result"]["content"]
+            assert json.loads(content[0]["text"]) == [{"station_id": "0115"}]
+            mock_client_class.assert_called_once()
+            assert mock_client_class.call_args.kwargs["timeseries_cache"] is server.timeseries_cache
+
+
+class TestSharedResources:
+    """Test the process-wide pool, limiter and concurrency limit."""
+
+    @pytest.mark.asyncio
+    async def test_connection_pool_is_shared(self):
+        pool = client_module.get_http_client()
+        assert client_module.get_http_client() is pool
+        await client_module.aclose_http_client()
+        assert client_module.get_http_client() is not pool
+        await client_module.aclose_http_client()
+
+    def test_pool_is_closed_with_its_loop(self):
+        async def pool():
+            return client_module.get_http_client()
+
+        first = asyncio.run(pool())
+        second = asyncio.run(pool())
+        assert first is not second and first.is_closed and second.is_closed
+        assert not client_module._http_pools
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_spaces_requests(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await limiter.acquire()
+        assert loop.time() - start >= 0.05
+        assert not limiter.try_acquire()
+        assert RateLimiter(rate=0).try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_tool_concurrency_is_bounded(self):
+        active = peak = 0
+
+        async def slow_stations(location):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return []
+
+        with patch.object(server, "_tool_slots", asyncio.Semaphore(2)), \
+                patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+            mock_client_class.return_value.get_mesonet_stations = slow_stations
+            await asyncio.gather(*(server.handle_call_tool("get_mesonet_stations", {}) for _ in range(6)))
+        assert peak == 2
@@ -0,0 +1,119 @@
+"""Tests for the background job subsystem."""
+
+import asyncio
+import json
+import pytest
+import subprocess
+import sys
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server import server
+from hcdp_mcp_server.jobs import FAILED, INTERRUPTED, QUEUED, SUCCEEDED, JobManager
+
+
+class TestJobManager:
+    """Test job execution, bounding and persistence."""
+
+    @pytest.mark.asyncio
+    async def test_job_lifecycle(self, tmp_path):
+        manager = JobManager(tmp_path / "jobs.json")
+        job = manager.submit("tool", {"a": 1}, AsyncMock(return_value={"ok": True}))
+        assert job["status"] == QUEUED and "result" not in job
+        done = await manager.wait(job["job_id"])
+        assert done["status"] == SUCCEEDED
+        assert done["result"] == {"ok": True}
+        assert manager.status(job["job_id"])["finished_at"]
+
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self, tmp_path):
+        manager = JobManager(tmp_path / "jobs.json")
+        job = manager.submit("tool", {}, AsyncMock(side_effect=RuntimeError("upstream 503")))
+        done = await manager.wait(job["job_id"])
+        assert done["status"] == FAILED
+        assert done["error"] == "upstream 503"
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_is_bounded(self, tmp_path):
+        manager = JobManager(tmp_path / "jobs.json", workers=2)
+        active = peak = 0
+
+        async def work():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        ids = [manager.submit("tool", {}, work)["job_id"] for _ in range(6)]
+        await asyncio.gather(*(manager.wait(job_id) for job_id in ids))
+        assert peak == 2
+        assert not manager.active
+
+    @pytest.mark.asyncio
+    async def test_restart_reports_interrupted_jobs(self, tmp_path):
+        path = tmp_path / "jobs.json"
+        manager = JobManager(path)
+        finished = manager.submit("tool", {}, AsyncMock(return_value=1))["job_id"]
+        await manager.wait(finished)
+        pending = manager.submit("tool", {}, asyncio.Event().wait)["job_id"]
+        await asyncio.sleep(0)
+
+        restarted = JobManager(path)
+        assert restarted.status(finished)["status"] == SUCCEEDED
+        assert restarted.status(pending)["status"] == INTERRUPTED
+        assert json.loads(path.read_text())[pending]["status"] == INTERRUPTED
+        with pytest.raises(ValueError, match="Unknown job"):
+            restarted.status("missing")
+
+    @pytest.mark.asyncio
+    async def test_shared_file_keeps_other_processes_jobs(self, tmp_path):
+        path = tmp_path / "jobs.json"
+        other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            def record(job_id, pid, status="running"):
+                return {"job_id": job_id, "tool": "tool", "pid": pid, "arguments": {}, "status": status,
+                        "created_at": "", "started_at": "", "finished_at": None, "error": None, "result": None}
+            path.write_text(json.dumps({"live": record("live", other.pid), "gone": record("gone", 2**22 + 1)}))
+
+            manager = JobManager(path)
+            assert manager.status("live")["status"] == "running"
+            assert manager.status("gone")["status"] == INTERRUPTED
+
+            # The other process finishes its job while this one submits and saves its own.
+            on_disk = json.loads(path.read_text())
+            on_disk["live"].update(status=SUCCEEDED, result=42)
+            path.write_text(json.dumps(on_disk))
+            mine = manager.submit("tool", {}, AsyncMock(return_value=1))["job_id"]
+            await manager.wait(mine)
+            saved = json.loads(path.read_text())
+            assert saved["live"]["result"] == 42 and saved[mine]["status"] == SUCCEEDED
+            assert manager.result("live")["result"] == 42
+        finally:
+            other.kill()
+            other.wait()
+
+
+class TestJobTools:
+    """Test the job-backed tools through the server."""
+
+    @pytest.mark.asyncio
+    async def test_splitlink_returns_job_then_result(self, tmp_path):
+        manager = JobManager(tmp_path / "jobs.json")
+        with patch.object(server, "_job_manager", manager), \
+                patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+            mock_client_class.return_value.generate_data_package_splitlink = AsyncMock(
+                return_value=["https://example.com/part0", "https://example.com/part1"]
+            )
+            content = await server.handle_call_tool("generate_data_package_splitlink", {
+                "email": "user@example.com", "datatype": "rainfall",
+            })
+            job = json.loads(content[0].text)
+            assert job["tool"] == "generate_data_package_splitlink"
+            await manager.wait(job["job_id"])
+
+            status = json.loads((await server.handle_call_tool(
+                "get_job_status", {"job_id": job["job_id"]}))[0].text)
+            result = json.loads((await server.handle_call_tool(
+                "get_job_result", {"job_id": job["job_id"]}))[0].text)
+        assert status["status"] == SUCCEEDED
+        assert result["result"] == ["https://example.com/part0", "https://example.com/part1"]
@@ -0,0 +1,135 @@
+"""Tests for columnar mesonet reshaping."""
+
+import json
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server.mesonet_frame import MesonetFrame, parse_values
+from hcdp_mcp_server.server import handle_call_tool
+
+
+def measurement(station, variable, timestamp, value, flag=0):
+    return {"timestamp": timestamp, "station_id": station, "variable": variable, "value": value, "flag": flag}
+
+
+ROWS = [
+    measurement("0201", "Tair_1_Avg", "2024-12-01T10:05:00.000Z", "21.5"),
+    measurement("0115", "Tair_1_Avg", "2024-12-01T10:00:00.000Z", "20.0"),
+    measurement("0115", "Tair_1_Avg", "2024-12-01T10:05:00.000Z", "20.5"),
+    measurement("0115", "RF_1_Tot300s", "2024-12-01T10:00:00.000Z", "0.254"),
+]
+
+
+class TestMesonetFrame:
+    """Test parsing, filtering, resampling and pivots."""
+
+    def test_parse_values_in_bulk(self):
+        assert parse_values(["1.5", "2", 3]).tolist() == [1.5, 2.0, 3.0]
+        parsed = parse_values(["1.5", None, "", "NAN", "bad"])
+        assert parsed[0] == 1.5 and np.isnan(parsed[1:]).all()
+
+    def test_columns(self):
+        frame = MesonetFrame.from_rows(ROWS)
+        assert len(frame) == 4
+        assert frame.station_ids == ["0115", "0201"] and frame.variable_ids == ["RF_1_Tot300s", "Tair_1_Avg"]
+        assert frame.stations.tolist() == [1, 0, 0, 0] and frame.values.dtype == np.float64
+
+    def test_pivot_by_variable(self):
+        wide = MesonetFrame.from_rows(ROWS).pivot("variable")
+        assert wide["timestamps"] == ["2024-12-01T10:00:00.000Z", "2024-12-01T10:05:00.000Z"]
+        assert wide["data"]["Tair_1_Avg"] == {"stations": ["0115", "0201"], "values": [[20.0, 20.5], [None, 21.5]]}
+        assert wide["data"]["RF_1_Tot300s"] == {"stations": ["0115"], "values": [[0.254, None]]}
+
+    def test_pivot_by_station(self):
+        wide = MesonetFrame.from_rows(ROWS).pivot("station")
+        assert wide["data"]["0115"] == {"variables": ["RF_1_Tot300s", "Tair_1_Avg"],
+                                        "values": [[0.254, 20.0], [None, 20.5]]}
+        assert wide["data"]["0201"] == {"variables": ["Tair_1_Avg"], "values": [[None], [21.5]]}
+
+    def test_pivot_empty_and_unknown(self):
+        assert MesonetFrame.from_rows([]).pivot() == {"pivot": "variable", "timestamps": [], "data": {}}
+        with pytest.raises(ValueError):
+            MesonetFrame.from_rows(ROWS).pivot("time")
+
+    def test_resample_per_station_and_variable(self):
+        rows = [measurement("0115", "Tair_1_Avg", f"2024-12-01T{h:02d}:{m:02d}:00.000Z", str(h + m / 60))
+                for h in range(24) for m in range(0, 60, 5)]
+        rows += [measurement("0201", "Tair_1_Avg", "2024-12-01T23:55:00.000Z", "30.0"),
+                 measurement("0201", "Tair_1_Avg", "2024-12-02T00:00:00.000Z", "31.0")]
+        daily = MesonetFrame.from_rows(rows).resample("day", "max").to_rows()
+        assert len(daily) == 3
+        assert daily[0] == {"timestamp": "2024-12-01T00:00:00.000Z", "station_id": "0115",
+                            "variable": "Tair_1_Avg", "value": 23 + 55 / 60, "flagged": 0, "count": 288}
+        assert [(r["station_id"], r["value"]) for r in daily[1:]] == [("0201", 30.0), ("0201", 31.0)]
+        hourly = MesonetFrame.from_rows(rows).resample("hour", "count")
+        assert len(hourly) == 26 and hourly.counts[:24].tolist() == [12] * 24
+
+    def test_resample_skips_flagged_values(self):
+        rows = [measurement("0115", "Tair_1_Avg", "2024-12-01T10:00:00Z", "20"),
+                measurement("0115", "Tair_1_Avg", "2024-12-01T10:05:00Z", "99", flag=1),
+                measurement("0115", "Tair_1_Avg", "2024-12-01T10:10:00Z", "22"),
+                measurement("0115", "RH_1_Avg", "2024-12-01T10:00:00Z", "80", flag=2)]
+        frame = MesonetFrame.from_rows(rows)
+        hourly = {r["variable"]: r for r in frame.resample("hour", "last").to_rows()}
+        assert hourly["Tair_1_Avg"]["value"] == 22.0 and hourly["Tair_1_Avg"]["flagged"] == 1
+        assert hourly["RH_1_Avg"]["value"] is None and hourly["RH_1_Avg"]["count"] == 0
+        assert frame.resample("hour", "max", include_flagged=True).values.tolist() == [80.0, 99.0]
+
+    def test_resample_rejects_unknown_frequency(self):
+        with pytest.raises(ValueError):
+            MesonetFrame.from_rows(ROWS).resample("fortnight")
+        assert len(MesonetFrame.from_rows(ROWS).resample("15m")) == 3
+
+    def test_weeks_start_on_monday(self):
+        # 2024-12-01 is a Sunday and 2024-12-02 a Monday.
+        rows = [measurement("0115", "Tair_1_Avg", f"2024-12-0{d}T12:00:00.000Z", str(d)) for d in (1, 2, 8)]
+        weekly = MesonetFrame.from_rows(rows).resample("week", "count").to_rows()
+        assert [(r["timestamp"], r["count"]) for r in weekly] == [
+            ("2024-11-25T00:00:00.000Z", 1), ("2024-12-02T00:00:00.000Z", 2)
+        ]
+
+    def test_mask_by_flag_range_and_pattern(self):
+        rows = ROWS + [measurement("0115", "Tair_2_Avg", "2024-12-01T10:00:00.000Z", "NAN", flag=None),
+                       measurement("0201", "Tair_1_Avg", "2024-12-01T10:10:00.000Z", "85.0", flag=3)]
+        frame = MesonetFrame.from_rows(rows)
+        assert frame.mask(flags=[0]).tolist() == [True, True, True, True, False, False]
+        assert frame.mask(min_value=1, max_value=50).tolist() == [True, True, True, False, False, False]
+        assert frame.mask(var_pattern="Tair_*", flags=[0, 3]).tolist() == [True, True, True, False, False, True]
+        kept = frame.select(frame.mask(var_pattern="Tair_2*"))
+        assert len(kept) == 1 and kept.flags.tolist() == [-1]
+
+    @pytest.mark.asyncio
+    async def test_tool_filters_keep_original_rows(self):
+        rows = ROWS + [measurement("0201", "Tair_1_Avg", "2024-12-01T10:10:00.000Z", "85.0", flag=3)]
+        with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+            mock_client_class.return_value.get_mesonet_data = AsyncMock(return_value=rows)
+            content = await handle_call_tool("get_mesonet_data", {
+                "start_date": "2024-12-01", "flags": "0", "var_pattern": "Tair*", "min_value": 20.2
+            })
+            resampled = await handle_call_tool("get_mesonet_data", {
+                "start_date": "2024-12-01", "max_value": 21, "resample": "day", "aggregate": "count"
+            })
+        assert json.loads(content[0].text) == [ROWS[0], ROWS[2]]
+        assert [r["value"] for r in json.loads(resampled[0].text)] == [1, 2]
+        assert "flags" not in mock_client_class.return_value.get_mesonet_data.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_tool_resamples_then_pivots(self):
+        with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+            mock_client_class.return_value.get_mesonet_data = AsyncMock(return_value=ROWS)
+            content = await handle_call_tool("get_mesonet_data", {
+                "start_date": "2024-12-01", "resample": "hour", "pivot": "variable"
+            })
+        wide = json.loads(content[0].text)
+        assert wide["timestamps"] == ["2024-12-01T10:00:00.000Z"]
+        assert wide["data"]["Tair_1_Avg"]["values"] == [[20.25], [21.5]]
+        assert "resample" not in mock_client_class.return_value.get_mesonet_data.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_tool_pivots_before_serialization(self):
+        with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+            mock_client_class.return_value.get_mesonet_data = AsyncMock(return_value=ROWS)
+            content = await handle_call_tool("get_mesonet_data", {"start_date": "2024-12-01", "pivot": "station"})
+        assert json.loads(content[0].text)["data"]["0201"]["values"] == [[None], [21.5]]
+        assert "pivot" not in mock_client_class.return_value.get_mesonet_data.await_args.kwargs
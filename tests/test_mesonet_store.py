@@ -0,0 +1,135 @@
+"""Tests for the local mesonet measurement store."""
+
+import json
+import pytest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.mesonet_store import MesonetStore
+
+SAMPLE = json.loads((Path(__file__).parent.parent / "sample_data" / "mesonet_measurements_recent.json").read_text())
+
+
+def measurement(station, variable, timestamp, value="1.0"):
+    return {"timestamp": timestamp, "station_id": station, "variable": variable, "value": value, "flag": 0}
+
+
+def daily_rows(start_day, end_day, stations=("0115", "0201"), variables=("RF_1_Tot300s",)):
+    """One measurement per station, variable and day of December 2024."""
+    return [measurement(s, v, f"2024-12-{d:02d}T10:00:00.000Z", str(d))
+            for d in range(start_day, end_day + 1) for s in stations for v in variables]
+
+
+class FakeMesonetAPI:
+    """Answers /mesonet/db/measurements from a fixed set of rows, honouring paging."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def __call__(self, params):
+        self.calls.append(params)
+        rows = [r for r in self.rows if params["start_date"] <= r["timestamp"] < params["end_date"]]
+        if "station_ids" in params:
+            rows = [r for r in rows if r["station_id"] in params["station_ids"].split(",")]
+        offset, limit = params.get("offset", 0), params.get("limit")
+        return rows[offset:offset + limit] if limit else rows
+
+
+class TestMesonetStore:
+    """Test storage, coverage and queries."""
+
+    def test_round_trips_api_rows(self, tmp_path):
+        store = MesonetStore(tmp_path / "m.sqlite3")
+        assert store.insert(SAMPLE) == len(SAMPLE)
+        rows = store.query(None, None, date(2024, 12, 1), date(2024, 12, 3))
+        by_key = {(r["station_id"], r["variable"], r["timestamp"]): r for r in rows}
+        original = SAMPLE[0]
+        assert by_key[(original["station_id"], original["variable"], original["timestamp"])] == original
+
+    def test_query_filters_and_pages(self, tmp_path):
+        store = MesonetStore(tmp_path / "m.sqlite3")
+        store.insert(daily_rows(1, 10))
+        rows = store.query(["0201"], ["RF_1_Tot300s"], date(2024, 12, 3), date(2024, 12, 5), join_metadata=False)
+        assert [r["value"] for r in rows] == ["3", "4", "5"]
+        assert set(rows[0]) == {"timestamp", "station_id", "variable", "value", "flag"}
+        page = store.query(None, None, date(2024, 12, 1), date(2024, 12, 10), limit=4, offset=2)
+        assert [(r["timestamp"][8:10], r["station_id"]) for r in page] == [
+            ("02", "0115"), ("02", "0201"), ("03", "0115"), ("03", "0201")
+        ]
+
+    def test_coverage_per_pair_and_wildcards(self, tmp_path):
+        store = MesonetStore(tmp_path / "m.sqlite3")
+        store.mark(["0115"], ["RF"], date(2024, 12, 1), date(2024, 12, 10))
+        assert store.missing(["0115"], ["RF"], date(2024, 12, 5), date(2024, 12, 12)) == [
+            (date(2024, 12, 11), date(2024, 12, 12))
+        ]
+        assert store.missing(["0115", "0201"], ["RF"], date(2024, 12, 5), date(2024, 12, 6)) == [
+            (date(2024, 12, 5), date(2024, 12, 6))
+        ]
+        store.mark(None, None, date(2024, 12, 1), date(2024, 12, 31))
+        assert store.missing(["0201"], ["Tair"], date(2024, 12, 5), date(2024, 12, 6)) == []
+
+    def test_persists_across_connections(self, tmp_path):
+        MesonetStore(tmp_path / "m.sqlite3").insert(daily_rows(1, 2))
+        assert len(MesonetStore(tmp_path / "m.sqlite3")) == 4
+
+
+class TestClientMesonetStore:
+    """Test answering get_mesonet_data from the store."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_only_missing_days(self, tmp_path, mock_env_vars):
+        api = FakeMesonetAPI(daily_rows(1, 31))
+        client = HCDPClient(mesonet_store=MesonetStore(tmp_path / "m.sqlite3"))
+        with patch.object(client, "_fetch_mesonet", api):
+            first = await client.get_mesonet_data(station_ids="0115,0201", start_date="2024-12-01", end_date="2024-12-10")
+            again = await client.get_mesonet_data(station_ids="0201", start_date="2024-12-03", end_date="2024-12-04")
+            wider = await client.get_mesonet_data(station_ids="0115,0201", start_date="2024-12-05", end_date="2024-12-15")
+
+        assert len(first) == 20 and len(again) == 2 and len(wider) == 22
+        windows = [(c["start_date"], c["end_date"]) for c in api.calls]
+        assert windows == [("2024-12-01", "2024-12-11"), ("2024-12-11", "2024-12-16")]
+
+    @pytest.mark.asyncio
+    async def test_follows_pages_when_filling(self, tmp_path, mock_env_vars):
+        api = FakeMesonetAPI(daily_rows(1, 5))
+        client = HCDPClient(mesonet_store=MesonetStore(tmp_path / "m.sqlite3"))
+        with patch.object(client, "_fetch_mesonet", api), \
+                patch.dict("os.environ", {"HCDP_MESONET_PAGE_SIZE": "4"}):
+            rows = await client.get_mesonet_data(station_ids="0115,0201", start_date="2024-12-01",
+                                                 end_date="2024-12-05", limit=3)
+        assert [c["offset"] for c in api.calls] == [0, 4, 8]
+        assert len(rows) == 3
+
+    @pytest.mark.asyncio
+    async def test_current_day_is_fetched_again(self, tmp_path, mock_env_vars):
+        api = FakeMesonetAPI(daily_rows(1, 4))
+        client = HCDPClient(mesonet_store=MesonetStore(tmp_path / "m.sqlite3"))
+        with patch.object(client, "_fetch_mesonet", api), \
+                patch("hcdp_mcp_server.client._utc_today", return_value=date(2024, 12, 5)):
+            first = await client.get_mesonet_data(station_ids="0115", start_date="2024-12-01", end_date="2024-12-05")
+            api.rows += daily_rows(5, 5)
+            second = await client.get_mesonet_data(station_ids="0115", start_date="2024-12-01", end_date="2024-12-05")
+        assert len(first) == 4 and len(second) == 5
+        windows = [(c["start_date"], c["end_date"]) for c in api.calls]
+        assert windows == [("2024-12-01", "2024-12-06"), ("2024-12-05", "2024-12-06")]
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_queries_go_to_the_api(self, tmp_path, mock_env_vars):
+        api = FakeMesonetAPI(daily_rows(1, 31))
+        client = HCDPClient(mesonet_store=MesonetStore(tmp_path / "m.sqlite3"))
+        with patch.object(client, "_fetch_mesonet", api):
+            await client.get_mesonet_data(start_date="2024-12-01", end_date="2024-12-20", limit=5)
+        assert api.calls == [{"location": "hawaii", "join_metadata": "true", "start_date": "2024-12-01",
+                              "end_date": "2024-12-20", "limit": 5}]
+
+    @pytest.mark.asyncio
+    async def test_unbounded_queries_go_to_the_api(self, tmp_path, mock_env_vars):
+        api = FakeMesonetAPI([])
+        client = HCDPClient(mesonet_store=MesonetStore(tmp_path / "m.sqlite3"))
+        with patch.object(client, "_fetch_mesonet", api):
+            await client.get_mesonet_data(station_ids="0115", limit=10)
+        assert api.calls == [{"location": "hawaii", "join_metadata": "true", "station_ids": "0115", "limit": 10}]
@@ -0,0 +1,122 @@
+"""Tests for incremental mesonet sync."""
+
+import pytest
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+from hcdp_mcp_server import server
+from hcdp_mcp_server.mesonet_store import MesonetStore
+from hcdp_mcp_server.mesonet_sync import MesonetSync, lag_report
+
+NOW = datetime(2024, 12, 3, 12, 0, tzinfo=timezone.utc)
+
+
+def measurement(station, timestamp, value="1.0"):
+    return {"timestamp": timestamp, "station_id": station, "variable": "Tair_1_Avg", "value": value, "flag": 0}
+
+
+class FakeClient:
+    """Serves measurements at or after ``start_date`` for the requested stations."""
+
+    def __init__(self, rows, stations=None, broken=()):
+        self.rows = rows
+        self.stations = stations or []
+        self.broken = set(broken)
+        self.calls = []
+
+    async def get_mesonet_stations(self):
+        return self.stations
+
+    async def get_mesonet_data(self, station_ids, start_date, limit, offset):
+        self.calls.append((station_ids, start_date, offset))
+        ids = station_ids.split(",")
+        if self.broken & set(ids):
+            raise RuntimeError("upstream error")
+        rows = [r for r in self.rows if r["station_id"] in ids and r["timestamp"] >= start_date]
+        return rows[offset:offset + limit]
+
+
+class TestMesonetSync:
+    """Test cursors, batching, coverage and lag."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_only_newer_measurements(self, tmp_path):
+        store = MesonetStore(tmp_path / "m.sqlite3")
+        store.insert([measurement("0115", "2024-12-03T08:00:00.000Z")])
+        client = FakeClient([
+            measurement("0115", "2024-12-03T08:00:00.000Z"),
+            measurement("0115", "2024-12-03T11:00:00.000Z"),
+            measurement("0201", "2024-12-02T06:00:00.000Z"),
+        ])
+        sync = MesonetSync(client, store, stations=["0115", "0201"], batch_size=1)
+
+        report = await sync.sync_once(now=NOW)
+
+        assert sorted(client.calls) == [("0115", "2024-12-03T08:00:00.000Z", 0), ("0201", "2024-12-02", 0)]
+        assert report["rows"] == 3 and report["batches"] == 2 and report["errors"] == []
+        assert report["lag"]["0115"] == {"latest": "2024-12-03T11:00:00.000Z", "lag_seconds": 3600}
+        assert report["max_lag_seconds"] == 30 * 3600
+
+    @pytest.mark.asyncio
+    async def test_batches_stations_with_similar_cursors(self, tmp_path):
+        store = MesonetStore(tmp_path / "m.sqlite3")
+        store.insert([measurement("a", "2024-12-03T01:00:00Z"), measurement("c", "2024-12-03T02:00:00Z")])
+        client = FakeClient([], stations=[
+            {"station_id": s, "status": "active"} for s in ("a", "b", "c", "d")
+        ] + [{"station_id": "x", "status": "inactive"}])
+        sync = MesonetSync(client, store, batch_size=2, page_size=5)
+
+        report = await sync.sync_once(now=NOW)
+
+        assert client.calls == [("b,d", "2024-12-02", 0), ("a,c", "2024-12-03T01:00:00Z", 0)]
+        assert report["stations"] == 4
+
+    @pytest.mark.asyncio
+    async def test_pages_and_marks_whole_days(self, tmp_path):
+        store = MesonetStore(tmp_path / "m.sqlite3")
+        rows = [measurement("0115", f"2024-12-0{d}T{h:02d}:00:00Z") for d in (1, 2, 3) for h in range(0, 24, 6)]
+        client = FakeClient(rows)
+        sync = MesonetSync(client, store, stations=["0115"], lookback_days=2, page_size=5)
+
+        report = await sync.sync_once(now=NOW)
+
+        assert [c[2] for c in client.calls] == [0, 5, 10]
+        assert report["rows"] == 12 and len(store) == 12
+        assert store.missing(["0115"], ["Tair_1_Avg"], date(2024, 12, 1), date(2024, 12, 3)) == [
+            (date(2024, 12, 3), date(2024, 12, 3))
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_does_not_stop_others(self, tmp_path):
+        store = MesonetStore(tmp_path / "m.sqlite3")
+        client = FakeClient([measurement("ok", "2024-12-03T10:00:00Z")], broken={"bad"})
+        sync = MesonetSync(client, store, stations=["bad", "ok"], batch_size=1)
+
+        report = await sync.sync_once(now=NOW)
+
+        assert report["errors"] == [{"stations": ["bad"], "error": "upstream error"}]
+        assert report["rows"] == 1
+        assert report["lag"]["bad"] == {"latest": None, "lag_seconds": None}
+
+    @pytest.mark.asyncio
+    async def test_run_reports_each_cycle(self, tmp_path):
+        reports = []
+        sync = MesonetSync(FakeClient([]), MesonetStore(tmp_path / "m.sqlite3"), stations=["0115"], interval=0)
+        await sync.run(cycles=2, on_cycle=reports.append)
+        assert len(reports) == 2 and reports[0]["rows"] == 0
+
+
+def test_lag_report_summary():
+    report = lag_report({"a": "2024-12-03T11:00:00Z", "b": "2024-12-03T09:00:00", "c": None}, NOW)
+    assert report["synced"] == 2 and report["never_synced"] == 1
+    assert report["max_lag_seconds"] == 10800 and report["median_lag_seconds"] == 7200
+
+
+@pytest.mark.asyncio
+async def test_sync_status_tool_reads_the_store(tmp_path):
+    store = MesonetStore(tmp_path / "m.sqlite3")
+    store.insert([measurement("0115", "2024-12-03T11:00:00Z")])
+    with patch.object(server, "mesonet_store", return_value=store):
+        status = await server.get_mesonet_sync_status(server.GetMesonetSyncStatusArgs(station_ids="0115,0201"))
+    assert status["enabled"] and status["synced"] == 1 and status["never_synced"] == 1
+    assert status["stations"]["0115"]["latest"] == "2024-12-03T11:00:00Z"
@@ -0,0 +1,63 @@
+"""Tests for the local mock HCDP API used by the benchmarks."""
+
+import httpx
+import pytest
+import zipfile
+from unittest.mock import patch
+
+from benchmarks.mock_api import MockConfig, build_app
+from hcdp_mcp_server.client import HCDPClient
+
+BASE_URL = "http://mock"
+
+
+def mock_client(app):
+    """An HCDPClient whose requests go to ``app`` in-process."""
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    return HCDPClient(api_token="mock", base_url=BASE_URL), patch(
+        "hcdp_mcp_server.client.get_http_client", return_value=http
+    )
+
+
+class TestMockApi:
+    """Test the client against the replayed fixtures."""
+
+    @pytest.mark.asyncio
+    async def test_serves_every_endpoint_family(self, tmp_path):
+        client, http = mock_client(build_app(MockConfig(rows=500, files=24)))
+        with http:
+            raster = await client.get_raster_data("rainfall", "2024-11", "statewide")
+            series = await client.get_timeseries_data("rainfall", "2024-03", "2024-05", "bi", lat=19.7, lng=-155.1)
+            variables = await client.get_mesonet_variables()
+            monitor = await client.get_mesonet_station_monitor()
+            listing = await client.list_production_files("rainfall", period="month", extent="bi")
+            link = await client.generate_data_package_instant_link("a@b.c", "rainfall")
+            package = await client.download_instant_content("a@b.c", "rainfall", str(tmp_path / "p.zip"),
+                                                            ingest=False)
+        assert raster["data"][:2] in (b"II", b"MM")
+        assert len(series) == 3 and len(variables) == 285 and len(monitor) == 103
+        assert len(listing) == 24 and listing[0].endswith("_2024_12.tif")
+        assert link.endswith("/mock/package.zip")
+        assert zipfile.is_zipfile(tmp_path / "p.zip") and package
+
+    @pytest.mark.asyncio
+    async def test_paginates_and_filters_measurements(self):
+        app = build_app(MockConfig(rows=1000, max_limit=150))
+        client, http = mock_client(app)
+        with http:
+            first = await client.get_mesonet_data(limit=400)
+            second = await client.get_mesonet_data(limit=400, offset=900)
+            station = await client.get_mesonet_data(station_ids="0115")
+        assert len(first) == 150 and len(second) == 100
+        assert first[0]["timestamp"] > first[-1]["timestamp"]
+        assert station and {r["station_id"] for r in station} == {"0115"}
+        assert app.state.stats["requests"]["/mesonet/db/measurements"] == 3
+
+    @pytest.mark.asyncio
+    async def test_injects_errors_and_counts_them(self):
+        app = build_app(MockConfig(error_rate=1.0, error_status=502))
+        client, http = mock_client(app)
+        with http, pytest.raises(httpx.HTTPStatusError) as error:
+            await client.get_mesonet_stations()
+        assert error.value.response.status_code == 502
+        assert app.state.stats["errors"]["/mesonet/db/stations"] == 1
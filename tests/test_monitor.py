@@ -0,0 +1,76 @@
+"""Tests for the station monitor change feed."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.monitor import MonitorCache, MonitorFeed, station_records
+
+
+def snapshot(**statuses):
+    return [{"station_id": s, "status": status, "last_report": "2024-12-03T10:00:00Z"}
+            for s, status in statuses.items()]
+
+
+class TestMonitorFeed:
+    """Test diffing and version tokens."""
+
+    def test_response_shapes(self):
+        rows = snapshot(a="ok")
+        assert station_records(rows) == {"a": rows[0]}
+        assert station_records({"data": rows}) == {"a": rows[0]}
+        assert station_records({"a": {"status": "ok"}}) == {"a": {"status": "ok"}}
+        with pytest.raises(ValueError):
+            station_records({"message": "nope"})
+
+    def test_reports_only_changes_since_token(self):
+        feed = MonitorFeed()
+        feed.update(snapshot(a="ok", b="ok", c="ok"))
+        first = feed.changes()
+        assert first["full"] and set(first["changed"]) == {"a", "b", "c"}
+
+        assert feed.update(snapshot(a="ok", b="ok", c="ok")) == []
+        assert feed.changes(first["version"]) == {
+            "version": first["version"], "full": False, "changed": {}, "removed": [], "unchanged": 3
+        }
+
+        feed.update(snapshot(a="ok", b="down", c="ok"))
+        feed.update(snapshot(a="ok", b="down"))
+        since_first = feed.changes(first["version"])
+        assert list(since_first["changed"]) == ["b"] and since_first["removed"] == ["c"]
+        assert since_first["unchanged"] == 1
+        assert feed.changes(since_first["version"])["changed"] == {}
+
+    def test_unknown_or_expired_tokens_get_full_snapshot(self):
+        feed = MonitorFeed(history=2)
+        feed.update(snapshot(a="ok"))
+        token = feed.token
+        assert MonitorFeed().changes(token)["full"]
+        assert feed.changes("garbage")["full"]
+        for status in ("1", "2", "3"):
+            feed.update(snapshot(a=status))
+        assert feed.changes(token)["full"]
+
+
+class TestClientMonitorChanges:
+    """Test polling through the client."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_snapshot_within_ttl(self, mock_env_vars):
+        client = HCDPClient(monitor_cache=MonitorCache(ttl=60))
+        fetch = AsyncMock(return_value=snapshot(a="ok", b="ok"))
+        with patch.object(client, "_fetch_station_monitor", fetch):
+            first = await client.get_station_monitor_changes()
+            assert await client.get_mesonet_station_monitor() == fetch.return_value
+            fetch.return_value = snapshot(a="ok", b="down")
+            with patch("hcdp_mcp_server.monitor.time.monotonic", return_value=1e12):
+                second = await client.get_station_monitor_changes(first["version"])
+        assert fetch.await_count == 2
+        assert list(second["changed"]) == ["b"] and second["unchanged"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_snapshot_without_cache(self, mock_env_vars):
+        client = HCDPClient()
+        with patch.object(client, "_fetch_station_monitor", AsyncMock(return_value=snapshot(a="ok"))):
+            result = await client.get_station_monitor_changes(since="stale-1")
+        assert result["full"] and list(result["changed"]) == ["a"]
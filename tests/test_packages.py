@@ -0,0 +1,187 @@
+"""Tests for the production file cache and local package assembly."""
+
+import zipfile
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.file_cache import FileCache
+from hcdp_mcp_server.naming import parse_production_name
+from hcdp_mcp_server.packages import build_package, index_package
+from hcdp_mcp_server.raster_cache import RasterCache
+
+PREFIX = "/production/rainfall/new/month/bi/data_map"
+FILES = [f"{PREFIX}/2024/rainfall_new_month_bi_data_map_2024_{m:02d}.tif" for m in range(1, 7)]
+
+
+class TestNaming:
+    """Test production file name parsing."""
+
+    def test_monthly_name(self):
+        parsed = parse_production_name(FILES[2])
+        assert parsed.datatype == "rainfall"
+        assert parsed.date == "2024-03"
+        assert parsed.ext == "tif"
+
+    def test_multi_word_datatype_and_daily_date(self):
+        parsed = parse_production_name("temp_mean_day_statewide_data_map_2023_07_15.tif")
+        assert parsed.datatype == "temp_mean"
+        assert parsed.date == "2023-07-15"
+
+    def test_undated_name(self):
+        assert parse_production_name("readme.txt") is None
+
+
+class TestFileCache:
+    """Test the on-disk file cache."""
+
+    def test_put_get(self, tmp_path):
+        cache = FileCache(tmp_path)
+        path = cache.put(FILES[0], b"tiff")
+        assert FILES[0] in cache
+        assert cache.get(FILES[0]) == path and path.read_bytes() == b"tiff"
+        assert path.suffix == ".tif"
+        assert cache.get(FILES[1]) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = FileCache(tmp_path, max_bytes=25)
+        cache.put(FILES[0], b"a" * 10)
+        cache.put(FILES[1], b"b" * 10)
+        cache._index[cache.path_for(FILES[0])] = (10, 0.0)
+        cache.put(FILES[2], b"c" * 10)
+        assert FILES[0] not in cache
+        assert FILES[1] in cache and FILES[2] in cache
+        assert cache.size == 20
+
+    def test_index_rebuilt_from_disk(self, tmp_path):
+        FileCache(tmp_path).put(FILES[0], b"a" * 10)
+        assert FileCache(tmp_path).size == 10
+
+
+class TestBuildPackage:
+    """Test local zip assembly."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_only_missing_files(self, tmp_path):
+        cache = FileCache(tmp_path / "cache")
+        cache.put(FILES[0], b"cached")
+        fetch = AsyncMock(side_effect=lambda path: path.encode())
+
+        summary = await build_package(FILES[:3], cache, fetch, tmp_path / "pkg.zip", compression="deflate")
+
+        assert sorted(c.args[0] for c in fetch.call_args_list) == FILES[1:3]
+        assert summary["from_cache"] == 1 and summary["fetched"] == 2
+        with zipfile.ZipFile(tmp_path / "pkg.zip") as zf:
+            assert zf.namelist() == [f.rsplit("/", 1)[1] for f in FILES[:3]]
+            assert zf.read(zf.namelist()[0]) == b"cached"
+            assert zf.getinfo(zf.namelist()[1]).compress_type == zipfile.ZIP_DEFLATED
+
+        fetch.reset_mock()
+        await build_package(FILES[:3], cache, fetch, tmp_path / "again.zip")
+        fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_package_larger_than_cache(self, tmp_path):
+        cache = FileCache(tmp_path / "cache", max_bytes=150)
+        cache.put(FILES[0], b"a" * 100)
+        fetch = AsyncMock(side_effect=lambda path: b"b" * 100)
+        summary = await build_package(FILES[:2], cache, fetch, tmp_path / "pkg.zip")
+        assert summary["files"] == 2
+        with zipfile.ZipFile(tmp_path / "pkg.zip") as zf:
+            assert [len(zf.read(n)) for n in zf.namelist()] == [100, 100]
+        assert cache.size <= 150
+
+    @pytest.mark.asyncio
+    async def test_duplicate_basenames_keep_paths(self, tmp_path):
+        files = ["/a/x_2024_01.tif", "/b/x_2024_01.tif"]
+        fetch = AsyncMock(return_value=b"data")
+        await build_package(files, FileCache(tmp_path / "cache"), fetch, tmp_path / "pkg.zip")
+        with zipfile.ZipFile(tmp_path / "pkg.zip") as zf:
+            assert zf.namelist() == ["a/x_2024_01.tif", "b/x_2024_01.tif"]
+
+
+class TestClientFileCache:
+    """Test the client's use of the file cache."""
+
+    @pytest.mark.asyncio
+    async def test_retrieve_uses_cache(self, tmp_path, mock_env_vars):
+        client = HCDPClient(file_cache=FileCache(tmp_path))
+        with patch.object(client, "_fetch_production_file", AsyncMock(return_value=b"tiff")) as fetch:
+            assert await client.retrieve_production_file(FILES[0]) == {"data": b"tiff"}
+            assert await client.retrieve_production_file(FILES[0]) == {"data": b"tiff"}
+        fetch.assert_awaited_once_with(FILES[0])
+
+    @pytest.mark.asyncio
+    async def test_build_data_package_filters_listing(self, tmp_path, mock_env_vars):
+        client = HCDPClient(file_cache=FileCache(tmp_path / "cache"))
+        with patch.object(client, "_fetch_production_list", AsyncMock(return_value={"files": FILES})), \
+                patch.object(client, "_fetch_production_file", AsyncMock(return_value=b"tiff")):
+            summary = await client.build_data_package(
+                "rainfall", str(tmp_path / "pkg.zip"), start_date="2024-05"
+            )
+        assert summary["files"] == 2
+
+    @pytest.mark.asyncio
+    async def test_build_data_package_with_no_matches(self, tmp_path, mock_env_vars):
+        client = HCDPClient(file_cache=FileCache(tmp_path))
+        with patch.object(client, "_fetch_production_list", AsyncMock(return_value={"files": FILES})):
+            with pytest.raises(ValueError, match="No production files"):
+                await client.build_data_package("rainfall", str(tmp_path / "pkg.zip"), start_date="2030")
+
+
+def make_zip(path, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path.read_bytes()
+
+
+class TestInstantContentIndex:
+    """Test streaming instant package content to disk and warming the raster cache."""
+
+    MEMBERS = {
+        "rainfall_new_month_bi_data_map_2024_10.tif": b"october",
+        "rainfall_new_month_bi_se_map_2024_10.tif": b"error map",
+        "metadata.txt": b"about",
+    }
+
+    def test_map_key_matches_raster_query(self, tmp_path):
+        cache = RasterCache(FileCache(tmp_path))
+        make_zip(tmp_path / "p.zip", self.MEMBERS)
+        index = index_package(tmp_path / "p.zip", cache)
+        assert index["ingested"] == 1
+        assert [m["cached"] for m in index["members"]] == [True, False, False]
+        assert index["members"][0]["date"] == "2024-10"
+        key = cache.key("rainfall", "2024-10-15", "bi", production="new", period="month")
+        assert cache.get(key).read_bytes() == b"october"
+
+    def test_period_is_part_of_the_key(self):
+        assert RasterCache.key("rainfall", "2024-12-15", "statewide") != \
+            RasterCache.key("rainfall", "2024-12-15", "statewide", period="day")
+        assert RasterCache.key("rainfall", "2024-12", "bi", period="month") != \
+            RasterCache.key("rainfall", "2024-12", "bi", period="year")
+
+    @pytest.mark.asyncio
+    async def test_download_then_raster_served_from_cache(self, tmp_path, mock_env_vars):
+        body = make_zip(tmp_path / "src.zip", self.MEMBERS)
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(200, content=body, headers={"content-type": "application/zip"})
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = HCDPClient(file_cache=FileCache(tmp_path / "cache"))
+        with patch("hcdp_mcp_server.client.get_http_client", return_value=http):
+            index = await client.download_instant_content(
+                "user@example.com", "rainfall", str(tmp_path / "pkg.zip"), production="new"
+            )
+            raster = await client.get_raster_data(
+                "rainfall", "2024-10", "bi", production="new", period="month"
+            )
+        await http.aclose()
+        assert (tmp_path / "pkg.zip").read_bytes() == body
+        assert len(index["members"]) == 3
+        assert raster == {"data": b"october"}
+        assert seen == ["/genzip/instant/content"]
@@ -0,0 +1,96 @@
+"""Tests for predictive raster prefetching."""
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from hcdp_mcp_server.client import HCDPClient, _throttle
+from hcdp_mcp_server.file_cache import FileCache
+from hcdp_mcp_server.prefetch import RasterPrefetcher, step_date
+
+
+def query(date, extent="bi"):
+    return {"datatype": "rainfall", "date": date, "extent": extent, "location": "hawaii",
+            "production": "new", "aggregation": None, "timescale": None, "period": "month"}
+
+
+class TestPrediction:
+    """Test date stepping and next-query prediction."""
+
+    def test_step_date(self):
+        assert step_date("2024-01", "month", -1) == "2023-12"
+        assert step_date("2024-12-15", "month", 1) == "2025-01"
+        assert step_date("2024-02-28", None, 2) == "2024-03-01"
+        assert step_date("2024", "year", -1) == "2023"
+        assert step_date("soon", None, 1) is None
+
+    def test_unknown_direction_predicts_both_neighbours(self):
+        prefetcher = RasterPrefetcher()
+        assert [q["date"] for q in prefetcher.predict(query("2024-12"))] == ["2024-11", "2025-01"]
+
+    def test_follows_walking_direction_and_siblings(self):
+        prefetcher = RasterPrefetcher(depth=3, siblings=["bi", "oa"])
+        prefetcher._history.append(query("2024-12"))
+        predicted = prefetcher.predict(query("2024-11"))
+        assert [q["date"] for q in predicted] == ["2024-10", "2024-09", "2024-08", "2024-11"]
+        assert predicted[-1]["extent"] == "oa"
+
+
+class TestScheduling:
+    """Test prefetch scheduling and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_prefetched_maps_count_as_prefetch_hits(self):
+        cache = set()
+        key_of = lambda q: f"{q['extent']}/{q['date']}"
+
+        async def fetch(q):
+            cache.add(key_of(q))
+
+        prefetcher = RasterPrefetcher(depth=1)
+        for date in ("2024-12", "2024-11", "2024-10"):
+            key = key_of(query(date))
+            prefetcher.observe(query(date), key, key in cache, fetch, key_of, cache.__contains__)
+            await prefetcher.drain()
+        metrics = prefetcher.metrics()
+        assert metrics["requests"] == 3 and metrics["hits"] == 2
+        assert metrics["prefetch_hits"] == 2
+        assert metrics["hit_rate"] == round(2 / 3, 3)
+
+    @pytest.mark.asyncio
+    async def test_skips_when_rate_limiter_has_no_spare_token(self):
+        fetch = AsyncMock()
+        prefetcher = RasterPrefetcher(reserve=lambda: False)
+        prefetcher.observe(query("2024-12"), "k", False, fetch, str, lambda k: False)
+        await prefetcher.drain()
+        fetch.assert_not_called()
+        assert prefetcher.metrics()["skipped_rate_limited"] == 1
+
+
+class TestClientPrefetch:
+    """Test prefetching through the client's raster cache."""
+
+    @pytest.mark.asyncio
+    async def test_walk_backwards_served_from_prefetch(self, tmp_path, mock_env_vars):
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.params["date"])
+            return httpx.Response(200, content=request.url.params["date"].encode(),
+                                  headers={"content-type": "image/tiff"})
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler), event_hooks={"request": [_throttle]})
+        limiter = Mock(acquire=AsyncMock(), try_acquire=Mock(return_value=True))
+        prefetcher = RasterPrefetcher(depth=1, reserve=limiter.try_acquire)
+        client = HCDPClient(file_cache=FileCache(tmp_path), prefetcher=prefetcher)
+        with patch("hcdp_mcp_server.client.get_http_client", return_value=http), \
+                patch("hcdp_mcp_server.client.get_rate_limiter", return_value=limiter):
+            for date in ("2024-12", "2024-11", "2024-10"):
+                result = await client.get_raster_data("rainfall", date, "bi", "hawaii", "new", period="month")
+                assert result == {"data": date.encode()}
+                await prefetcher.drain()
+        await http.aclose()
+        assert requested == ["2024-12", "2024-11", "2025-01", "2024-10", "2024-09"]
+        assert prefetcher.metrics()["prefetch_hits"] == 2
+        # Only the first request waited on the limiter; prefetches used spare tokens.
+        assert limiter.acquire.await_count == 1
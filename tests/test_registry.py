@@ -0,0 +1,117 @@
+"""Tests for the declarative tool registry."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from pydantic import BaseModel
+
+from hcdp_mcp_server.registry import ToolRegistry, ToolSpec
+from hcdp_mcp_server.server import TOOLS, GetTimeseriesArgs, handle_call_tool, handle_list_tools, registry
+
+
+class EchoArgs(BaseModel):
+    """Arguments for the test tool."""
+    value: int
+    local_only: bool = False
+
+
+class FakeClient:
+    """Client exposing one coroutine."""
+    async def echo(self, value):
+        return {"value": value}
+
+
+class TestToolRegistry:
+    """Test dispatch, schema caching and hooks."""
+
+    def build(self):
+        return ToolRegistry(
+            [ToolSpec(name="echo", description="Echo", args_model=EchoArgs,
+                      method="echo", exclude=frozenset({"local_only"}),
+                      postprocess=lambda args, result: {**result, "local_only": args.local_only})],
+            client_factory=FakeClient,
+        )
+
+    @pytest.mark.asyncio
+    async def test_call_validates_and_excludes_fields(self):
+        assert await self.build().call("echo", {"value": "3", "local_only": True}) == {
+            "value": 3, "local_only": True
+        }
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool(self):
+        with pytest.raises(ValueError, match="Unknown tool: nope"):
+            await self.build().call("nope", {})
+
+    def test_spec_requires_one_target(self):
+        with pytest.raises(ValueError):
+            ToolRegistry([ToolSpec(name="bad", description="", args_model=EchoArgs)], FakeClient)
+
+    @pytest.mark.asyncio
+    async def test_hooks_wrap_in_order(self):
+        reg = self.build()
+        seen = []
+
+        def hook(label):
+            async def run(spec, args, call_next):
+                seen.append(f"{label}>{spec.name}")
+                result = await call_next()
+                seen.append(f"<{label}")
+                return result
+            return run
+
+        reg.add_hook(hook("outer"))
+        reg.add_hook(hook("inner"))
+        await reg.call("echo", {"value": 1})
+        assert seen == ["outer>echo", "inner>echo", "<inner", "<outer"]
+
+    def test_schemas_computed_once(self):
+        reg = self.build()
+        with patch.object(EchoArgs, "model_json_schema", wraps=EchoArgs.model_json_schema) as schema:
+            first = reg.tools()
+            assert reg.tools() is first
+        assert schema.call_count == 1
+
+
+class TestServerRegistry:
+    """Test the server's tool table."""
+
+    @pytest.mark.asyncio
+    async def test_all_tools_listed(self):
+        names = [tool.name for tool in await handle_list_tools()]
+        assert len(names) == len(set(names)) == len(TOOLS)
+        assert "get_climate_raster" in names and "fetch_result_page" in names
+
+    @pytest.mark.asyncio
+    async def test_dispatch_reaches_client_method(self):
+        with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+            mock_client = Mock()
+            mock_client.get_raster_data = AsyncMock(return_value={"ok": True})
+            mock_client_class.return_value = mock_client
+            content = await handle_call_tool("get_climate_raster", {
+                "datatype": "rainfall", "date": "2024-12", "extent": "bi",
+                "production": "new", "period": "month",
+            })
+        assert json.loads(content[0].text) == {"ok": True}
+        mock_client.get_raster_data.assert_awaited_once_with(
+            datatype="rainfall", date="2024-12", extent="bi", location="hawaii",
+            production="new", aggregation=None, timescale=None, period="month",
+        )
+
+    @pytest.mark.asyncio
+    async def test_timeseries_postprocess_compacts(self):
+        series = {f"2024-0{m}-01T10:00:00.000Z": float(m) for m in (1, 2, 3)}
+        args = {"datatype": "rainfall", "start": "2024-01-01", "end": "2024-03-31", "extent": "bi"}
+        with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class:
+            mock_client_class.return_value.get_timeseries_data = AsyncMock(return_value=series)
+            default = await handle_call_tool("get_timeseries_data", args)
+            content = await handle_call_tool("get_timeseries_data", {**args, "compact": True})
+        assert json.loads(default[0].text) == series
+        assert json.loads(content[0].text)["step"] == "P1M"
+        assert "compact" not in mock_client_class.return_value.get_timeseries_data.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_report_error(self):
+        content = await handle_call_tool("get_climate_raster", {"datatype": "rainfall"})
+        assert content[0].text.startswith("Error calling HCDP API")
+        assert registry.get("get_timeseries_data").args_model is GetTimeseriesArgs
@@ -0,0 +1,127 @@
+"""Tests for result size budgeting and cursor-based continuation."""
+
+import json
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+from hcdp_mcp_server.results import ResultStore, decode_cursor, encode_cursor, output_budget
+from hcdp_mcp_server.server import handle_call_tool
+
+SAMPLE = Path(__file__).parent.parent / "sample_data" / "mesonet_measurements_recent.json"
+
+
+class TestResultStore:
+    """Test the LRU store and cursors."""
+
+    def test_cursor_round_trip(self):
+        assert decode_cursor(encode_cursor("abc_-1", 12345)) == ("abc_-1", 12345)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_small_results_are_not_stored(self):
+        store = ResultStore()
+        assert store.first_page([1, 2], 10) == ("[1,2]", None)
+        assert store.first_page(12345678901234, 10) == ("12345678901234", None)
+        assert len(store) == 0
+
+    def test_list_pages_are_whole_items(self):
+        store = ResultStore()
+        result = [i * 1000 for i in range(40)]
+        items = []
+        chunk, cont = store.first_page(result, 20)
+        items.extend(json.loads(chunk))
+        while cont:
+            assert len(chunk) <= 20 and cont["returned_through"] == len(items) and cont["total_records"] == 40
+            chunk, cont = store.page(cont["next_cursor"], 20)
+            items.extend(json.loads(chunk))
+        assert items == result
+
+    def test_mapping_pages_are_whole_entries(self):
+        store = ResultStore()
+        result = {f"2024-01-{d:02d}": d * 1.5 for d in range(1, 32)}
+        chunk, cont = store.first_page(result, 60)
+        merged = json.loads(chunk)
+        while cont:
+            chunk, cont = store.page(cont["next_cursor"], 60)
+            merged.update(json.loads(chunk))
+        assert merged == result
+
+    def test_single_key_wrapper_is_paged_inside(self):
+        store = ResultStore()
+        result = {"stations": [{"skn": str(i)} for i in range(30)], "count": 30}
+        chunk, cont = store.first_page(result, 80)
+        first = json.loads(chunk)
+        assert len(chunk) <= 80 and first["count"] == 30 and cont["path"] == ["stations"]
+        stations = first["stations"]
+        while cont:
+            chunk, cont = store.page(cont["next_cursor"], 80)
+            assert len(chunk) <= 80 and list(json.loads(chunk)) == ["stations"]
+            stations.extend(json.loads(chunk)["stations"])
+        assert stations == result["stations"]
+
+    def test_wrapped_string_is_paged_in_runs(self):
+        store = ResultStore()
+        result = {"data": "QUJD" * 100}
+        chunk, cont = store.first_page(result, 100)
+        data = json.loads(chunk)["data"]
+        while cont:
+            chunk, cont = store.page(cont["next_cursor"], 100)
+            assert len(chunk) <= 100
+            data += json.loads(chunk)["data"]
+        assert data == result["data"]
+
+    def test_oversized_record_gets_its_own_page(self):
+        store = ResultStore()
+        chunk, cont = store.first_page(["x" * 50, 1], 20)
+        assert json.loads(chunk) == ["x" * 50]
+        assert store.page(cont["next_cursor"], 20) == ("[1]", None)
+
+    def test_lru_bounded_by_size(self):
+        store = ResultStore(max_chars=300)
+        _, first = store.first_page(["a" * 40] * 3, 50)
+        store.first_page(["b" * 40] * 3, 50)
+        store.first_page(["c" * 40] * 3, 50)
+        assert len(store) == 2
+        with pytest.raises(LookupError):
+            store.page(first["next_cursor"], 10)
+
+    def test_output_budget_per_tool_override(self):
+        env = {"HCDP_OUTPUT_BUDGET": "500", "HCDP_OUTPUT_BUDGET_GET_MESONET_DATA": "50"}
+        with patch.dict(os.environ, env):
+            assert output_budget("get_mesonet_data") == 50
+            assert output_budget("get_station_data") == 500
+
+
+class TestServerPaging:
+    """Test truncation and fetch_result_page through handle_call_tool."""
+
+    @pytest.mark.asyncio
+    async def test_large_mesonet_result_is_paged(self):
+        rows = json.loads(SAMPLE.read_text())
+        with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class, \
+                patch.dict(os.environ, {"HCDP_OUTPUT_BUDGET": "4096"}):
+            mock_client = Mock()
+            mock_client.get_mesonet_data = AsyncMock(return_value=rows)
+            mock_client_class.return_value = mock_client
+
+            content = await handle_call_tool("get_mesonet_data", {"station_ids": "0115"})
+            assert len(content) == 2
+            assert len(content[0].text) <= 4096
+            parts = json.loads(content[0].text)
+            continuation = json.loads(content[1].text)
+            while True:
+                page = await handle_call_tool("fetch_result_page", {"cursor": continuation["next_cursor"]})
+                assert len(page[0].text) <= 4096
+                parts.extend(json.loads(page[0].text))
+                if len(page) == 1:
+                    break
+                continuation = json.loads(page[1].text)
+
+        assert parts == rows
+
+    @pytest.mark.asyncio
+    async def test_unknown_cursor_reports_error(self):
+        content = await handle_call_tool("fetch_result_page", {"cursor": encode_cursor("gone", 0)})
+        assert "Result expired or unknown" in content[0].text
@@ -0,0 +1,67 @@
+"""Tests for trigram search and the mesonet variable catalog."""
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.search_index import IndexCache, TrigramIndex, tokenize, trigrams
+from hcdp_mcp_server.variables import VariableCatalog
+
+VARIABLES = json.loads((Path(__file__).parent.parent / "sample_data" / "mesonet_variables_hawaii.json").read_text())
+
+
+class TestTrigramIndex:
+    """Test tokenizing and ranking."""
+
+    def test_tokenize(self):
+        assert tokenize("RF_1_Tot300s") == ["rf", "1", "tot300s"]
+        assert tokenize("BattVolt, Battery voltage") == ["batt", "volt", "battery", "voltage"]
+        assert trigrams(["rf"]) == {"  r", " rf", "rf "}
+
+    def test_ranks_exact_key_and_whole_words_first(self):
+        index = TrigramIndex({"a": "wind speed", "b": "wind direction", "c": "air speed", "wind": "other"})
+        assert [k for k, _ in index.search("wind speed")] == ["a", "c", "b"]
+        assert index.search("WIND")[0][0] == "wind"
+        assert index.search("zzz") == []
+        assert len(index.search("speed", limit=1)) == 1
+
+
+class TestVariableCatalog:
+    """Test variable search over the sample catalog."""
+
+    def test_finds_variables_by_name_id_and_typo(self):
+        catalog = VariableCatalog(VARIABLES)
+        assert len(catalog) == 285
+        assert catalog.search("Tair_1_Avg")[0]["var_id"] == "Tair_1_Avg"
+        assert catalog.search("rainfall", limit=3)[0]["display_name"].startswith("Rainfall")
+        assert any(m["var_id"].startswith("Tsoil") for m in catalog.search("soil temprature", limit=3))
+        assert catalog.search("wind speed")[0]["var_id"].startswith("WS_")
+
+    def test_rejects_unknown_shape(self):
+        with pytest.raises(ValueError):
+            VariableCatalog({"message": "nope"})
+
+    @pytest.mark.asyncio
+    async def test_client_fetches_catalog_once(self, mock_env_vars):
+        client = HCDPClient(index_cache=IndexCache())
+        fetch = AsyncMock(return_value=VARIABLES)
+        with patch.object(client, "_fetch_mesonet_variables", fetch):
+            found = await client.search_mesonet_variables("relative humidity", limit=2)
+            again = await client.search_mesonet_variables("solar radiation")
+            listing = await client.get_mesonet_variables()
+        assert fetch.await_count == 1
+        assert found["total"] == 285 and len(found["matches"]) == 2
+        assert found["matches"][0]["var_id"].startswith("RH")
+        assert again["matches"] and listing is VARIABLES
+
+    @pytest.mark.asyncio
+    async def test_index_expires(self, mock_env_vars):
+        client = HCDPClient(index_cache=IndexCache(ttl=60))
+        fetch = AsyncMock(return_value=VARIABLES)
+        with patch.object(client, "_fetch_mesonet_variables", fetch):
+            await client.search_mesonet_variables("rain")
+            with patch("hcdp_mcp_server.search_index.time.monotonic", return_value=1e12):
+                await client.search_mesonet_variables("rain")
+        assert fetch.await_count == 2
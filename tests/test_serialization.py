@@ -0,0 +1,45 @@
+"""Tests for the JSON serializer layer."""
+
+import json
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from hcdp_mcp_server import serialization
+from hcdp_mcp_server.serialization import dumps, loads
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request):
+    """Run a test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        if serialization.orjson is None:
+            pytest.skip("orjson not installed")
+        yield request.param
+    else:
+        with patch.object(serialization, "orjson", None):
+            yield request.param
+
+
+class TestSerialization:
+    """Test encoding and decoding through either backend."""
+
+    def test_compact_by_default(self, json_backend):
+        text = dumps({"a": [1, 2], "b": "x"}, pretty=False)
+        assert text == '{"a":[1,2],"b":"x"}'
+        assert serialization.backend() == json_backend
+
+    def test_pretty_on_request(self, json_backend):
+        text = dumps({"a": 1}, pretty=True)
+        assert text == '{\n  "a": 1\n}'
+
+    def test_numpy_values(self, json_backend):
+        text = dumps({"values": np.array([1.5, 2.5]), "n": np.int64(3)}, pretty=False)
+        assert json.loads(text) == {"values": [1.5, 2.5], "n": 3}
+
+    def test_unknown_types_fall_back_to_str(self, json_backend):
+        assert json.loads(dumps({"data": b"\x00tiff"}, pretty=False)) == {"data": str(b"\x00tiff")}
+
+    def test_loads_bytes_and_text(self, json_backend):
+        assert loads(b'{"a": 1}') == {"a": 1}
+        assert loads('[1, "ʻ"]') == [1, "ʻ"]
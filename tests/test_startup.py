@@ -0,0 +1,32 @@
+"""Startup-time budget for the hcdp-mcp-server entry point."""
+
+import os
+
+from benchmarks.bench_startup import (
+    DEFAULT_BUDGET_MS,
+    SERVER_MODULE,
+    import_profile,
+    imported_modules,
+    time_to_ready,
+)
+
+BUDGET_MS = float(os.getenv("HCDP_STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS))
+# Self time of this package's own modules, excluding the mcp/pydantic stack.
+OWN_IMPORT_BUDGET_MS = float(os.getenv("HCDP_OWN_IMPORT_BUDGET_MS", 150))
+
+
+class TestStartup:
+    """Guard against regressions in cold-start cost."""
+
+    def test_heavy_modules_are_lazy(self):
+        loaded = imported_modules()
+        assert "numpy" not in loaded
+
+    def test_own_modules_import_within_budget(self):
+        profile = import_profile()
+        own_ms = sum(v[0] for k, v in profile.items() if k.startswith("hcdp_mcp_server")) / 1000
+        assert SERVER_MODULE in profile
+        assert own_ms < OWN_IMPORT_BUDGET_MS
+
+    def test_import_to_ready_within_budget(self):
+        assert time_to_ready() * 1000 < BUDGET_MS
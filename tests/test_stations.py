@@ -0,0 +1,133 @@
+"""Tests for the local station index."""
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.search_index import IndexCache
+from hcdp_mcp_server.stations import StationIndex, parse_query
+
+MESONET_STATIONS = json.loads(
+    (Path(__file__).parent.parent / "sample_data" / "mesonet_stations_hawaii.json").read_text()
+)
+
+
+def station(skn, name, island, lat, lng, elevation):
+    return {"name": "hcdp_station_metadata",
+            "value": {"skn": skn, "name": name, "island": island, "lat": lat, "lng": lng, "elevation_m": elevation}}
+
+
+LISTING = {"result": [
+    station("703.0", "Honolulu Intl Airport", "OA", 21.3245, -157.9251, 2),
+    station("87.0", "Hilo Intl Airport", "BI", 19.7203, -155.0485, 11),
+    station("338.0", "Mauna Loa Observatory", "BI", 19.5362, -155.5763, 3397),
+    station("717.2", "Manoa Lyon Arboretum", "OA", 21.3331, -157.8025, 152),
+]}
+
+
+META = '{"name": "hcdp_station_metadata"}'
+
+
+def meta(condition):
+    return META[:-1] + ", " + condition + "}"
+
+
+class TestStationIndex:
+    """Test local queries and search."""
+
+    def test_parse_query(self):
+        assert parse_query(META) == {"name": "hcdp_station_metadata"}
+        assert parse_query(meta('"value.island": {"$in": ["OA"]}'))["value.island"] == {"$in": ["OA"]}
+        assert parse_query(meta('"value.elevation_m": {"$gt": 100}')) is None
+        assert parse_query(meta('"$or": []')) is None
+        assert parse_query("not json") is None
+        assert parse_query(meta('"value.status": "active"')) is None
+        assert parse_query(meta('"value.island": {"$in": [null]}')) is None
+        assert parse_query("{}") is None
+        assert parse_query('{"value.island": "OA"}') is None
+        assert parse_query('{"name": "Honolulu"}') is None
+
+    def test_array_fields_match_any_element(self):
+        index = StationIndex([{"value": {"skn": "1", "island": ["BI", "MA"]}}, {"value": {"skn": "2", "island": "OA"}}])
+        assert [r["value"]["skn"] for r in index.query({"value.island": "MA"})] == ["1"]
+        assert [r["value"]["skn"] for r in index.query({"value.island": {"$in": ["OA", "BI"]}})] == ["1", "2"]
+
+    def test_document_type_is_not_a_station_name(self):
+        index = StationIndex(LISTING)
+        assert index.search(name="hcdp_station_metadata") == []
+        assert index.search(name="hilo")[0][0] is LISTING["result"][1]
+
+    def test_equality_queries_keep_listing_shape(self):
+        index = StationIndex(LISTING)
+        matches = index.query({"value.island": "BI"})
+        assert [m["value"]["skn"] for m in matches] == ["87.0", "338.0"]
+        assert index.wrap(matches[:1]) == {"result": [LISTING["result"][1]]}
+        assert index.query({"value.island": {"$in": ["OA", "MA"]}, "value.elevation_m": 152}) == [LISTING["result"][3]]
+
+    def test_search_by_island_elevation_and_name(self):
+        index = StationIndex(LISTING)
+        ids = lambda found: [r["value"]["skn"] for r, _ in found]
+        assert ids(index.search(island="bi")) == ["87.0", "338.0"]
+        assert ids(index.search(min_elevation=10, max_elevation=200)) == ["87.0", "717.2"]
+        assert ids(index.search(name="airport", island="OA")) == ["703.0"]
+        assert ids(index.search(name="mauna loa"))[0] == "338.0"
+        assert ids(index.search(station_id="717.2")) == ["717.2"]
+        assert index.search(station_id="nope") == []
+
+    def test_search_near_point_over_grid(self):
+        index = StationIndex(MESONET_STATIONS)
+        found = index.search(lat=20.8415, lng=-156.2948, radius_km=20)
+        distances = [info["distance_km"] for _, info in found]
+        assert found[0][0]["station_id"] == "0115" and distances[0] == 0
+        assert distances == sorted(distances) and distances[-1] <= 20
+        everything = index.search(lat=20.8415, lng=-156.2948, radius_km=500)
+        assert len(everything) == len([s for s in MESONET_STATIONS if s.get("lat") is not None])
+
+
+class TestClientStations:
+    """Test answering station queries from the cached index."""
+
+    @pytest.mark.asyncio
+    async def test_simple_queries_served_locally(self, mock_env_vars):
+        client = HCDPClient(index_cache=IndexCache())
+        fetch = AsyncMock(return_value=LISTING)
+        with patch.object(client, "_fetch_stations", fetch):
+            first = await client.get_station_data(meta('"value.island": "OA"'))
+            paged = await client.get_station_data(META, limit=2, offset=1)
+            found = await client.search_stations(name="airport", limit=1)
+            fetch.return_value = {"result": []}
+            await client.get_station_data('{"value.elevation_m": {"$gt": 100}}')
+        assert [call.args[0] for call in fetch.await_args_list] == [
+            {"q": META, "limit": 1000, "offset": 0}, {"q": '{"value.elevation_m": {"$gt": 100}}'}
+        ]
+        assert len(first["result"]) == 2 and paged == {"result": LISTING["result"][1:3]}
+        assert found["count"] == 2 and found["total"] == 4 and len(found["stations"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_index_reads_every_page(self, mock_env_vars):
+        client = HCDPClient(index_cache=IndexCache())
+        pages = lambda params: {"result": LISTING["result"][params["offset"]:params["offset"] + params["limit"]]}
+        with patch.dict("os.environ", {"HCDP_STATIONS_PAGE_SIZE": "2"}), \
+                patch.object(client, "_fetch_stations", AsyncMock(side_effect=pages)) as fetch:
+            found = await client.get_station_data(meta('"value.island": "OA"'))
+        assert {call.args[0]["q"] for call in fetch.await_args_list} == {META}
+        assert [call.args[0]["offset"] for call in fetch.await_args_list] == [0, 2, 4]
+        assert [r["value"]["skn"] for r in found["result"]] == ["703.0", "717.2"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_pages_fall_back_to_the_api(self, mock_env_vars):
+        client = HCDPClient(index_cache=IndexCache())
+        first_two = {"result": LISTING["result"][:2]}
+        with patch.dict("os.environ", {"HCDP_STATIONS_PAGE_SIZE": "2"}), \
+                patch.object(client, "_fetch_stations", AsyncMock(return_value=first_two)) as fetch:
+            await client.get_station_data(meta('"value.island": "OA"'))
+        assert fetch.await_args_list[-1].args[0] == {"q": meta('"value.island": "OA"')}
+
+    @pytest.mark.asyncio
+    async def test_without_index_queries_the_api(self, mock_env_vars):
+        client = HCDPClient()
+        with patch.object(client, "_fetch_stations", AsyncMock(return_value=LISTING)) as fetch:
+            await client.get_station_data("{}", limit=5)
+        fetch.assert_awaited_once_with({"q": "{}", "limit": 5})
@@ -0,0 +1,98 @@
+"""Tests for the array-backed TimeSeries type."""
+
+import json
+import math
+import pytest
+from pathlib import Path
+
+from hcdp_mcp_server.timeseries import TimeSeries
+
+SAMPLE = Path(__file__).parent.parent / "sample_data" / "timeseries_rainfall_2024_hilo.json"
+
+
+@pytest.fixture
+def hilo_rainfall():
+    """Monthly 2024 rainfall series from sample_data."""
+    return json.loads(SAMPLE.read_text())
+
+
+def daily(values, start="2024-01-01"):
+    """Build a daily mapping starting at ``start``."""
+    base = TimeSeries.from_compact({"start": f"{start}T00:00:00.000Z", "step": "P1D", "values": values})
+    return base.to_mapping()
+
+
+class TestTimeSeries:
+    """Test construction, slicing and serialization."""
+
+    def test_mapping_round_trip(self, hilo_rainfall):
+        series = TimeSeries.from_mapping(hilo_rainfall)
+        assert len(series) == 12
+        assert series.to_mapping() == hilo_rainfall
+
+    def test_monthly_series_is_compact(self, hilo_rainfall):
+        compact = TimeSeries.from_mapping(hilo_rainfall).to_compact()
+        assert compact["start"] == "2024-01-01T10:00:00.000Z"
+        assert compact["step"] == "P1M"
+        assert compact["values"][0] == 58.9774
+        assert TimeSeries.from_compact(compact).to_mapping() == hilo_rainfall
+
+    def test_irregular_series_keeps_times(self):
+        series = TimeSeries.from_mapping({
+            "2024-01-01T00:00:00.000Z": 1.0,
+            "2024-01-02T00:00:00.000Z": 2.0,
+            "2024-01-05T07:00:00.000Z": 3.0,
+        })
+        compact = series.to_compact()
+        assert "times" in compact and "step" not in compact
+        assert TimeSeries.from_compact(compact) == series
+
+    def test_unsorted_input_is_sorted(self):
+        series = TimeSeries.from_mapping({"2024-01-02T00:00:00Z": 2.0, "2024-01-01T00:00:00Z": 1.0})
+        assert series.values.tolist() == [1.0, 2.0]
+        assert series.to_compact()["step"] == "P1D"
+
+    def test_between_uses_inclusive_days(self, hilo_rainfall):
+        series = TimeSeries.from_mapping(hilo_rainfall)
+        assert len(series.between("2024-03-01", "2024-05-01")) == 3
+        assert len(series[2:5]) == 3
+
+    def test_gaps(self):
+        mapping = daily([1.0, 2.0, 3.0, 4.0, 5.0])
+        del mapping["2024-01-03T00:00:00.000Z"]
+        del mapping["2024-01-04T00:00:00.000Z"]
+        gaps = TimeSeries.from_mapping(mapping).gaps()
+        assert gaps == [{
+            "after": "2024-01-02T00:00:00.000Z",
+            "before": "2024-01-05T00:00:00.000Z",
+            "missing": 2,
+        }]
+
+    def test_resample_ignores_nan(self):
+        series = TimeSeries.from_mapping(daily([1.0, None, 3.0] + [10.0] * 29))
+        monthly = series.resample("M", "mean")
+        assert monthly.to_mapping() == {
+            "2024-01-01T00:00:00.000Z": pytest.approx((1 + 3 + 10 * 28) / 30),
+            "2024-02-01T00:00:00.000Z": 10.0,
+        }
+        assert series.resample("M", "sum").values.tolist() == [284.0, 10.0]
+        assert series.resample("M", "count").values.tolist() == [30.0, 1.0]
+        assert series.resample("Y", "max").values.tolist() == [10.0]
+        assert series.resample("D", "last").values[0] == 1.0
+        assert math.isnan(series.resample("D", "last").values[1])
+
+    def test_resample_rejects_unknown_aggregation(self):
+        with pytest.raises(ValueError):
+            TimeSeries.from_mapping(daily([1.0])).resample("M", "median")
+
+    def test_weekly_resample_starts_on_monday(self):
+        # 2024-01-01 is a Monday; 2024-01-08 starts the next week.
+        weekly = TimeSeries.from_mapping(daily([1.0] * 10)).resample("W", "count")
+        assert weekly.to_mapping() == {"2024-01-01T00:00:00.000Z": 7.0, "2024-01-08T00:00:00.000Z": 3.0}
+
+    def test_sub_second_step_round_trips(self):
+        compact = {"start": "2024-01-01T00:00:00.000Z", "step": "PT0.25S", "values": [1.0, 2.0, 3.0]}
+        series = TimeSeries.from_compact(compact)
+        assert series.to_mapping()["2024-01-01T00:00:00.500Z"] == 3.0
+        assert series.to_compact() == compact
+        assert TimeSeries.from_compact({**compact, "step": "PT1.5S"}).to_compact()["step"] == "PT1.5S"
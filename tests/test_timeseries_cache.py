@@ -0,0 +1,132 @@
+"""Tests for the incremental timeseries interval cache."""
+
+import json
+import pytest
+from datetime import date
+from unittest.mock import Mock, patch
+
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.intervals import merge_intervals, subtract_intervals
+from hcdp_mcp_server.timeseries_cache import TimeseriesCache, parse_date_bound
+
+
+def monthly_series(year):
+    """Monthly values shaped like sample_data/timeseries_rainfall_2024_hilo.json."""
+    return {f"{year}-{m:02d}-01T10:00:00.000Z": float(m) for m in range(1, 13)}
+
+
+def fake_timeseries_api(calls):
+    """Build a mocked get() answering each request with the months it covers."""
+    async def fake_get(url, params=None, headers=None, timeout=None):
+        calls.append((params["start"], params["end"]))
+        start, end = params["start"], params["end"]
+        data = {}
+        for year in range(int(start[:4]), int(end[:4]) + 1):
+            data.update({ts: v for ts, v in monthly_series(year).items() if start <= ts[:10] <= end})
+        response = Mock()
+        response.content = json.dumps(data).encode()
+        response.raise_for_status.return_value = None
+        return response
+    return fake_get
+
+
+class TestIntervals:
+    """Test half-open interval helpers."""
+
+    def test_merge_coalesces_overlapping_and_adjacent(self):
+        assert merge_intervals([(5, 7), (1, 3), (3, 4), (6, 9)]) == [(1, 4), (5, 9)]
+
+    def test_subtract_returns_gaps(self):
+        assert subtract_intervals(0, 10, [(2, 4), (6, 8)]) == [(0, 2), (4, 6), (8, 10)]
+        assert subtract_intervals(0, 10, [(0, 10)]) == []
+        assert subtract_intervals(0, 10, []) == [(0, 10)]
+
+
+class TestTimeseriesCache:
+    """Test range bookkeeping in the cache itself."""
+
+    def test_parse_date_bound(self):
+        assert parse_date_bound("2024-02-15") == date(2024, 2, 15)
+        assert parse_date_bound("2024-02", end=True) == date(2024, 2, 29)
+        assert parse_date_bound("2024") == date(2024, 1, 1)
+        assert parse_date_bound("not a date") is None
+
+    def test_missing_after_partial_fill(self):
+        cache = TimeseriesCache()
+        key = cache.key("rainfall", "bi")
+        cache.add(key, date(2024, 1, 1), date(2024, 12, 31), monthly_series(2024))
+
+        assert cache.missing(key, date(2023, 1, 1), date(2024, 12, 31)) == [
+            (date(2023, 1, 1), date(2023, 12, 31))
+        ]
+        assert cache.missing(key, date(2024, 3, 1), date(2024, 6, 30)) == []
+        assert len(cache.get(key, date(2024, 3, 1), date(2024, 6, 30))) == 4
+
+    def test_lru_eviction(self):
+        cache = TimeseriesCache(max_entries=1)
+        cache.add(cache.key("rainfall", "bi"), date(2024, 1, 1), date(2024, 1, 31), {})
+        cache.add(cache.key("rainfall", "oa"), date(2024, 1, 1), date(2024, 1, 31), {})
+        assert len(cache) == 1
+        assert cache.missing(cache.key("rainfall", "bi"), date(2024, 1, 1), date(2024, 1, 31))
+
+    def test_save_and_load(self, tmp_path):
+        cache = TimeseriesCache()
+        key = cache.key("rainfall", "bi", lat=19.7, lng=-155.1)
+        cache.add(key, date(2024, 1, 1), date(2024, 12, 31), monthly_series(2024))
+
+        restored = TimeseriesCache()
+        assert restored.load(tmp_path / "missing.json") == 0
+        cache.save(tmp_path / "ts.json")
+        assert restored.load(tmp_path / "ts.json") == 1
+        assert restored.missing(key, date(2024, 1, 1), date(2024, 12, 31)) == []
+        assert restored.get(key, date(2024, 1, 1), date(2024, 12, 31)) == monthly_series(2024)
+
+
+    def test_coverage_stops_at_last_value(self, tmp_path):
+        cache = TimeseriesCache()
+        key = cache.key("rainfall", "bi", period="month")
+        published = {ts: v for ts, v in monthly_series(2026).items() if ts < "2026-10"}
+        cache.add(key, date(2026, 1, 1), date(2026, 12, 31), published)
+        assert cache.missing(key, date(2026, 1, 1), date(2026, 12, 31)) == [(date(2026, 10, 1), date(2026, 12, 31))]
+        cache.add(key, date(2026, 10, 1), date(2026, 12, 31), {})
+        assert cache.missing(key, date(2026, 10, 1), date(2026, 12, 31)) == [(date(2026, 10, 1), date(2026, 12, 31))]
+
+        (tmp_path / "ts.json").write_text(json.dumps([
+            {"key": list(key), "covered": [["2026-01-01", "2027-01-01"]], "values": published}
+        ]))
+        restored = TimeseriesCache()
+        restored.load(tmp_path / "ts.json")
+        assert restored.missing(key, date(2026, 1, 1), date(2026, 12, 31)) == [(date(2026, 10, 1), date(2026, 12, 31))]
+
+
+class TestClientTimeseriesCaching:
+    """Test that the client only fetches uncovered sub-ranges."""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_queries_fetch_only_missing_ranges(self):
+        client = HCDPClient(api_token="test_token", timeseries_cache=TimeseriesCache())
+        calls = []
+        query = dict(datatype="rainfall", extent="bi", lat=19.7167, lng=-155.0833,
+                     production="new", period="month")
+
+        with patch("httpx.AsyncClient.get", side_effect=fake_timeseries_api(calls)):
+            first = await client.get_timeseries_data(start="2024-01-01", end="2024-12-31", **query)
+            second = await client.get_timeseries_data(start="2023-01-01", end="2024-12-31", **query)
+            third = await client.get_timeseries_data(start="2023-06-01", end="2024-06-30", **query)
+
+        assert first == monthly_series(2024)
+        assert calls == [("2024-01-01", "2024-12-31"), ("2023-01-01", "2023-12-31")]
+        assert len(second) == 24
+        assert list(second) == sorted(second)
+        assert len(third) == 13
+
+    @pytest.mark.asyncio
+    async def test_without_cache_every_call_hits_api(self):
+        client = HCDPClient(api_token="test_token")
+        calls = []
+        with patch("httpx.AsyncClient.get", side_effect=fake_timeseries_api(calls)):
+            for _ in range(2):
+                await client.get_timeseries_data(
+                    datatype="rainfall", start="2024-01-01", end="2024-12-31", extent="bi"
+                )
+        assert len(calls) == 2
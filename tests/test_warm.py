@@ -0,0 +1,90 @@
+"""Tests for the cache warming command."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from hcdp_mcp_server import server
+from hcdp_mcp_server.warm import enumerate_tasks, load_spec, run_warm
+
+SPEC = {
+    "rasters": [{
+        "datatype": "rainfall", "production": "new", "period": "month",
+        "extents": ["statewide", "bi"], "start": "2024-11", "end": "2025-02",
+    }],
+    "timeseries": [{
+        "datatype": "rainfall", "production": "new", "period": "month", "extent": "statewide",
+        "start": "2020-01", "end": "2024-12", "points": [[21.31, -157.86], [19.73, -155.09]],
+    }],
+}
+
+
+class TestSpec:
+    """Test spec loading and task enumeration."""
+
+    def test_enumerates_raster_dates_and_timeseries_points(self):
+        tasks = enumerate_tasks(SPEC)
+        rasters = [t for t in tasks if t.method == "get_raster_data"]
+        assert [t.args["date"] for t in rasters[:4]] == ["2024-11", "2024-12", "2025-01", "2025-02"]
+        assert {t.args["extent"] for t in rasters} == {"statewide", "bi"}
+        assert len(rasters) == 8
+        series = [t for t in tasks if t.method == "get_timeseries_data"]
+        assert [(t.args["lat"], t.args["lng"]) for t in series] == [(21.31, -157.86), (19.73, -155.09)]
+
+    def test_duplicate_entries_collapse(self):
+        spec = {"rasters": SPEC["rasters"] * 2}
+        assert len(enumerate_tasks(spec)) == 8
+
+    def test_load_json_and_yaml(self, tmp_path):
+        (tmp_path / "spec.json").write_text(json.dumps(SPEC))
+        (tmp_path / "spec.yaml").write_text(
+            "rasters:\n  - datatype: rainfall\n    extent: bi\n    period: month\n"
+            "    start: 2024-01\n    end: 2024-03\n"
+        )
+        assert load_spec(tmp_path / "spec.json") == SPEC
+        assert len(enumerate_tasks(load_spec(tmp_path / "spec.yaml"))) == 3
+
+
+class TestRunWarm:
+    """Test concurrent filling and resumption."""
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_failures(self, tmp_path):
+        tasks = enumerate_tasks(SPEC)
+        client = AsyncMock()
+        failing = tasks[3].args["date"]
+
+        async def flaky(**args):
+            if args["date"] == failing and args["extent"] == "statewide":
+                raise RuntimeError("503")
+
+        client.get_raster_data.side_effect = flaky
+        first = await run_warm(tasks, client, tmp_path / "state.json", concurrency=3, checkpoint_every=2)
+        assert first["done"] == 9 and first["failed"] == 1
+        assert first["errors"][0]["args"]["date"] == failing
+
+        client.reset_mock()
+        client.get_raster_data.side_effect = None
+        checkpoint = Mock()
+        second = await run_warm(tasks, client, tmp_path / "state.json", checkpoint=checkpoint)
+        assert second["skipped"] == 9 and second["done"] == 1
+        client.get_raster_data.assert_awaited_once_with(**tasks[3].args)
+        client.get_timeseries_data.assert_not_called()
+        checkpoint.assert_called()
+
+
+class TestWarmCommand:
+    """Test the warm subcommand end to end with a mocked client."""
+
+    @pytest.mark.asyncio
+    async def test_warm_persists_timeseries_cache(self, tmp_path):
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps({"timeseries": SPEC["timeseries"]}))
+        with patch("hcdp_mcp_server.server.HCDPClient") as mock_client_class, \
+                patch.dict("os.environ", {"HCDP_DATA_DIR": str(tmp_path / "data")}), \
+                patch.object(server, "save_caches") as save:
+            mock_client_class.return_value.get_timeseries_data = AsyncMock(return_value={})
+            summary = await server.warm(str(spec_path))
+        assert summary["done"] == 2 and summary["failed"] == 0
+        save.assert_called()
+        assert list((tmp_path / "data" / "warm").glob("warm-*.json"))